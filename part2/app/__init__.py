@@ -18,10 +18,17 @@ def create_app():
     from app.api.v1.places import api as places_ns
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.amenities import api as amenities_ns
+    from app.api.v1.search import api as search_ns
+    from app.api.v1.export import api as export_ns
     
     api.add_namespace(users_ns)
     api.add_namespace(places_ns)
     api.add_namespace(reviews_ns)
     api.add_namespace(amenities_ns)
+    api.add_namespace(search_ns)
+    api.add_namespace(export_ns)
+
+    from app.commands import register_commands
+    register_commands(app)
 
     return app
@@ -0,0 +1,36 @@
+from flask import Response, request, stream_with_context
+from flask_restx import Namespace, Resource, abort
+from app.services.facade import facade as hbnb_facade
+from app.services.export import FORMATS, MIMETYPES, export_chunks, gzip_chunks, parse_since
+
+api = Namespace('export', description='Full dataset export')
+
+export_parser = api.parser()
+export_parser.add_argument('format', choices=FORMATS, default='ndjson', location='args',
+                           help='ndjson or csv')
+export_parser.add_argument('since', type=str, location='args',
+                           help='Only rows updated at or after this ISO 8601 timestamp')
+
+@api.route('/<string:entity>')
+@api.param('entity', 'users, places, reviews or amenities')
+class Export(Resource):
+    @api.doc('export')
+    @api.expect(export_parser)
+    @api.response(400, 'Unknown entity or invalid parameters')
+    def get(self, entity):
+        """Stream every row of an entity as NDJSON or CSV, gzipped if the client accepts it"""
+        args = export_parser.parse_args()
+        try:
+            since = parse_since(args['since']) if args['since'] else None
+            chunks = export_chunks(hbnb_facade.iter_export(entity, since), entity, args['format'])
+        except ValueError as e:
+            abort(400, str(e))
+
+        extension = 'ndjson' if args['format'] == 'ndjson' else 'csv'
+        headers = {'Content-Disposition': f'attachment; filename={entity}.{extension}',
+                   'Vary': 'Accept-Encoding'}
+        if request.accept_encodings['gzip']:
+            chunks = gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(stream_with_context(chunks), mimetype=MIMETYPES[args['format']],
+                        headers=headers)
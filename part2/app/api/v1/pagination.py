@@ -0,0 +1,15 @@
+from flask_restx import reqparse
+from app.persistence.pagination import paginate
+
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=int, location='args',
+                               help='Maximum number of items to return')
+pagination_parser.add_argument('after', type=str, location='args',
+                               help='Cursor from the X-Next-Cursor header of the previous page')
+
+
+def paginated(fetch, args):
+    """Return one page of fetch(limit, after) with the next cursor as a header"""
+    items, next_cursor = paginate(fetch, args.get('limit'), args.get('after'))
+    headers = {'X-Next-Cursor': next_cursor} if next_cursor else {}
+    return items, 200, headers
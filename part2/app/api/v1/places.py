@@ -1,8 +1,38 @@
+import json
 from flask_restx import Namespace, Resource, fields, abort
-from app.services import facade as hbnb_facade
+from app.services.facade import facade as hbnb_facade
+from app.api.v1.pagination import pagination_parser, paginated
 
 api = Namespace('places', description='Place operations')
 
+place_filter_parser = pagination_parser.copy()
+place_filter_parser.add_argument('min_price', type=float, location='args',
+                                 help='Lowest price per night')
+place_filter_parser.add_argument('max_price', type=float, location='args',
+                                 help='Highest price per night')
+place_filter_parser.add_argument('min_guests', type=int, location='args',
+                                 help='Minimum guest capacity')
+place_filter_parser.add_argument('amenities', type=str, location='args',
+                                 help='Comma-separated amenity names; places must have all of them')
+
+nearby_parser = api.parser()
+nearby_parser.add_argument('lat', type=float, required=True, location='args',
+                           help='Latitude of the search centre')
+nearby_parser.add_argument('lon', type=float, required=True, location='args',
+                           help='Longitude of the search centre')
+nearby_parser.add_argument('radius_km', type=float, default=10.0, location='args',
+                           help='Search radius in kilometres')
+nearby_parser.add_argument('limit', type=int, default=50, location='args',
+                           help='Maximum number of places to return')
+
+top_parser = api.parser()
+top_parser.add_argument('by', choices=('rating', 'reviews'), default='rating', location='args',
+                        help='Rank by Bayesian average rating or by review count')
+top_parser.add_argument('limit', type=int, default=10, location='args',
+                        help='Maximum number of places to return')
+top_parser.add_argument('min_reviews', type=int, default=0, location='args',
+                        help='Only rank places with at least this many reviews')
+
 # Simplified Models
 place_input_model = api.model('PlaceInput', {
     'title': fields.String(required=True, description='Place title'),
@@ -14,6 +44,17 @@ place_input_model = api.model('PlaceInput', {
     'amenity_ids': fields.List(fields.String, description='List of amenity IDs')
 })
 
+rating_summary_model = api.model('RatingSummary', {
+    'count': fields.Integer(description='Number of reviews'),
+    'sum': fields.Integer(description='Sum of all ratings'),
+    'average': fields.Float(description='Mean rating, null without reviews'),
+    'histogram': fields.List(fields.Integer, description='Review counts for 1 to 5 stars')
+})
+
+def _ratings_of(place):
+    place_id = place['id'] if isinstance(place, dict) else place.id
+    return hbnb_facade.get_place_ratings(place_id)
+
 place_response_model = api.model('PlaceResponse', {
     'id': fields.String(description='Place ID'),
     'title': fields.String(description='Place title'),
@@ -25,17 +66,36 @@ place_response_model = api.model('PlaceResponse', {
     'amenities': fields.List(fields.Nested(api.model('PlaceAmenity', {
             'id': fields.String,
             'name': fields.String
-    })))
+    }))),
+    'ratings': fields.Nested(rating_summary_model, attribute=_ratings_of)
 })
 
 @api.route('/')
 class PlaceList(Resource):
     @api.doc('list_places')
+    @api.expect(place_filter_parser)
     @api.marshal_list_with(place_response_model)
     def get(self):
-        """List all places"""
+        """
+        List places, optionally filtered by price, capacity and amenities, one page at a time
+
+        The X-Amenity-Facets header holds a JSON object counting, per
+        amenity, how many of the filtered places have it.
+        """
+        args = place_filter_parser.parse_args()
         try:
-            return hbnb_facade.get_all_places(), 200
+            names = [name.strip() for name in (args['amenities'] or '').split(',') if name.strip()]
+            filters = dict(min_price=args['min_price'],
+                           max_price=args['max_price'],
+                           min_guests=args['min_guests'],
+                           amenity_ids=hbnb_facade.resolve_amenities(names))
+            places, code, headers = paginated(
+                lambda limit, after: hbnb_facade.get_all_places(limit, after, **filters),
+                args)
+            headers['X-Amenity-Facets'] = json.dumps(hbnb_facade.get_amenity_facets(**filters))
+            return places, code, headers
+        except ValueError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -62,6 +122,50 @@ class PlaceList(Resource):
         except Exception as e:
             abort(500, str(e))
 
+place_nearby_model = api.inherit('PlaceNearby', place_response_model, {
+    'distance_km': fields.Float(description='Distance from the search centre')
+})
+
+@api.route('/nearby')
+class PlacesNearby(Resource):
+    @api.doc('places_nearby')
+    @api.expect(nearby_parser)
+    @api.response(400, 'Invalid coordinates or radius')
+    @api.marshal_list_with(place_nearby_model)
+    def get(self):
+        """List places within a radius of a point, nearest first"""
+        args = nearby_parser.parse_args()
+        try:
+            results = hbnb_facade.get_places_nearby(
+                args['lat'], args['lon'], args['radius_km'], args['limit'])
+            return [dict(place.to_dict(), distance_km=round(distance, 3))
+                    for place, distance in results], 200
+        except ValueError as e:
+            abort(400, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
+place_top_model = api.inherit('PlaceTop', place_response_model, {
+    'score': fields.Float(description='Bayesian average rating or review count')
+})
+
+@api.route('/top')
+class TopPlaces(Resource):
+    @api.doc('top_places')
+    @api.expect(top_parser)
+    @api.response(400, 'Invalid ranking parameters')
+    @api.marshal_list_with(place_top_model)
+    def get(self):
+        """List the best-rated or most-reviewed places"""
+        args = top_parser.parse_args()
+        try:
+            results = hbnb_facade.get_top_places(args['by'], args['limit'], args['min_reviews'])
+            return [dict(place.to_dict(), score=score) for place, score in results], 200
+        except ValueError as e:
+            abort(400, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
 @api.route('/<string:place_id>')
 @api.param('place_id', 'The place identifier')
 @api.response(404, 'Place not found')
@@ -87,7 +191,7 @@ class PlaceResource(Resource):
         data = api.payload
         
         # Price validation if provided
-        if 'price' in data and (not isinstance(data['price'], (int, float)) or data['price']) <= 0:
+        if 'price' in data and (not isinstance(data['price'], (int, float)) or data['price'] <= 0):
             abort(400, 'Price must be a positive number')
 
         try:
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields, abort
 from app.services import facade as hbnb_facade
+from app.api.v1.pagination import pagination_parser, paginated
 
 api = Namespace('reviews', description='Review operations')
 
@@ -32,11 +33,15 @@ review_response_model = api.model(
 @api.route('/')
 class ReviewList(Resource):
     @api.doc('list_reviews')
+    @api.expect(pagination_parser)
     @api.marshal_list_with(review_response_model)
     def get(self):
-        """List all reviews"""
+        """List reviews, one page at a time"""
+        args = pagination_parser.parse_args()
         try:
-            return hbnb_facade.get_all_reviews(), 200
+            return paginated(hbnb_facade.get_all_reviews, args)
+        except ValueError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -122,12 +127,17 @@ class ReviewResource(Resource):
 @api.response(404, 'Place not found')
 class PlaceReviews(Resource):
     @api.doc('get_place_reviews')
+    @api.expect(pagination_parser)
     @api.marshal_list_with(review_response_model)
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get the reviews for a specific place, one page at a time"""
+        args = pagination_parser.parse_args()
         try:
-            reviews = hbnb_facade.get_reviews_by_place(place_id)
-            return reviews, 200
+            return paginated(
+                lambda limit, after: hbnb_facade.get_reviews_by_place(place_id, limit, after),
+                args)
+        except ValueError as e:
+            abort(400, str(e))
         except LookupError as e:
             abort(404, str(e))
         except Exception as e:
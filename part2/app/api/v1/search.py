@@ -0,0 +1,38 @@
+from flask_restx import Namespace, Resource, fields, abort
+from app.services.facade import facade as hbnb_facade
+
+api = Namespace('search', description='Full-text search')
+
+search_parser = api.parser()
+search_parser.add_argument('q', type=str, required=True, location='args',
+                           help='Words to look for in place and review text')
+search_parser.add_argument('limit', type=int, default=10, location='args',
+                           help='Maximum number of places to return')
+
+search_result_model = api.model('SearchResult', {
+    'id': fields.String(description='Place ID'),
+    'title': fields.String(attribute='name', description='Place title'),
+    'description': fields.String(description='Place description'),
+    'city': fields.String(description='City'),
+    'score': fields.Float(description='BM25 relevance score')
+})
+
+@api.route('/')
+class Search(Resource):
+    @api.doc('search_places')
+    @api.expect(search_parser)
+    @api.response(400, 'Missing or invalid query')
+    @api.marshal_list_with(search_result_model)
+    def get(self):
+        """Search places by title, description, city and review text, best match first"""
+        args = search_parser.parse_args()
+        if args['limit'] < 1:
+            abort(400, 'Limit must be a positive integer')
+        try:
+            results = hbnb_facade.search_places(args['q'], args['limit'])
+            return [dict(place.to_dict(), score=round(score, 4))
+                    for place, score in results], 200
+        except ValueError as e:
+            abort(400, str(e))
+        except Exception as e:
+            abort(500, str(e))
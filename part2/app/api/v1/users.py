@@ -1,6 +1,7 @@
 from flask_restx import Namespace, Resource, fields, abort
 from app.services.facade import facade as hbnb_facade
 from app.models.user import User
+from app.api.v1.pagination import pagination_parser, paginated
 
 api = Namespace('users', description='User operations')
 
@@ -38,11 +39,16 @@ def sanitize_user(user):
 @api.route('/')
 class UserList(Resource):
     @api.doc('list_users')
+    @api.expect(pagination_parser)
     @api.marshal_list_with(user_response_model)
     def get(self):
-        """Get list of all users"""
-        users = hbnb_facade.user_repo.get_all()
-        return [sanitize_user(user) for user in users]
+        """Get users, one page at a time"""
+        args = pagination_parser.parse_args()
+        try:
+            users, code, headers = paginated(hbnb_facade.get_all_users, args)
+        except ValueError as e:
+            abort(400, str(e))
+        return [sanitize_user(user) for user in users], code, headers
 
     @api.doc('create_user')
     @api.expect(user_input_model)
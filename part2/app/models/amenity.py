@@ -1,9 +1,14 @@
 from typing import Optional
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, LazyList
 
 class Amenity(BaseModel):
     """Amenity model class"""
-    
+
+    __slots__ = ('name', 'description', '_places')
+    _fields = ('name', 'description', 'places')
+
+    places = LazyList()  # List of place IDs that have this amenity
+
     def __init__(self, name: str, description: Optional[str] = None, **kwargs):
         """
         Initialize Amenity instance
@@ -15,7 +20,6 @@ class Amenity(BaseModel):
         super().__init__(**kwargs)
         self.name = name
         self.description = description
-        self.places = []  # List of place IDs that have this amenity
     
     def add_to_place(self, place_id: str):
         """Add this amenity to a place"""
@@ -24,5 +28,6 @@ class Amenity(BaseModel):
     
     def remove_from_place(self, place_id: str):
         """Remove this amenity from a place"""
-        if place_id in self.places:
-            self.places.remove(place_id)
+        places = Amenity.places.peek(self)
+        if places and place_id in places:
+            places.remove(place_id)
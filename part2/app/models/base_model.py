@@ -1,8 +1,101 @@
+import sys
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class InternedString:
+    """Slot-backed attribute that interns string values.
+
+    Used for ids and foreign keys so every reference to the same id shares
+    one string object instead of holding its own copy.
+    """
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj, value):
+        if type(value) is str:
+            value = sys.intern(value)
+        setattr(obj, self.slot, value)
+
+
+class Timestamp:
+    """Slot-backed datetime attribute stored as integer epoch microseconds."""
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if type(value) is int:
+            return _EPOCH + value * _MICROSECOND
+        return value
+
+    def __set__(self, obj, value):
+        # Aware datetimes are kept as they are so their tzinfo survives
+        if isinstance(value, datetime) and value.tzinfo is None:
+            value = (value - _EPOCH) // _MICROSECOND
+        setattr(obj, self.slot, value)
+
+
+class LazyList:
+    """Slot-backed list attribute that is only allocated on first access."""
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot, None)
+        if value is None:
+            value = []
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+    def peek(self, obj):
+        """Return the list, or None if it was never allocated."""
+        return getattr(obj, self.slot, None)
+
 
 class BaseModel:
-    """Base model with id, timestamps, serialization, and updates."""
+    """Base model with id, timestamps, serialization, and updates.
+
+    Models declare their fields in `__slots__` (a descriptor's backing slot is
+    the field name prefixed with an underscore) and list the public names in
+    `_fields`, which fixes the key order of to_dict(). Attributes outside the
+    declared fields still work and are kept in a per-instance dict that is
+    only created when first needed.
+    """
+
+    __slots__ = ('_id', '_created_at', '_updated_at', '_extra')
+    _fields = ('id', 'created_at', 'updated_at')
+
+    id = InternedString()
+    created_at = Timestamp()
+    updated_at = Timestamp()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('_fields', ()):
+                if name not in fields:
+                    fields.append(name)
+        cls._all_fields = tuple(fields)
 
     def __init__(self, *args, **kwargs):
         self.id = kwargs.get('id', str(uuid.uuid4()))
@@ -13,6 +106,41 @@ class BaseModel:
             if key not in ['id', 'created_at', 'updated_at']:
                 setattr(self, key, value)
 
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails, i.e. for undeclared fields
+        try:
+            extra = object.__getattribute__(self, '_extra')
+        except AttributeError:
+            extra = None
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            if name.startswith('__') or hasattr(type(self), name):
+                raise
+            try:
+                extra = object.__getattribute__(self, '_extra')
+            except AttributeError:
+                extra = {}
+                object.__setattr__(self, '_extra', extra)
+            extra[name] = value
+
+    def __delattr__(self, name):
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            try:
+                extra = object.__getattribute__(self, '_extra')
+            except AttributeError:
+                extra = {}
+            if name not in extra:
+                raise
+            del extra[name]
+
     def save(self):
         """Refresh the updated_at timestamp."""
         self.updated_at = datetime.now()
@@ -25,9 +153,37 @@ class BaseModel:
             setattr(self, key, value)
         self.save()
 
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an instance from to_dict() output without re-validating."""
+        obj = cls.__new__(cls)
+        for key, value in data.items():
+            if key in ['created_at', 'updated_at'] and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            setattr(obj, key, value)
+        return obj
+
     def to_dict(self):
         """Return dictionary representation for serialization."""
-        result = self.__dict__.copy()
+        result = {}
+        cls = type(self)
+        for name in cls._all_fields:
+            attr = getattr(cls, name, None)
+            if isinstance(attr, LazyList):
+                value = attr.peek(self)
+                result[name] = [] if value is None else value
+                continue
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                continue  # field was never set or has been deleted
+        try:
+            result.update(object.__getattribute__(self, '_extra'))
+        except AttributeError:
+            pass
         result['created_at'] = self.created_at.isoformat()
         result['updated_at'] = self.updated_at.isoformat()
         return result
+
+
+BaseModel._all_fields = BaseModel._fields
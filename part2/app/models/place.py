@@ -1,9 +1,18 @@
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, InternedString, LazyList
 from typing import Optional, List
 
 class Place(BaseModel):
     """Place model class"""
-    
+
+    __slots__ = ('name', 'description', '_owner_id', 'city', 'address', 'latitude',
+                 'longitude', 'price_per_night', 'max_guests', '_amenities', '_reviews')
+    _fields = ('name', 'description', 'owner_id', 'city', 'address', 'latitude',
+               'longitude', 'price_per_night', 'max_guests', 'amenities', 'reviews')
+
+    owner_id = InternedString()
+    amenities = LazyList()  # List of amenity IDs
+    reviews = LazyList()  # List of review IDs
+
     def __init__(self, name: str, description: str, owner_id: str,
                  city: Optional[str] = None,
                  address: Optional[str] = None,
@@ -30,14 +39,13 @@ class Place(BaseModel):
         self.longitude = longitude
         self.price_per_night = price_per_night
         self.max_guests = max_guests
-        self.amenities = []  # List of amenity IDs
-        self.reviews = []  # List of review IDs
         
         # Validate coordinates if provided
         if latitude is not None and longitude is not None:
             self.validate_coordinates(latitude, longitude)
     
-    def validate_coordinates(self, latitude: float, longitude: float) -> bool:
+    @staticmethod
+    def validate_coordinates(latitude: float, longitude: float) -> bool:
         """Validate latitude and longitude values"""
         if not (-90 <= latitude <= 90):
             raise ValueError("Latitude must be between -90 and 90")
@@ -52,10 +60,17 @@ class Place(BaseModel):
     
     def remove_amenity(self, amenity_id: str):
         """Remove an amenity from this place"""
-        if amenity_id in self.amenities:
-            self.amenities.remove(amenity_id)
+        amenities = Place.amenities.peek(self)
+        if amenities and amenity_id in amenities:
+            amenities.remove(amenity_id)
     
     def add_review(self, review_id: str):
         """Add a review to this place"""
         if review_id not in self.reviews:
             self.reviews.append(review_id)
+
+    def remove_review(self, review_id: str):
+        """Remove a review from this place"""
+        reviews = Place.reviews.peek(self)
+        if reviews and review_id in reviews:
+            reviews.remove(review_id)
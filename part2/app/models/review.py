@@ -1,9 +1,15 @@
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, InternedString
 from typing import Optional
 
 class Review(BaseModel):
     """Review model class"""
-    
+
+    __slots__ = ('text', '_user_id', '_place_id', 'rating')
+    _fields = ('text', 'user_id', 'place_id', 'rating')
+
+    user_id = InternedString()
+    place_id = InternedString()
+
     def __init__(self, text: str, user_id: str, place_id: str,
                  rating: Optional[int] = None,
                  **kwargs):
@@ -1,9 +1,15 @@
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, LazyList
 from typing import Optional
 
 class User(BaseModel):
     """User model class"""
-    
+
+    __slots__ = ('email', 'password', 'first_name', 'last_name', '_places', '_reviews')
+    _fields = ('email', 'password', 'first_name', 'last_name', 'places', 'reviews')
+
+    places = LazyList()  # List of places owned by this user
+    reviews = LazyList()  # List of reviews written by this user
+
     def __init__(self, email: str, password: str, 
                  first_name: Optional[str] = None, 
                  last_name: Optional[str] = None,
@@ -22,8 +28,6 @@ class User(BaseModel):
         self.password = password  # Will be hashed in later implementation
         self.first_name = first_name
         self.last_name = last_name
-        self.places = []  # List of places owned by this user
-        self.reviews = []  # List of reviews written by this user
         
     def validate_email(self, email: str) -> bool:
         """Basic email validation"""
@@ -0,0 +1,143 @@
+import threading
+
+from app.persistence.repository import SortedIndex
+
+MIN_RATING = 1
+MAX_RATING = 5
+# Bayesian average prior: every place starts as if it had PRIOR_WEIGHT
+# reviews of PRIOR_MEAN stars, so a single 5-star review can't top the board
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+class RatingSummary:
+    """Running review count, rating sum and star histogram of one place"""
+
+    __slots__ = ('count', 'total', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        # histogram[0] counts 1-star reviews, histogram[4] 5-star ones
+        self.histogram = [0] * (MAX_RATING - MIN_RATING + 1)
+
+    def add(self, rating, sign=1):
+        self.count += sign
+        self.total += sign * rating
+        self.histogram[rating - MIN_RATING] += sign
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    def score(self, prior_mean=PRIOR_MEAN, prior_weight=PRIOR_WEIGHT):
+        """Bayesian average of the ratings"""
+        return (prior_weight * prior_mean + self.total) / (prior_weight + self.count)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'average': self.average,
+            'histogram': list(self.histogram),
+        }
+
+
+class RatingAggregates:
+    """Per-place rating summaries maintained in O(1) per review change
+
+    Callers report every review that is created, re-rated or deleted, so
+    reading a place's average never has to load its reviews. Places with
+    reviews are also kept in two SortedIndex leaderboards, by review count
+    and by Bayesian average, so top() never sorts the whole catalogue.
+    """
+
+    def __init__(self, prior_mean=PRIOR_MEAN, prior_weight=PRIOR_WEIGHT):
+        self.prior_mean = prior_mean
+        self.prior_weight = prior_weight
+        # place_id -> RatingSummary
+        self._summaries = {}
+        self._by_reviews = SortedIndex()
+        self._by_score = SortedIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._summaries)
+
+    def _unrank(self, place_id, summary):
+        self._by_reviews.remove(summary.count, place_id)
+        self._by_score.remove(summary.score(self.prior_mean, self.prior_weight), place_id)
+
+    def _rank(self, place_id, summary):
+        self._by_reviews.insert(summary.count, place_id)
+        self._by_score.insert(summary.score(self.prior_mean, self.prior_weight), place_id)
+
+    def record(self, place_id, rating):
+        """Count a new review"""
+        with self._lock:
+            summary = self._summaries.get(place_id)
+            if summary is None:
+                summary = self._summaries[place_id] = RatingSummary()
+            else:
+                self._unrank(place_id, summary)
+            summary.add(rating)
+            self._rank(place_id, summary)
+
+    def retract(self, place_id, rating):
+        """Forget a deleted review"""
+        with self._lock:
+            summary = self._summaries.get(place_id)
+            if summary is None:
+                return
+            self._unrank(place_id, summary)
+            summary.add(rating, sign=-1)
+            if summary.count:
+                self._rank(place_id, summary)
+            else:
+                del self._summaries[place_id]
+
+    def change(self, place_id, old_rating, new_rating):
+        """Move a review from one star bucket to another"""
+        if old_rating == new_rating:
+            return
+        with self._lock:
+            summary = self._summaries[place_id]
+            self._unrank(place_id, summary)
+            summary.add(old_rating, sign=-1)
+            summary.add(new_rating)
+            self._rank(place_id, summary)
+
+    def discard(self, place_id):
+        """Drop everything known about a deleted place"""
+        with self._lock:
+            summary = self._summaries.pop(place_id, None)
+            if summary is not None:
+                self._unrank(place_id, summary)
+
+    def top(self, by='rating', limit=10, min_reviews=0):
+        """
+        Best places by Bayesian average rating or by review count
+
+        Args:
+            by (str): 'rating' or 'reviews'
+            limit (int): Maximum number of places to return
+            min_reviews (int): Skip places with fewer reviews than this
+
+        Returns:
+            list: (place_id, score) tuples, best first
+        """
+        board = {'rating': self._by_score, 'reviews': self._by_reviews}[by]
+        results = []
+        with self._lock:
+            for score, place_id in board.descending():
+                if len(results) >= limit:
+                    break
+                if self._summaries[place_id].count >= min_reviews:
+                    results.append((place_id, score))
+        return results
+
+    def get(self, place_id):
+        """Summary of a place as a dict; places without reviews get zeros"""
+        with self._lock:
+            summary = self._summaries.get(place_id)
+            return (summary or RatingSummary()).to_dict()
@@ -0,0 +1,122 @@
+import threading
+
+
+class BitmapIndex:
+    """Index of set-valued attributes stored as one integer bitmap per key
+
+    Every tracked object owns one bit position; the bitmap of a key (e.g.
+    an amenity id) has the bits of the objects carrying it set. "Objects
+    with all of these keys" is then a chain of integer ANDs and a facet
+    count is a popcount, both running over machine words rather than
+    Python objects. Slots of removed objects are reused.
+    """
+
+    def __init__(self):
+        # obj_id -> bit position, and the reverse
+        self._slot_of = {}
+        self._ids = []
+        self._free = []
+        # key -> bitmap of the objects carrying it
+        self._bitmaps = {}
+        # obj_id -> keys carried
+        self._keys_of = {}
+        self._all = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def _slot(self, obj_id):
+        slot = self._slot_of.get(obj_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self._ids[slot] = obj_id
+            else:
+                slot = len(self._ids)
+                self._ids.append(obj_id)
+            self._slot_of[obj_id] = slot
+            self._keys_of[obj_id] = set()
+            self._all |= 1 << slot
+        return slot
+
+    def track(self, obj_id):
+        """Register an object so it is counted even without any key"""
+        with self._lock:
+            self._slot(obj_id)
+
+    def add(self, obj_id, key):
+        with self._lock:
+            slot = self._slot(obj_id)
+            self._bitmaps[key] = self._bitmaps.get(key, 0) | (1 << slot)
+            self._keys_of[obj_id].add(key)
+
+    def discard(self, obj_id, key):
+        with self._lock:
+            slot = self._slot_of.get(obj_id)
+            if slot is None or key not in self._keys_of[obj_id]:
+                return
+            self._keys_of[obj_id].discard(key)
+            bitmap = self._bitmaps[key] & ~(1 << slot)
+            if bitmap:
+                self._bitmaps[key] = bitmap
+            else:
+                del self._bitmaps[key]
+
+    def remove(self, obj_id):
+        """Forget an object and every key it carried"""
+        with self._lock:
+            slot = self._slot_of.pop(obj_id, None)
+            if slot is None:
+                return
+            mask = ~(1 << slot)
+            for key in self._keys_of.pop(obj_id):
+                bitmap = self._bitmaps[key] & mask
+                if bitmap:
+                    self._bitmaps[key] = bitmap
+                else:
+                    del self._bitmaps[key]
+            self._all &= mask
+            self._ids[slot] = None
+            self._free.append(slot)
+
+    def match_all(self, keys):
+        """Bitmap of the objects carrying every key; all objects for no keys"""
+        with self._lock:
+            bitmap = self._all
+            for key in keys:
+                bitmap &= self._bitmaps.get(key, 0)
+                if not bitmap:
+                    break
+            return bitmap
+
+    def from_ids(self, obj_ids):
+        """Bitmap of the given objects; untracked ids are ignored"""
+        with self._lock:
+            bitmap = 0
+            for obj_id in obj_ids:
+                slot = self._slot_of.get(obj_id)
+                if slot is not None:
+                    bitmap |= 1 << slot
+            return bitmap
+
+    def ids(self, bitmap):
+        """Ids of the objects whose bits are set"""
+        with self._lock:
+            bits = bin(bitmap)[:1:-1]
+            ids = []
+            slot = bits.find('1')
+            while slot != -1:
+                ids.append(self._ids[slot])
+                slot = bits.find('1', slot + 1)
+            return ids
+
+    def facets(self, bitmap):
+        """How many of the objects in bitmap carry each key"""
+        with self._lock:
+            counts = {}
+            for key, key_bitmap in self._bitmaps.items():
+                count = (bitmap & key_bitmap).bit_count()
+                if count:
+                    counts[key] = count
+            return counts
@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from app.persistence.repository import InMemoryRepository, ThreadSafeInMemoryRepository
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj):
+    if '__datetime__' in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class WriteAheadLog:
+    """Append-only JSON-lines log with batched fsync
+
+    Every record is written and flushed to the OS immediately, but fsync is
+    only issued once `sync_every` records are pending or `sync_interval`
+    seconds have passed since the last one. When writes stop, a background
+    timer syncs the records still pending once the interval runs out, so an
+    OS crash or power loss loses at most the last `sync_interval` seconds of
+    records even on an idle log; call sync() to force durability.
+    """
+
+    def __init__(self, path, sync_every=64, sync_interval=0.05):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = open(path, 'a', encoding='utf-8')
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # Guards the file against the idle-sync timer's thread
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def append(self, record):
+        line = json.dumps(record, default=_encode) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            elapsed = time.monotonic() - self._last_sync
+            if self._pending >= self.sync_every or elapsed >= self.sync_interval:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval - elapsed, self._sync_idle)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _sync_idle(self):
+        with self._lock:
+            self._timer = None
+            if not self._file.closed:
+                self._sync()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def truncate(self):
+        """Drop every record; used once a snapshot covers them"""
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    @staticmethod
+    def recover(path):
+        """Yield the records of a log file and cut off a torn final write
+
+        The torn bytes are truncated so later appends start on a clean line.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb+') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line, object_hook=_decode)
+                except ValueError:
+                    break
+                offset += len(line)
+                yield record
+            f.truncate(offset)
+
+
+class DurableInMemoryRepository(ThreadSafeInMemoryRepository):
+    """Thread-safe in-memory repository persisted through a WAL and snapshots
+
+    Each add/update/delete is appended to `wal.log` in `directory`. Every
+    `snapshot_every` mutations (or on demand through compact()) the full
+    state is written to `snapshot.json` and the log is truncated, so startup
+    only loads the latest snapshot and replays the records written after it.
+    """
+
+    SNAPSHOT_FILE = 'snapshot.json'
+    WAL_FILE = 'wal.log'
+
+    def __init__(self, directory, model_class, indexes=(), unique_indexes=(),
+                 range_indexes=(), geo_index=None, snapshot_every=10000,
+                 sync_every=64, sync_interval=0.05):
+        """
+        Initialize the repository and recover its state from disk
+
+        Args:
+            directory (str): Directory holding the snapshot and the log
+            model_class (type): Model rebuilt from stored dicts via from_dict()
+            snapshot_every (int, optional): Mutations between automatic
+                compactions; 0 disables them
+            sync_every (int, optional): Records per fsync batch
+            sync_interval (float, optional): Maximum seconds a logged
+                mutation waits for its fsync, whether or not writes continue
+        """
+        super().__init__(indexes=indexes, unique_indexes=unique_indexes,
+                         range_indexes=range_indexes, geo_index=geo_index)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.model_class = model_class
+        self.snapshot_every = snapshot_every
+        self._seq = 0
+        self._since_snapshot = 0
+        self._recover()
+        self._wal = WriteAheadLog(self._wal_path, sync_every=sync_every,
+                                  sync_interval=sync_interval)
+
+    @property
+    def _snapshot_path(self):
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+
+    @property
+    def _wal_path(self):
+        return os.path.join(self.directory, self.WAL_FILE)
+
+    def _recover(self):
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f, object_hook=_decode)
+            self._seq = snapshot['seq']
+            for data in snapshot['objects']:
+                InMemoryRepository.add(self, self.model_class.from_dict(data))
+        for record in WriteAheadLog.recover(self._wal_path):
+            # Records up to the snapshot's seq survive a crash between
+            # writing the snapshot and truncating the log
+            if record['seq'] <= self._seq:
+                continue
+            self._apply(record)
+            self._seq = record['seq']
+            self._since_snapshot += 1
+
+    def _apply(self, record):
+        op = record['op']
+        if op == 'add':
+            InMemoryRepository.add(self, self.model_class.from_dict(record['data']))
+        elif op == 'update':
+            InMemoryRepository.update(self, record['id'], record['data'])
+        elif op == 'delete':
+            InMemoryRepository.delete(self, record['id'])
+
+    def _log(self, op, **fields):
+        self._seq += 1
+        self._wal.append(dict(seq=self._seq, op=op, **fields))
+        self._since_snapshot += 1
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self._snapshot_path + '.tmp'
+        snapshot = {
+            'seq': self._seq,
+            'objects': [obj.to_dict() for obj in self._storage.values()],
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, default=_encode)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        self._wal.truncate()
+        self._since_snapshot = 0
+
+    def add(self, obj):
+        with self._lock.write_locked():
+            InMemoryRepository.add(self, obj)
+            self._log('add', data=obj.to_dict())
+
+    def update(self, obj_id, data):
+        with self._lock.write_locked():
+            if obj_id in self._storage:
+                InMemoryRepository.update(self, obj_id, data)
+                self._log('update', id=obj_id, data=data)
+
+    def delete(self, obj_id):
+        with self._lock.write_locked():
+            if obj_id in self._storage:
+                InMemoryRepository.delete(self, obj_id)
+                self._log('delete', id=obj_id)
+
+    def compact(self):
+        """Write a snapshot of the current state and truncate the log"""
+        with self._lock.write_locked():
+            self._compact()
+
+    def sync(self):
+        """Force every logged mutation to disk"""
+        with self._lock.write_locked():
+            self._wal.sync()
+
+    def close(self):
+        with self._lock.write_locked():
+            self._wal.close()
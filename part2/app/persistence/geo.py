@@ -0,0 +1,141 @@
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat, lon, lats, lons):
+    """
+    Great-circle distances from one point to many, in kilometres
+
+    With numpy installed the whole batch is computed as array operations;
+    otherwise it falls back to a plain Python loop.
+
+    Args:
+        lat (float): Latitude of the origin in degrees
+        lon (float): Longitude of the origin in degrees
+        lats (sequence): Latitudes of the targets in degrees
+        lons (sequence): Longitudes of the targets in degrees
+
+    Returns:
+        sequence: Distances aligned with lats/lons
+    """
+    if np is not None:
+        lat1 = np.radians(lat)
+        lats = np.radians(np.asarray(lats, dtype=float))
+        dlat = lats - lat1
+        dlon = np.radians(np.asarray(lons, dtype=float) - lon)
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lats) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    lat1 = math.radians(lat)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for lat2, lon2 in zip(lats, lons):
+        lat2 = math.radians(lat2)
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + cos_lat1 * math.cos(lat2) * math.sin(math.radians(lon2 - lon) / 2) ** 2)
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return distances
+
+
+class GeoGridIndex:
+    """Spatial index bucketing points into a fixed latitude/longitude grid
+
+    A radius query only visits the cells overlapping the bounding box of the
+    search circle, then measures the candidates with one batched haversine
+    call. Points can be inserted, moved and removed individually.
+    """
+
+    def __init__(self, cell_deg=0.5):
+        self.cell_deg = cell_deg
+        self._lon_cells = int(math.ceil(360 / cell_deg))
+        # (row, col) -> {obj_id: (lat, lon)}
+        self._cells = {}
+        # obj_id -> (row, col)
+        self._cell_of = {}
+
+    def __len__(self):
+        return len(self._cell_of)
+
+    def _cell(self, lat, lon):
+        row = int(math.floor((lat + 90) / self.cell_deg))
+        col = int(math.floor((lon + 180) / self.cell_deg)) % self._lon_cells
+        return row, col
+
+    def insert(self, obj_id, lat, lon):
+        """Add a point, or move it if obj_id is already indexed"""
+        self.remove(obj_id)
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[obj_id] = (lat, lon)
+        self._cell_of[obj_id] = cell
+
+    def remove(self, obj_id):
+        cell = self._cell_of.pop(obj_id, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[obj_id]
+        if not bucket:
+            del self._cells[cell]
+
+    def _candidate_cells(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        row_lo, _ = self._cell(max(lat - dlat, -90.0), lon)
+        row_hi, _ = self._cell(min(lat + dlat, 90.0), lon)
+        # Longitude degrees shrink towards the poles; near them take every column
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+        if cos_lat < 1e-9 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180:
+            cols = range(self._lon_cells)
+        else:
+            dlon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+            _, col_lo = self._cell(lat, lon - dlon)
+            span = int(math.ceil(2 * dlon / self.cell_deg)) + 1
+            cols = [(col_lo + i) % self._lon_cells for i in range(min(span, self._lon_cells))]
+        rows = range(row_lo, row_hi + 1)
+        if len(rows) * len(cols) > len(self._cells):
+            # Cheaper to walk the populated cells than the whole bounding box
+            cols = set(cols)
+            return [cell for cell in self._cells
+                    if row_lo <= cell[0] <= row_hi and cell[1] in cols]
+        return [(row, col) for row in rows for col in cols]
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """
+        Points within radius_km of (lat, lon), nearest first
+
+        Returns:
+            list: (obj_id, distance_km) tuples
+        """
+        ids, lats, lons = [], [], []
+        for cell in self._candidate_cells(lat, lon, radius_km):
+            bucket = self._cells.get(cell)
+            if not bucket:
+                continue
+            for obj_id, (point_lat, point_lon) in bucket.items():
+                ids.append(obj_id)
+                lats.append(point_lat)
+                lons.append(point_lon)
+        if not ids:
+            return []
+
+        distances = haversine_km(lat, lon, lats, lons)
+        if np is not None:
+            inside = np.flatnonzero(distances <= radius_km)
+            order = inside[np.argsort(distances[inside], kind='stable')]
+            if limit is not None:
+                order = order[:limit]
+            return [(ids[i], float(distances[i])) for i in order]
+
+        matches = [(d, i) for i, d in enumerate(distances) if d <= radius_km]
+        if limit is not None:
+            matches = heapq.nsmallest(limit, matches)
+        else:
+            matches.sort()
+        return [(ids[i], d) for d, i in matches]
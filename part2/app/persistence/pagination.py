@@ -0,0 +1,57 @@
+import base64
+import binascii
+from bisect import bisect_right
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(last_id):
+    """Turn the id of the last item on a page into an opaque cursor"""
+    return base64.urlsafe_b64encode(last_id.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Recover the id encoded by encode_cursor()"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode('ascii'), altchars=b'-_', validate=True).decode('utf-8')
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def paginate(fetch, limit=None, cursor=None):
+    """
+    Fetch one page of results and the cursor of the next one
+
+    Args:
+        fetch (callable): fetch(limit, after) returning objects ordered by id
+        limit (int, optional): Page size, defaults to DEFAULT_PAGE_SIZE and
+            is capped at MAX_PAGE_SIZE
+        cursor (str, optional): Cursor returned with the previous page
+
+    Returns:
+        tuple: (items, next_cursor); next_cursor is None on the last page
+    """
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise ValueError("Limit must be a positive integer")
+    limit = min(limit, MAX_PAGE_SIZE)
+    after = decode_cursor(cursor) if cursor else None
+    # One extra row tells us whether another page exists
+    items = fetch(limit + 1, after)
+    if len(items) > limit:
+        items = items[:limit]
+        return items, encode_cursor(items[-1].id)
+    return items, None
+
+
+def slice_by_id(objs, limit=None, after=None):
+    """Apply keyset pagination to an already materialized list of objects"""
+    objs = sorted(objs, key=lambda obj: obj.id)
+    start = 0
+    if after is not None:
+        start = bisect_right([obj.id for obj in objs], after)
+    stop = start + limit if limit is not None else None
+    return objs[start:stop]
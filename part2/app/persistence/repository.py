@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+import threading
+
+from app.persistence.geo import GeoGridIndex
 
 class Repository(ABC):
     """Abstract base repository class"""
-    
+
     @abstractmethod
     def add(self, obj):
         pass
@@ -12,7 +17,7 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self):
+    def get_all(self, limit=None, after=None):
         pass
 
     @abstractmethod
@@ -27,35 +32,451 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    def iter_all(self, batch_size=1000):
+        """Iterate over every object in id order, fetching one page at a time"""
+        after = None
+        while True:
+            batch = self.get_all(limit=batch_size, after=after)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after = batch[-1].id
+
+
+class SortedIndex:
+    """Index of (value, id) pairs kept sorted by value for range queries
+
+    Lookups bisect the sorted values, so a range query costs O(log N + k)
+    for k matches. Inserting or removing an entry is a single list insert
+    or delete.
+    """
+
+    def __init__(self):
+        self._values = []
+        self._ids = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def insert(self, value, obj_id):
+        pos = bisect_right(self._values, value)
+        self._values.insert(pos, value)
+        self._ids.insert(pos, obj_id)
+
+    def remove(self, value, obj_id):
+        lo = bisect_left(self._values, value)
+        hi = bisect_right(self._values, value)
+        for pos in range(lo, hi):
+            if self._ids[pos] == obj_id:
+                del self._values[pos]
+                del self._ids[pos]
+                return
+
+    def discard_id(self, obj_id):
+        """Remove obj_id's entry without comparing values, e.g. after a failed insert"""
+        for pos, entry_id in enumerate(self._ids):
+            if entry_id == obj_id:
+                del self._values[pos]
+                del self._ids[pos]
+                return
+
+    def _bounds(self, low, high):
+        lo = bisect_left(self._values, low) if low is not None else 0
+        hi = bisect_right(self._values, high) if high is not None else len(self._values)
+        return lo, max(lo, hi)
+
+    def count(self, low=None, high=None):
+        """Number of entries with low <= value <= high"""
+        lo, hi = self._bounds(low, high)
+        return hi - lo
+
+    def range(self, low=None, high=None):
+        """Ids of entries with low <= value <= high, in ascending value order"""
+        lo, hi = self._bounds(low, high)
+        return self._ids[lo:hi]
+
+    def descending(self):
+        """Iterate (value, id) pairs from the highest value down"""
+        for pos in range(len(self._values) - 1, -1, -1):
+            yield self._values[pos], self._ids[pos]
+
 
 class InMemoryRepository(Repository):
     """In-memory implementation of the repository"""
-    
-    def __init__(self):
+
+    def __init__(self, indexes=(), unique_indexes=(), range_indexes=(),
+                 geo_index=None):
+        """
+        Initialize the repository
+
+        Args:
+            indexes (iterable, optional): Attribute names to keep a
+                non-unique hash index on
+            unique_indexes (iterable, optional): Attribute names whose
+                values must be unique across stored objects
+            range_indexes (iterable, optional): Attribute names to keep a
+                SortedIndex on for get_range()
+            geo_index (tuple, optional): (latitude, longitude) attribute
+                names to keep a GeoGridIndex on for get_nearby()
+        """
         self._storage = {}
+        # Ids kept in sorted order for keyset pagination
+        self._sorted_ids = []
+        # attr_name -> {value: {obj_id: None}} (dict used as an ordered set)
+        self._indexes = {}
+        # attr_name -> {value: obj_id}
+        self._unique_indexes = {}
+        # attr_name -> SortedIndex
+        self._range_indexes = {}
+        # ((lat_attr, lon_attr), GeoGridIndex) or None
+        self._geo_index = None
+        for attr_name in indexes:
+            self.add_index(attr_name)
+        for attr_name in unique_indexes:
+            self.add_index(attr_name, unique=True)
+        for attr_name in range_indexes:
+            self.add_range_index(attr_name)
+        if geo_index is not None:
+            self.add_geo_index(*geo_index)
+
+    def add_index(self, attr_name, unique=False):
+        """Declare a secondary index and build it from the stored objects"""
+        if attr_name in self._indexes or attr_name in self._unique_indexes:
+            return
+        if unique:
+            index = {}
+            for obj in self._storage.values():
+                value = getattr(obj, attr_name, None)
+                if value is None:
+                    continue
+                if value in index:
+                    raise ValueError(f"Duplicate value for unique attribute '{attr_name}'")
+                index[value] = obj.id
+            self._unique_indexes[attr_name] = index
+        else:
+            index = {}
+            for obj in self._storage.values():
+                value = getattr(obj, attr_name, None)
+                if value is not None:
+                    index.setdefault(value, {})[obj.id] = None
+            self._indexes[attr_name] = index
+
+    def add_range_index(self, attr_name):
+        """Declare a sorted index for range queries and build it"""
+        if attr_name in self._range_indexes:
+            return
+        index = SortedIndex()
+        for obj in self._storage.values():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index.insert(value, obj.id)
+        self._range_indexes[attr_name] = index
+
+    def add_geo_index(self, lat_attr, lon_attr):
+        """Declare a spatial index over two coordinate attributes and build it"""
+        index = GeoGridIndex()
+        self._geo_index = ((lat_attr, lon_attr), index)
+        for obj in self._storage.values():
+            self._geo_insert(obj)
+
+    def _geo_insert(self, obj):
+        (lat_attr, lon_attr), index = self._geo_index
+        lat = getattr(obj, lat_attr, None)
+        lon = getattr(obj, lon_attr, None)
+        if lat is not None and lon is not None:
+            index.insert(obj.id, lat, lon)
+
+    def _check_unique(self, obj_id, values):
+        """Raise ValueError if any unique-indexed value belongs to another object"""
+        for attr_name, value in values.items():
+            index = self._unique_indexes.get(attr_name)
+            if index is None or value is None:
+                continue
+            owner_id = index.get(value)
+            if owner_id is not None and owner_id != obj_id:
+                raise ValueError(f"Duplicate value for unique attribute '{attr_name}'")
+
+    def _index_obj(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index[value] = obj.id
+        for attr_name, index in self._indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index.setdefault(value, {})[obj.id] = None
+        for attr_name, index in self._range_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index.insert(value, obj.id)
+        if self._geo_index is not None:
+            self._geo_insert(obj)
+
+    def _unindex_obj(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None and index.get(value) == obj.id:
+                del index[value]
+        for attr_name, index in self._indexes.items():
+            value = getattr(obj, attr_name, None)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(obj.id, None)
+                if not bucket:
+                    del index[value]
+        for attr_name, index in self._range_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index.remove(value, obj.id)
+        if self._geo_index is not None:
+            self._geo_index[1].remove(obj.id)
+
+    def _purge_obj(self, obj_id):
+        """Remove obj_id from every index by id, whatever values it was indexed under"""
+        for index in self._unique_indexes.values():
+            for value in [value for value, owner_id in index.items() if owner_id == obj_id]:
+                del index[value]
+        for index in self._indexes.values():
+            for value in [value for value, bucket in index.items() if obj_id in bucket]:
+                del index[value][obj_id]
+                if not index[value]:
+                    del index[value]
+        for index in self._range_indexes.values():
+            index.discard_id(obj_id)
+        if self._geo_index is not None:
+            self._geo_index[1].remove(obj_id)
 
     def add(self, obj):
+        self._check_unique(obj.id, {
+            attr_name: getattr(obj, attr_name, None)
+            for attr_name in self._unique_indexes
+        })
+        previous = self._storage.get(obj.id)
+        if previous is not None:
+            self._unindex_obj(previous)
+        else:
+            insort(self._sorted_ids, obj.id)
         self._storage[obj.id] = obj
+        self._index_obj(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
-    def get_all(self):
-        return list(self._storage.values())
+    def get_all(self, limit=None, after=None):
+        """Return stored objects, or one page of them ordered by id
+
+        With neither argument every object is returned in insertion order.
+        Otherwise objects are ordered by id, start strictly after the id
+        `after` and stop after `limit` items.
+        """
+        if limit is None and after is None:
+            return list(self._storage.values())
+        start = bisect_right(self._sorted_ids, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        return [self._storage[obj_id] for obj_id in self._sorted_ids[start:stop]]
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
+        obj = self._storage.get(obj_id)
         if obj:
-            for key, value in data.items():
-                setattr(obj, key, value)
+            self._check_unique(obj_id, data)
+            previous = {key: getattr(obj, key, None) for key in data}
+            self._unindex_obj(obj)
+            try:
+                for key, value in data.items():
+                    setattr(obj, key, value)
+                self._index_obj(obj)
+            except Exception:
+                # A value the indexes cannot order: restore the object as it
+                # was, so a failed update never drops it from an index
+                self._purge_obj(obj_id)
+                for key, value in previous.items():
+                    setattr(obj, key, value)
+                self._index_obj(obj)
+                raise
 
     def delete(self, obj_id):
         if obj_id in self._storage:
+            self._unindex_obj(self._storage[obj_id])
             del self._storage[obj_id]
+            del self._sorted_ids[bisect_left(self._sorted_ids, obj_id)]
 
     def get_by_attribute(self, attr_name, attr_value):
+        # None values are never indexed, so they always take the scan path
+        if attr_value is not None:
+            if attr_name in self._unique_indexes:
+                obj_id = self._unique_indexes[attr_name].get(attr_value)
+                return self._storage.get(obj_id) if obj_id is not None else None
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value)
+                return self._storage[next(iter(bucket))] if bucket else None
         return next(
-            (obj for obj in self._storage.values() 
+            (obj for obj in self._storage.values()
              if getattr(obj, attr_name) == attr_value),
             None
         )
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Return every stored object whose attribute equals the given value"""
+        if attr_value is not None:
+            if attr_name in self._unique_indexes:
+                obj_id = self._unique_indexes[attr_name].get(attr_value)
+                return [self._storage[obj_id]] if obj_id is not None else []
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value, {})
+                return [self._storage[obj_id] for obj_id in bucket]
+        return [obj for obj in self._storage.values()
+                if getattr(obj, attr_name) == attr_value]
+
+    def count_range(self, attr_name, low=None, high=None):
+        """Number of objects with low <= attribute <= high (range index required)"""
+        return self._range_indexes[attr_name].count(low, high)
+
+    def get_range(self, attr_name, low=None, high=None):
+        """
+        Return objects with low <= attribute <= high, ordered by the attribute
+
+        Either bound may be None for an open range. Objects whose attribute
+        is None are never returned. Range-indexed attributes answer in
+        O(log N + k); others fall back to a scan and a sort.
+        """
+        if attr_name in self._range_indexes:
+            return [self._storage[obj_id]
+                    for obj_id in self._range_indexes[attr_name].range(low, high)]
+        matches = [obj for obj in self._storage.values()
+                   if getattr(obj, attr_name, None) is not None
+                   and (low is None or getattr(obj, attr_name) >= low)
+                   and (high is None or getattr(obj, attr_name) <= high)]
+        return sorted(matches, key=lambda obj: getattr(obj, attr_name))
+
+    def get_nearby(self, lat, lon, radius_km, limit=None):
+        """
+        Return (obj, distance_km) pairs within radius_km of a point, nearest first
+
+        Requires a geo index declared with geo_index or add_geo_index().
+        """
+        if self._geo_index is None:
+            raise ValueError("Repository has no geo index")
+        return [(self._storage[obj_id], distance)
+                for obj_id, distance in self._geo_index[1].nearby(lat, lon, radius_km, limit)]
+
+
+class ReadWriteLock:
+    """Lock allowing many concurrent readers or a single writer
+
+    Waiting writers block new readers so a steady read load cannot starve
+    them. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ThreadSafeInMemoryRepository(InMemoryRepository):
+    """In-memory repository that can be shared between request threads
+
+    Reads run concurrently under a shared lock; add, update and delete
+    (including their index maintenance) hold the exclusive lock, so readers
+    never see a half-applied write.
+    """
+
+    def __init__(self, indexes=(), unique_indexes=(), range_indexes=(),
+                 geo_index=None):
+        self._lock = ReadWriteLock()
+        super().__init__(indexes=indexes, unique_indexes=unique_indexes,
+                         range_indexes=range_indexes, geo_index=geo_index)
+
+    def add_index(self, attr_name, unique=False):
+        with self._lock.write_locked():
+            super().add_index(attr_name, unique=unique)
+
+    def add_range_index(self, attr_name):
+        with self._lock.write_locked():
+            super().add_range_index(attr_name)
+
+    def add_geo_index(self, lat_attr, lon_attr):
+        with self._lock.write_locked():
+            super().add_geo_index(lat_attr, lon_attr)
+
+    def add(self, obj):
+        with self._lock.write_locked():
+            super().add(obj)
+
+    def get(self, obj_id):
+        with self._lock.read_locked():
+            return super().get(obj_id)
+
+    def get_all(self, limit=None, after=None):
+        with self._lock.read_locked():
+            return super().get_all(limit=limit, after=after)
+
+    def update(self, obj_id, data):
+        with self._lock.write_locked():
+            super().update(obj_id, data)
+
+    def delete(self, obj_id):
+        with self._lock.write_locked():
+            super().delete(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        with self._lock.read_locked():
+            return super().get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        with self._lock.read_locked():
+            return super().get_all_by_attribute(attr_name, attr_value)
+
+    def count_range(self, attr_name, low=None, high=None):
+        with self._lock.read_locked():
+            return super().count_range(attr_name, low=low, high=high)
+
+    def get_range(self, attr_name, low=None, high=None):
+        with self._lock.read_locked():
+            return super().get_range(attr_name, low=low, high=high)
+
+    def get_nearby(self, lat, lon, radius_km, limit=None):
+        with self._lock.read_locked():
+            return super().get_nearby(lat, lon, radius_km, limit=limit)
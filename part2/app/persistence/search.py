@@ -0,0 +1,106 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Split text into case-folded word tokens"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class InvertedIndex:
+    """In-process full-text index with BM25 ranking
+
+    Text is added per *source* (a place's own fields, or one review) and
+    attributed to a *document* (the place). A document's term counts are
+    the sum of its sources, so one review can be added, replaced or removed
+    without re-tokenizing the rest of the document.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: term frequency}
+        self._postings = {}
+        # doc_id -> token count
+        self._doc_lengths = {}
+        # source_id -> (doc_id, Counter of terms)
+        self._sources = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def _remove_source(self, source_id):
+        entry = self._sources.pop(source_id, None)
+        if entry is None:
+            return
+        doc_id, terms = entry
+        for term, count in terms.items():
+            postings = self._postings[term]
+            remaining = postings[doc_id] - count
+            if remaining:
+                postings[doc_id] = remaining
+            else:
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+        length = sum(terms.values())
+        self._total_length -= length
+        remaining = self._doc_lengths[doc_id] - length
+        if remaining:
+            self._doc_lengths[doc_id] = remaining
+        else:
+            del self._doc_lengths[doc_id]
+
+    def index(self, source_id, doc_id, text):
+        """Add or replace the text a source contributes to a document"""
+        terms = Counter(tokenize(text))
+        with self._lock:
+            self._remove_source(source_id)
+            if not terms:
+                return
+            self._sources[source_id] = (doc_id, terms)
+            for term, count in terms.items():
+                postings = self._postings.setdefault(term, {})
+                postings[doc_id] = postings.get(doc_id, 0) + count
+            length = sum(terms.values())
+            self._doc_lengths[doc_id] = self._doc_lengths.get(doc_id, 0) + length
+            self._total_length += length
+
+    def remove(self, source_id):
+        """Drop a source's contribution"""
+        with self._lock:
+            self._remove_source(source_id)
+
+    def search(self, query, limit=10):
+        """
+        Rank documents against a query with BM25
+
+        Returns:
+            list: (doc_id, score) tuples, best match first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not terms or not doc_count:
+                return []
+            avg_length = self._total_length / doc_count
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+
+FORMATS = ('ndjson', 'csv')
+MIMETYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# Flat columns written per entity; passwords and relationship lists stay out
+EXPORT_FIELDS = {
+    'users': ('id', 'email', 'first_name', 'last_name', 'created_at', 'updated_at'),
+    'places': ('id', 'name', 'description', 'owner_id', 'city', 'address', 'latitude',
+               'longitude', 'price_per_night', 'max_guests', 'created_at', 'updated_at'),
+    'reviews': ('id', 'text', 'user_id', 'place_id', 'rating', 'created_at', 'updated_at'),
+    'amenities': ('id', 'name', 'description', 'created_at', 'updated_at'),
+}
+
+
+def parse_since(value):
+    """Parse an ISO 8601 timestamp; aware values are converted to naive UTC"""
+    try:
+        since = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("since must be an ISO 8601 timestamp")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def _values(obj, fields):
+    values = []
+    for field in fields:
+        value = getattr(obj, field, None)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(value)
+    return values
+
+
+def _ndjson_chunks(rows, fields, rows_per_chunk):
+    chunk = []
+    for obj in rows:
+        chunk.append(json.dumps(dict(zip(fields, _values(obj, fields)))) + '\n')
+        if len(chunk) >= rows_per_chunk:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _csv_chunks(rows, fields, rows_per_chunk):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    pending = 0
+    for obj in rows:
+        writer.writerow(_values(obj, fields))
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_chunks(rows, entity, fmt='ndjson', rows_per_chunk=500):
+    """
+    Encode rows as NDJSON or CSV text, a chunk of rows at a time
+
+    Args:
+        rows (iterable): Model objects, consumed lazily
+        entity (str): Key of EXPORT_FIELDS naming the columns to write
+        fmt (str): 'ndjson' or 'csv'
+        rows_per_chunk (int): Rows encoded into each yielded string
+
+    Returns:
+        generator: str chunks
+    """
+    if entity not in EXPORT_FIELDS:
+        raise ValueError(f"Unknown entity '{entity}'")
+    if fmt not in FORMATS:
+        raise ValueError("Format must be 'ndjson' or 'csv'")
+    encode = _ndjson_chunks if fmt == 'ndjson' else _csv_chunks
+    return encode(rows, EXPORT_FIELDS[entity], rows_per_chunk)
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of str chunks on the fly, yielding bytes"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_export(path, rows, entity, fmt='ndjson', compress=False):
+    """Write an export to a file and return the number of bytes written"""
+    chunks = export_chunks(rows, entity, fmt)
+    written = 0
+    with open(path, 'wb') as f:
+        for chunk in (gzip_chunks(chunks) if compress else chunks):
+            data = chunk if isinstance(chunk, bytes) else chunk.encode('utf-8')
+            f.write(data)
+            written += len(data)
+    return written
@@ -1,14 +1,112 @@
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import InMemoryRepository, ThreadSafeInMemoryRepository
+from app.persistence.durable import DurableInMemoryRepository
+from app.persistence.pagination import slice_by_id
+from app.persistence.search import InvertedIndex
+from app.persistence.aggregates import RatingAggregates
+from app.persistence.bitmap import BitmapIndex
+from app.persistence.graph import RelationshipIndex
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+import os
 import re
 
+# Relation -> (source kind, target kind, whether deleting the source deletes the targets)
+RELATIONS = {
+    'owns': ('user', 'place', True),
+    'wrote': ('user', 'review', True),
+    'has_review': ('place', 'review', True),
+    'has_amenity': ('place', 'amenity', False),
+}
+
+def _check_numbers(data, names):
+    """Raise ValueError unless each of names present in data is a number or None"""
+    for name in names:
+        value = data.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{name} must be a number")
+
+
 class HBnBFacade:
     """Facade for HBnB application services"""
     
-    def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, repository_class=InMemoryRepository, data_dir=None):
+        """
+        Initialize the facade
+
+        Args:
+            repository_class (type, optional): Repository implementation to
+                use; pass ThreadSafeInMemoryRepository when the facade is
+                shared between request threads
+            data_dir (str, optional): When set, every repository is a
+                DurableInMemoryRepository persisted under this directory
+        """
+        self.data_dir = data_dir
+        self.repository_class = repository_class
+        self.user_repo = self._make_repo('users', User, unique_indexes=('email',))
+        # Lookups along relationships go through self.graph, not attribute indexes
+        self.place_repo = self._make_repo('places', Place,
+                                         range_indexes=('price_per_night', 'max_guests'),
+                                         geo_index=('latitude', 'longitude'))
+        self.review_repo = self._make_repo('reviews', Review)
+        self.amenity_repo = self._make_repo('amenities', Amenity, indexes=('name',))
+        self.search_index = InvertedIndex()
+        self.ratings = RatingAggregates()
+        self.amenity_index = BitmapIndex()
+        self.graph = RelationshipIndex(RELATIONS)
+        self._build_derived_indexes()
+
+    def _make_repo(self, name, model_class, **index_options):
+        if self.data_dir:
+            return DurableInMemoryRepository(
+                os.path.join(self.data_dir, name), model_class, **index_options)
+        return self.repository_class(**index_options)
+
+    def _build_derived_indexes(self):
+        # The search index, rating aggregates, amenity bitmaps and relationship
+        # graph live in memory only, so rebuild them from whatever the
+        # repositories recovered
+        for place in self.place_repo.get_all():
+            self._index_place(place)
+            self.graph.link('owns', place.owner_id, place.id)
+            self.amenity_index.track(place.id)
+            for amenity_id in Place.amenities.peek(place) or ():
+                self.amenity_index.add(place.id, amenity_id)
+                self.graph.link('has_amenity', place.id, amenity_id)
+        for review in self.review_repo.get_all():
+            self._index_review(review)
+            self.ratings.record(review.place_id, review.rating)
+            self.graph.link('wrote', review.user_id, review.id)
+            self.graph.link('has_review', review.place_id, review.id)
+
+    def _index_place(self, place):
+        text = ' '.join(filter(None, (place.name, place.description, place.city)))
+        self.search_index.index(('place', place.id), place.id, text)
+
+    def _index_review(self, review):
+        self.search_index.index(('review', review.id), review.place_id, review.text)
+
+    def _delete_cascading(self, kind, obj_id):
+        """Delete an object and its dependents, dropping them from every index"""
+        for kind, dependent_id in self.graph.cascade_delete(kind, obj_id):
+            if kind == 'review':
+                review = self.review_repo.get(dependent_id)
+                self.review_repo.delete(dependent_id)
+                self.search_index.remove(('review', dependent_id))
+                self.ratings.retract(review.place_id, review.rating)
+                place = self.place_repo.get(review.place_id)
+                reviews = Place.reviews.peek(place) if place else None
+                if reviews and dependent_id in reviews:
+                    self.place_repo.update(place.id, {
+                        'reviews': [other for other in reviews if other != dependent_id]})
+            elif kind == 'place':
+                self.place_repo.delete(dependent_id)
+                self.search_index.remove(('place', dependent_id))
+                self.ratings.discard(dependent_id)
+                self.amenity_index.remove(dependent_id)
+            elif kind == 'user':
+                self.user_repo.delete(dependent_id)
 
     def create_user(self, user_data):
         if not user_data.get('first_name'):
@@ -22,12 +120,235 @@ class HBnBFacade:
         user = self.user_repo.create(user_data)
         return user
 
+    def get_all_users(self, limit=None, after=None):
+        return self.user_repo.get_all(limit=limit, after=after)
+
+    def delete_user(self, user_id):
+        """Delete a user along with their places and every review on or by them"""
+        if not self.user_repo.get(user_id):
+            return False
+        self._delete_cascading('user', user_id)
+        return True
+
+    def get_places_by_owner(self, owner_id):
+        return [self.place_repo.get(place_id)
+                for place_id in self.graph.targets('owns', owner_id)]
+
+    def get_reviews_by_user(self, user_id):
+        return [self.review_repo.get(review_id)
+                for review_id in self.graph.targets('wrote', user_id)]
+
     def get_place(self, place_id):
         place = self.place_repo.get(place_id)
         if not place:
             raise LookupError("Place not found")
         return place
 
+    def create_place(self, place_data):
+        data = dict(place_data)
+        if not self.user_repo.get(data.get('owner_id')):
+            raise LookupError("Owner not found")
+        # The API speaks title/price, the model name/price_per_night
+        data.setdefault('name', data.get('title'))
+        if 'price' in data:
+            data.setdefault('price_per_night', data['price'])
+        data.setdefault('description', '')
+        _check_numbers(data, ('price_per_night', 'max_guests', 'latitude', 'longitude'))
+        amenity_ids = data.pop('amenity_ids', None) or []
+
+        place = Place(**data)
+        for amenity_id in amenity_ids:
+            if not self.amenity_repo.get(amenity_id):
+                raise LookupError("Amenity not found")
+            place.add_amenity(amenity_id)
+        self.place_repo.add(place)
+        self._index_place(place)
+        self.graph.link('owns', place.owner_id, place.id)
+        self.amenity_index.track(place.id)
+        for amenity_id in amenity_ids:
+            self.amenity_index.add(place.id, amenity_id)
+            self.graph.link('has_amenity', place.id, amenity_id)
+        return place
+
+    def update_place(self, place_id, place_data):
+        place = self.place_repo.get(place_id)
+        if not place:
+            return None
+        data = {k: v for k, v in place_data.items() if k not in ('id', 'owner_id', 'amenity_ids')}
+        if 'title' in data:
+            data['name'] = data['title']
+        if 'price' in data:
+            data['price_per_night'] = data['price']
+        # Range and geo indexes order these values, so they must be numbers
+        _check_numbers(data, ('price_per_night', 'max_guests', 'latitude', 'longitude'))
+        latitude = data.get('latitude', place.latitude)
+        longitude = data.get('longitude', place.longitude)
+        if latitude is not None and longitude is not None:
+            Place.validate_coordinates(latitude, longitude)
+
+        self.place_repo.update(place_id, data)
+        self._index_place(place)
+        return place
+
+    def delete_place(self, place_id):
+        """Delete a place together with its reviews"""
+        if not self.place_repo.get(place_id):
+            return False
+        self._delete_cascading('place', place_id)
+        return True
+
+    def add_amenity_to_place(self, place_id, amenity_id):
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise LookupError("Place not found")
+        if not self.amenity_repo.get(amenity_id):
+            raise LookupError("Amenity not found")
+        # Through the repository, so durable stores log it and indexes follow
+        amenities = list(Place.amenities.peek(place) or ())
+        if amenity_id not in amenities:
+            self.place_repo.update(place_id, {'amenities': amenities + [amenity_id]})
+        self.amenity_index.add(place_id, amenity_id)
+        self.graph.link('has_amenity', place_id, amenity_id)
+        return place
+
+    def remove_amenity_from_place(self, place_id, amenity_id):
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise LookupError("Place not found")
+        amenities = Place.amenities.peek(place) or ()
+        if amenity_id in amenities:
+            self.place_repo.update(place_id, {
+                'amenities': [other for other in amenities if other != amenity_id]})
+        self.amenity_index.discard(place_id, amenity_id)
+        self.graph.unlink('has_amenity', place_id, amenity_id)
+        return place
+
+    def get_places_with_amenity(self, amenity_id):
+        return [self.place_repo.get(place_id)
+                for place_id in self.graph.sources('has_amenity', amenity_id)]
+
+    def resolve_amenities(self, names):
+        """Map amenity names (or ids) to amenity ids"""
+        amenity_ids = []
+        for name in names:
+            amenity = self.amenity_repo.get(name) or self.amenity_repo.get_by_attribute('name', name)
+            if not amenity:
+                raise ValueError(f"Unknown amenity '{name}'")
+            amenity_ids.append(amenity.id)
+        return amenity_ids
+
+    def _place_bitmap(self, amenity_ids=None, min_price=None, max_price=None, min_guests=None):
+        """Bitmap of the places passing every filter"""
+        bitmap = self.amenity_index.match_all(amenity_ids or ())
+        if min_price is not None or max_price is not None or min_guests is not None:
+            ranged = self.get_places_in_range(min_price, max_price, min_guests)
+            bitmap &= self.amenity_index.from_ids(place.id for place in ranged)
+        return bitmap
+
+    def get_amenity_facets(self, amenity_ids=None, min_price=None, max_price=None,
+                           min_guests=None):
+        """How many of the filtered places have each amenity, keyed by amenity name"""
+        bitmap = self._place_bitmap(amenity_ids, min_price, max_price, min_guests)
+        facets = {}
+        for amenity_id, count in self.amenity_index.facets(bitmap).items():
+            amenity = self.amenity_repo.get(amenity_id)
+            if amenity:
+                facets[amenity.name] = count
+        return facets
+
+    def iter_export(self, entity, since=None):
+        """
+        Lazily iterate over every user, place, review or amenity
+
+        Args:
+            entity (str): 'users', 'places', 'reviews' or 'amenities'
+            since (datetime, optional): Only objects updated at or after it
+        """
+        repos = {'users': self.user_repo, 'places': self.place_repo,
+                 'reviews': self.review_repo, 'amenities': self.amenity_repo}
+        if entity not in repos:
+            raise ValueError(f"Unknown entity '{entity}'")
+        rows = repos[entity].iter_all()
+        if since is not None:
+            rows = (obj for obj in rows if obj.updated_at >= since)
+        return rows
+
+    def get_place_ratings(self, place_id):
+        """Review count, rating sum, average and 1-5 star histogram of a place"""
+        return self.ratings.get(place_id)
+
+    def get_top_places(self, by='rating', limit=10, min_reviews=0):
+        """Best-rated or most-reviewed places as (place, score), best first"""
+        if by not in ('rating', 'reviews'):
+            raise ValueError("Ranking must be 'rating' or 'reviews'")
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        if min_reviews < 0:
+            raise ValueError("Minimum review count cannot be negative")
+        results = []
+        for place_id, score in self.ratings.top(by, limit, min_reviews):
+            place = self.place_repo.get(place_id)
+            if place:
+                results.append((place, score))
+        return results
+
+    def search_places(self, query, limit=10):
+        """Places ranked by BM25 over their own text and their reviews, as (place, score)"""
+        if not query or not query.strip():
+            raise ValueError("Search query is required")
+        results = []
+        for place_id, score in self.search_index.search(query, limit):
+            place = self.place_repo.get(place_id)
+            if place:
+                results.append((place, score))
+        return results
+
+    def get_all_places(self, limit=None, after=None,
+                       min_price=None, max_price=None, min_guests=None, amenity_ids=None):
+        if amenity_ids:
+            bitmap = self._place_bitmap(amenity_ids, min_price, max_price, min_guests)
+            places = [self.place_repo.get(place_id)
+                      for place_id in self.amenity_index.ids(bitmap)]
+            return slice_by_id([place for place in places if place], limit, after)
+        if min_price is None and max_price is None and min_guests is None:
+            return self.place_repo.get_all(limit=limit, after=after)
+        places = self.get_places_in_range(min_price, max_price, min_guests)
+        if limit is not None or after is not None:
+            places = slice_by_id(places, limit=limit, after=after)
+        return places
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit=None):
+        """Places within radius_km of a point as (place, distance_km), nearest first"""
+        if radius_km is None or radius_km <= 0:
+            raise ValueError("Radius must be a positive number")
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        Place.validate_coordinates(latitude, longitude)
+        return self.place_repo.get_nearby(latitude, longitude, radius_km, limit)
+
+    def get_places_in_range(self, min_price=None, max_price=None, min_guests=None):
+        """Places priced within [min_price, max_price] that host at least min_guests"""
+        ranges = []
+        if min_price is not None or max_price is not None:
+            ranges.append(('price_per_night', min_price, max_price))
+        if min_guests is not None:
+            ranges.append(('max_guests', min_guests, None))
+        if not ranges:
+            return self.place_repo.get_all()
+
+        # Walk the most selective range index and check the other bounds per place
+        ranges.sort(key=lambda bounds: self.place_repo.count_range(*bounds))
+        attr_name, low, high = ranges[0]
+        places = self.place_repo.get_range(attr_name, low, high)
+        for attr_name, low, high in ranges[1:]:
+            places = [
+                place for place in places
+                if getattr(place, attr_name, None) is not None
+                and (low is None or getattr(place, attr_name) >= low)
+                and (high is None or getattr(place, attr_name) <= high)
+            ]
+        return places
+
     def create_review(self, review_data):
         if not review_data.get('text'):
             raise ValueError("Review text is required")
@@ -44,18 +365,28 @@ class HBnBFacade:
         if not place:
             raise LookupError("Place not found")
 
-        review = self.review_repo.create(review_data)
+        review = Review(**review_data)
+        self.review_repo.add(review)
+        self.place_repo.update(place.id, {
+            'reviews': list(Place.reviews.peek(place) or ()) + [review.id]})
+        self._index_review(review)
+        self.graph.link('wrote', review.user_id, review.id)
+        self.graph.link('has_review', review.place_id, review.id)
+        self.ratings.record(review.place_id, review.rating)
         return review
 
     def get_review(self, review_id):
         review = self.review_repo.get(review_id)
         return review
 
-    def get_all_reviews(self):
-        return self.review_repo.list_all()
+    def get_all_reviews(self, limit=None, after=None):
+        return self.review_repo.get_all(limit=limit, after=after)
 
-    def get_reviews_by_place(self, place_id):
-        reviews = self.review_repo.filter_by('place_id', place_id)
+    def get_reviews_by_place(self, place_id, limit=None, after=None):
+        reviews = [self.review_repo.get(review_id)
+                   for review_id in self.graph.targets('has_review', place_id)]
+        if limit is not None or after is not None:
+            reviews = slice_by_id(reviews, limit=limit, after=after)
         return reviews
 
     def update_review(self, review_id, review_data):
@@ -71,12 +402,19 @@ class HBnBFacade:
             if not (1 <= review_data['rating'] <= 5):
                 raise ValueError("Rating must be between 1 and 5")
         
-        updated_review = self.review_repo.update(review_id, review_data)
-        return updated_review
+        old_rating = review.rating
+        self.review_repo.update(review_id, review_data)
+        if 'text' in review_data:
+            self._index_review(review)
+        if 'rating' in review_data:
+            self.ratings.change(review.place_id, old_rating, review.rating)
+        return review
 
     def delete_review(self, review_id):
-        deleted = self.review_repo.delete(review_id)
-        return deleted
+        if not self.review_repo.get(review_id):
+            return False
+        self._delete_cascading('review', review_id)
+        return True
 
-facade = HBnBFacade()
+facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=os.getenv('HBNB_DATA_DIR'))
 
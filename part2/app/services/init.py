@@ -1,3 +1,5 @@
+import os
 from .facade import HBnBFacade
+from app.persistence.repository import ThreadSafeInMemoryRepository
 
-facade = HBnBFacade()
+facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=os.getenv('HBNB_DATA_DIR'))
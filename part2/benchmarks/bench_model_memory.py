@@ -0,0 +1,86 @@
+"""Compare per-object memory of the slotted models with the old dict layout.
+
+Run from the part2 directory:
+
+    python benchmarks/bench_model_memory.py [count]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.review import Review
+from app.models.place import Place
+
+
+class DictReview:
+    """The pre-__slots__ Review layout: a __dict__ and datetime objects."""
+
+    def __init__(self, text, user_id, place_id, rating):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.text = text
+        self.user_id = user_id
+        self.place_id = place_id
+        self.rating = rating
+
+
+class DictPlace:
+    """The pre-__slots__ Place layout with eagerly allocated lists."""
+
+    def __init__(self, name, description, owner_id):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.name = name
+        self.description = description
+        self.owner_id = owner_id
+        self.city = None
+        self.address = None
+        self.latitude = None
+        self.longitude = None
+        self.price_per_night = None
+        self.max_guests = None
+        self.amenities = []
+        self.reviews = []
+
+
+def measure(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Foreign keys arrive as fresh strings (e.g. parsed from JSON payloads)
+    user_ids = [str(uuid.uuid4()) for _ in range(100)]
+    place_ids = [str(uuid.uuid4()) for _ in range(100)]
+
+    def fk(ids, i):
+        return ''.join(ids[i % len(ids)])
+
+    cases = [
+        ('Review', lambda i: DictReview("Great", fk(user_ids, i), fk(place_ids, i), 5),
+         lambda i: Review(text="Great", user_id=fk(user_ids, i), place_id=fk(place_ids, i), rating=5)),
+        ('Place', lambda i: DictPlace("Loft", "Nice", fk(user_ids, i)),
+         lambda i: Place(name="Loft", description="Nice", owner_id=fk(user_ids, i))),
+    ]
+    print(f"{'model':<8} {'dict bytes/obj':>15} {'slots bytes/obj':>16} {'saving':>8}")
+    for name, old, new in cases:
+        before = measure(old, count)
+        after = measure(new, count)
+        print(f"{name:<8} {before:>15.0f} {after:>16.0f} {1 - after / before:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compare GeoGridIndex radius queries against a linear haversine scan.
+
+Run from the part2 directory:
+
+    python benchmarks/bench_nearby.py [places] [queries]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.persistence import geo
+from app.persistence.geo import GeoGridIndex, EARTH_RADIUS_KM
+
+
+def linear_scan(points, lat, lon, radius_km, limit):
+    """What a facade without a spatial index has to do: measure every place."""
+    lat1 = math.radians(lat)
+    matches = []
+    for obj_id, (lat2, lon2) in points.items():
+        lat2 = math.radians(lat2)
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(lon2 - lon) / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+        if distance <= radius_km:
+            matches.append((distance, obj_id))
+    matches.sort()
+    return matches[:limit]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(42)
+
+    # Cluster places around a few hundred "cities" like real listings
+    cities = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(300)]
+    points = {}
+    for i in range(count):
+        lat, lon = rng.choice(cities)
+        points[str(i)] = (max(-90, min(90, lat + rng.gauss(0, 0.3))),
+                          (lon + rng.gauss(0, 0.3) + 180) % 360 - 180)
+
+    start = time.perf_counter()
+    index = GeoGridIndex()
+    for obj_id, (lat, lon) in points.items():
+        index.insert(obj_id, lat, lon)
+    build = time.perf_counter() - start
+
+    centres = [rng.choice(cities) for _ in range(queries)]
+    print(f"{count} places, {queries} queries, radius 10 km, limit 50, "
+          f"numpy={'yes' if geo.np is not None else 'no'}")
+    print(f"index build: {build:.2f}s")
+
+    start = time.perf_counter()
+    for lat, lon in centres:
+        index.nearby(lat, lon, 10, limit=50)
+    indexed = (time.perf_counter() - start) / queries
+
+    scan_queries = centres[:max(1, min(queries, 3))]
+    start = time.perf_counter()
+    for lat, lon in scan_queries:
+        linear_scan(points, lat, lon, 10, 50)
+    scanned = (time.perf_counter() - start) / len(scan_queries)
+
+    print(f"geo index:   {indexed * 1000:9.2f} ms/query")
+    print(f"linear scan: {scanned * 1000:9.2f} ms/query")
+    print(f"speed-up:    {scanned / indexed:9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
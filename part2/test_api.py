@@ -2,8 +2,14 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import gzip
+import json
 import unittest
+import uuid
 from app import create_app
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.services.facade import facade as hbnb_facade
 
 class TestUserEndpoints(unittest.TestCase):
     def setUp(self):
@@ -254,5 +260,127 @@ class TestReviewEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+class TestPlaceQueryEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        tag = uuid.uuid4().hex
+        owner = User(f"{tag}@example.com", "secret", "Query", "Owner")
+        hbnb_facade.user_repo.add(owner)
+        self.amenity = Amenity(f"Sauna {tag}")
+        hbnb_facade.amenity_repo.add(self.amenity)
+        self.cheap = hbnb_facade.create_place({
+            "title": "Hut", "price": 1.25, "latitude": -89.5, "longitude": 179.5,
+            "owner_id": owner.id, "amenity_ids": [self.amenity.id]
+        })
+        self.dear = hbnb_facade.create_place({
+            "title": "Lodge", "price": 1.75, "latitude": -89.5, "longitude": 179.0,
+            "owner_id": owner.id, "amenity_ids": [self.amenity.id]
+        })
+        hbnb_facade.create_review({
+            "text": "Warm", "rating": 5, "user_id": owner.id, "place_id": self.dear.id
+        })
+
+    def test_filtered_list(self):
+        response = self.client.get('/places/', query_string={
+            "min_price": 1.5, "max_price": 2, "amenities": self.amenity.name
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place['id'] for place in response.get_json()], [self.dear.id])
+        facets = json.loads(response.headers['X-Amenity-Facets'])
+        self.assertEqual(facets[self.amenity.name], 1)
+
+    def test_update_rejects_non_numeric_price(self):
+        response = self.client.put(f'/places/{self.cheap.id}', json={"price": "abc"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/places/', query_string={"min_price": 1, "max_price": 1.5})
+        self.assertIn(self.cheap.id, [place['id'] for place in response.get_json()])
+
+    def test_filtered_list_unknown_amenity(self):
+        response = self.client.get('/places/', query_string={"amenities": "No such amenity"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_nearby(self):
+        response = self.client.get('/places/nearby', query_string={
+            "lat": -89.5, "lon": 179.5, "radius_km": 5
+        })
+        self.assertEqual(response.status_code, 200)
+        # Earlier tests leave places at the same spot in the shared facade
+        distances = [place['distance_km'] for place in response.get_json()]
+        self.assertEqual(distances, sorted(distances))
+        by_id = {place['id']: place['distance_km'] for place in response.get_json()}
+        self.assertEqual(by_id[self.cheap.id], 0.0)
+        self.assertGreater(by_id[self.dear.id], 0.0)
+
+    def test_nearby_invalid_radius(self):
+        response = self.client.get('/places/nearby', query_string={
+            "lat": 0, "lon": 0, "radius_km": -1
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_top_by_reviews(self):
+        response = self.client.get('/places/top', query_string={"by": "reviews", "limit": 100})
+        self.assertEqual(response.status_code, 200)
+        scores = {place['id']: place['score'] for place in response.get_json()}
+        self.assertEqual(scores[self.dear.id], 1)
+        self.assertNotIn(self.cheap.id, scores)
+
+
+class TestSearchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.word = f"zq{uuid.uuid4().hex[:8]}"
+        owner = User(f"{uuid.uuid4().hex}@example.com", "secret", "Search", "Owner")
+        hbnb_facade.user_repo.add(owner)
+        self.place = hbnb_facade.create_place({
+            "title": "Quiet Cabin", "description": f"Near the {self.word} lake",
+            "price": 90, "owner_id": owner.id
+        })
+
+    def test_search(self):
+        response = self.client.get('/search/', query_string={"q": self.word})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([result['id'] for result in data], [self.place.id])
+        self.assertEqual(data[0]['title'], "Quiet Cabin")
+        self.assertGreater(data[0]['score'], 0)
+
+    def test_search_blank_query(self):
+        response = self.client.get('/search/', query_string={"q": " "})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestExportEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        owner = User(f"{uuid.uuid4().hex}@example.com", "secret", "Export", "Owner")
+        hbnb_facade.user_repo.add(owner)
+        self.place = hbnb_facade.create_place({
+            "title": "Export Flat", "price": 70, "owner_id": owner.id
+        })
+
+    def test_export_places_ndjson(self):
+        response = self.client.get('/export/places')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        exported = {row['id']: row for row in rows}
+        self.assertEqual(exported[self.place.id]['name'], "Export Flat")
+
+    def test_export_places_gzip_csv(self):
+        response = self.client.get('/export/places', query_string={"format": "csv"},
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        text = gzip.decompress(response.get_data()).decode('utf-8')
+        self.assertIn(self.place.id, text)
+
+    def test_export_unknown_entity(self):
+        response = self.client.get('/export/bookings')
+        self.assertEqual(response.status_code, 400)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import unittest
+from datetime import datetime
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+
+
+class TestCompactModels(unittest.TestCase):
+    def test_models_have_no_instance_dict(self):
+        review = Review(text="Nice", user_id="u1", place_id="p1", rating=4)
+        self.assertFalse(hasattr(review, '__dict__'))
+
+    def test_to_dict_is_unchanged(self):
+        created = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        place = Place(name="Loft", description="Nice", owner_id="u1", created_at=created)
+        data = place.to_dict()
+        self.assertEqual(list(data)[:3], ['id', 'created_at', 'updated_at'])
+        self.assertEqual(data['created_at'], "2024-05-01T12:30:15.123456")
+        self.assertEqual(data['amenities'], [])
+        self.assertEqual(data['reviews'], [])
+        self.assertEqual(data['owner_id'], "u1")
+        self.assertEqual(Place.from_dict(data).to_dict(), data)
+
+    def test_relationship_lists_are_lazy(self):
+        place = Place(name="Loft", description="Nice", owner_id="u1")
+        self.assertIsNone(Place.amenities.peek(place))
+        place.remove_amenity("a1")
+        self.assertIsNone(Place.amenities.peek(place))
+        place.add_amenity("a1")
+        self.assertEqual(place.amenities, ["a1"])
+
+    def test_foreign_keys_are_interned(self):
+        user = User(email="a@example.com", password="pw")
+        place = Place(name="Loft", description="Nice", owner_id="".join(list(user.id)))
+        self.assertIs(place.owner_id, user.id)
+
+    def test_undeclared_attributes_still_work(self):
+        place = Place(name="Loft", description="Nice", owner_id="u1", title="Loft")
+        place.update({'price': 120})
+        self.assertEqual(place.title, "Loft")
+        self.assertEqual(place.to_dict()['price'], 120)
+        del place.price
+        self.assertFalse(hasattr(place, 'price'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,683 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import csv
+import gzip
+import io
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from app.models.user import User
+from app.models.review import Review
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository, ThreadSafeInMemoryRepository
+from app.persistence.durable import DurableInMemoryRepository, WriteAheadLog
+from app.persistence import geo
+from app.persistence.search import InvertedIndex
+from app.persistence.bitmap import BitmapIndex
+from app.persistence.graph import RelationshipIndex
+from app.services.facade import HBnBFacade
+from app.services import export
+
+
+class TestRepositoryIndexes(unittest.TestCase):
+    def setUp(self):
+        self.users = InMemoryRepository(unique_indexes=('email',))
+        self.reviews = InMemoryRepository(indexes=('place_id',))
+
+    def test_unique_index_lookup(self):
+        user = User(email="a@example.com", password="pw")
+        self.users.add(user)
+        self.assertIs(self.users.get_by_attribute('email', "a@example.com"), user)
+        self.assertIsNone(self.users.get_by_attribute('email', "b@example.com"))
+
+    def test_unique_index_rejects_duplicates(self):
+        self.users.add(User(email="a@example.com", password="pw"))
+        other = User(email="b@example.com", password="pw")
+        self.users.add(other)
+        with self.assertRaises(ValueError):
+            self.users.add(User(email="a@example.com", password="pw"))
+        with self.assertRaises(ValueError):
+            self.users.update(other.id, {'email': "a@example.com"})
+        self.assertEqual(other.email, "b@example.com")
+
+    def test_update_and_delete_keep_index_current(self):
+        user = User(email="a@example.com", password="pw")
+        self.users.add(user)
+        self.users.update(user.id, {'email': "new@example.com"})
+        self.assertIsNone(self.users.get_by_attribute('email', "a@example.com"))
+        self.assertIs(self.users.get_by_attribute('email', "new@example.com"), user)
+        self.users.delete(user.id)
+        self.assertIsNone(self.users.get_by_attribute('email', "new@example.com"))
+
+    def test_get_all_by_attribute(self):
+        first = Review(text="Nice", user_id="u1", place_id="p1", rating=4)
+        second = Review(text="Okay", user_id="u2", place_id="p1", rating=3)
+        third = Review(text="Bad", user_id="u1", place_id="p2", rating=1)
+        for review in (first, second, third):
+            self.reviews.add(review)
+        self.assertEqual(self.reviews.get_all_by_attribute('place_id', "p1"), [first, second])
+        self.reviews.delete(first.id)
+        self.assertEqual(self.reviews.get_all_by_attribute('place_id', "p1"), [second])
+        # Unindexed attributes fall back to a scan
+        self.assertEqual(self.reviews.get_all_by_attribute('user_id', "u1"), [third])
+
+    def test_add_index_on_populated_repository(self):
+        review = Review(text="Nice", user_id="u1", place_id="p1", rating=4)
+        self.reviews.add(review)
+        self.reviews.add_index('user_id')
+        self.assertIs(self.reviews.get_by_attribute('user_id', "u1"), review)
+
+
+class TestRangeIndexes(unittest.TestCase):
+    def setUp(self):
+        self.places = InMemoryRepository(range_indexes=('price_per_night', 'max_guests'))
+        self.by_price = {}
+        for price, guests in [(80, 2), (120, 4), (50, 1), (200, 6), (120, 2)]:
+            place = Place(name=f"P{price}", description="", owner_id="u1",
+                          price_per_night=price, max_guests=guests)
+            self.places.add(place)
+            self.by_price.setdefault(price, []).append(place)
+
+    def prices(self, places):
+        return [place.price_per_night for place in places]
+
+    def test_range_query(self):
+        self.assertEqual(self.prices(self.places.get_range('price_per_night', 60, 120)), [80, 120, 120])
+        self.assertEqual(self.prices(self.places.get_range('price_per_night', low=150)), [200])
+        self.assertEqual(self.places.count_range('max_guests', low=4), 2)
+        self.assertEqual(self.prices(self.places.get_range('max_guests', 2, 2)), [80, 120])
+
+    def test_index_follows_update_and_delete(self):
+        cheap = self.by_price[50][0]
+        self.places.update(cheap.id, {'price_per_night': 300})
+        self.assertEqual(self.prices(self.places.get_range('price_per_night', high=60)), [])
+        self.assertEqual(self.prices(self.places.get_range('price_per_night', low=250)), [300])
+        self.places.delete(cheap.id)
+        self.assertEqual(self.places.count_range('price_per_night'), 4)
+
+    def test_failed_update_keeps_the_object_indexed(self):
+        places = InMemoryRepository(range_indexes=('price_per_night',),
+                                    geo_index=('latitude', 'longitude'))
+        place = Place(name="Loft", description="", owner_id="u1", price_per_night=80,
+                      latitude=1.0, longitude=1.0)
+        other = Place(name="Hut", description="", owner_id="u1", price_per_night=50)
+        places.add(place)
+        places.add(other)
+        with self.assertRaises(TypeError):
+            places.update(place.id, {'price_per_night': 'abc', 'name': "Renamed"})
+        self.assertEqual((place.price_per_night, place.name), (80, "Loft"))
+        self.assertEqual(places.get_range('price_per_night', low=60), [place])
+        self.assertEqual([p for p, _ in places.get_nearby(1.0, 1.0, 5)], [place])
+
+    def test_facade_rejects_non_numeric_place_fields(self):
+        facade = HBnBFacade()
+        owner = User(email="host@example.com", password="pw")
+        facade.user_repo.add(owner)
+        place = facade.create_place({'title': "Loft", 'price': 80, 'owner_id': owner.id})
+        for data in ({'price': 'abc'}, {'max_guests': '4'}, {'latitude': 'north'}):
+            with self.assertRaises(ValueError):
+                facade.update_place(place.id, data)
+        self.assertEqual([p.id for p in facade.get_places_in_range(min_price=5)], [place.id])
+        with self.assertRaises(ValueError):
+            facade.create_place({'title': "Hut", 'price': 'cheap', 'owner_id': owner.id})
+
+    def test_unindexed_attribute_falls_back_to_scan(self):
+        self.places.update(self.by_price[80][0].id, {'latitude': 10.0})
+        self.assertEqual(self.prices(self.places.get_range('latitude', -90, 90)), [80])
+
+
+class TestGeoIndex(unittest.TestCase):
+    def setUp(self):
+        self.places = InMemoryRepository(geo_index=('latitude', 'longitude'))
+        self.named = {}
+        for name, lat, lon in [("paris", 48.8566, 2.3522), ("versailles", 48.8049, 2.1204),
+                               ("london", 51.5074, -0.1278), ("fiji", -17.7134, 178.065),
+                               ("samoa", -13.759, -172.1046)]:
+            place = Place(name=name, description="", owner_id="u1", latitude=lat, longitude=lon)
+            self.places.add(place)
+            self.named[name] = place
+
+    def names(self, results):
+        return [place.name for place, _ in results]
+
+    def check_queries(self):
+        results = self.places.get_nearby(48.86, 2.35, 400)
+        self.assertEqual(self.names(results), ["paris", "versailles", "london"])
+        self.assertAlmostEqual(results[2][1], 344, delta=2)
+        self.assertEqual(self.names(self.places.get_nearby(48.86, 2.35, 400, limit=1)), ["paris"])
+        # The search circle crosses the antimeridian
+        self.assertEqual(self.names(self.places.get_nearby(-15.0, 179.9, 1000)), ["fiji", "samoa"])
+
+    def test_nearby_sorted_by_distance(self):
+        self.check_queries()
+
+    def test_nearby_without_numpy(self):
+        saved = geo.np
+        geo.np = None
+        try:
+            self.check_queries()
+        finally:
+            geo.np = saved
+
+    def test_index_follows_moves_and_deletes(self):
+        london = self.named["london"]
+        self.places.update(london.id, {'latitude': 48.85, 'longitude': 2.34})
+        self.assertEqual(self.names(self.places.get_nearby(48.85, 2.34, 2)), ["london", "paris"])
+        self.places.delete(london.id)
+        self.assertEqual(self.names(self.places.get_nearby(48.85, 2.34, 2)), ["paris"])
+
+
+class TestThreadSafeRepository(unittest.TestCase):
+    THREADS = 16
+    OPERATIONS = 2000
+
+    def setUp(self):
+        self._switch_interval = sys.getswitchinterval()
+        # Force frequent thread switches to surface races
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch_interval)
+
+    def test_mixed_reads_and_writes(self):
+        repo = ThreadSafeInMemoryRepository(indexes=('place_id',))
+        errors = []
+        start = threading.Barrier(self.THREADS)
+
+        def worker(seed):
+            rng = random.Random(seed)
+            mine = []
+            try:
+                start.wait()
+                for _ in range(self.OPERATIONS):
+                    op = rng.random()
+                    if op < 0.3 or not mine:
+                        review = Review(text="t", user_id="u", place_id=f"p{rng.randrange(8)}", rating=3)
+                        repo.add(review)
+                        mine.append(review.id)
+                    elif op < 0.4:
+                        repo.delete(mine.pop(rng.randrange(len(mine))))
+                    elif op < 0.55:
+                        repo.update(rng.choice(mine), {'place_id': f"p{rng.randrange(8)}", 'rating': 4})
+                    elif op < 0.8:
+                        for review in repo.get_all():
+                            review.place_id
+                    else:
+                        repo.get_all_by_attribute('place_id', f"p{rng.randrange(8)}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        # Every stored object sits in exactly the bucket of its current value
+        indexed = 0
+        for i in range(8):
+            bucket = repo.get_all_by_attribute('place_id', f"p{i}")
+            self.assertTrue(all(review.place_id == f"p{i}" for review in bucket))
+            indexed += len(bucket)
+        self.assertEqual(indexed, len(repo.get_all()))
+
+
+
+class TestDurableRepository(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_repo(self, **kwargs):
+        return DurableInMemoryRepository(self.directory, User, unique_indexes=('email',), **kwargs)
+
+    def test_state_survives_restart(self):
+        repo = self.open_repo()
+        kept = User(email="kept@example.com", password="pw", first_name="Kept")
+        gone = User(email="gone@example.com", password="pw")
+        repo.add(kept)
+        repo.add(gone)
+        repo.update(kept.id, {'first_name': "Renamed"})
+        repo.delete(gone.id)
+        repo.close()
+
+        reopened = self.open_repo()
+        self.assertEqual([user.id for user in reopened.get_all()], [kept.id])
+        restored = reopened.get_by_attribute('email', "kept@example.com")
+        self.assertEqual(restored.first_name, "Renamed")
+        self.assertEqual(restored.created_at, kept.created_at)
+        reopened.close()
+
+    def test_compaction_truncates_log(self):
+        repo = self.open_repo(snapshot_every=3)
+        users = [User(email=f"u{i}@example.com", password="pw") for i in range(4)]
+        for user in users:
+            repo.add(user)
+        repo.close()
+        # The first three adds were folded into the snapshot
+        with open(os.path.join(self.directory, 'wal.log')) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        reopened = self.open_repo()
+        self.assertEqual(len(reopened.get_all()), 4)
+        reopened.compact()
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, 'wal.log')), 0)
+        reopened.close()
+
+    def test_torn_tail_is_ignored(self):
+        repo = self.open_repo()
+        user = User(email="a@example.com", password="pw")
+        repo.add(user)
+        repo.close()
+        with open(os.path.join(self.directory, 'wal.log'), 'a') as f:
+            f.write('{"seq": 2, "op": "delete", "i')
+
+        reopened = self.open_repo()
+        self.assertIs(reopened.get(user.id).__class__, User)
+        other = User(email="b@example.com", password="pw")
+        reopened.add(other)
+        reopened.close()
+
+        # The torn record was cut off, so the new append is replayed too
+        self.assertEqual(len(self.open_repo().get_all()), 2)
+
+    def test_idle_log_is_synced_after_the_interval(self):
+        wal = WriteAheadLog(os.path.join(self.directory, 'idle.log'),
+                            sync_every=1000, sync_interval=0.05)
+        self.addCleanup(wal.close)
+        wal.append({'seq': 1})
+        wal.append({'seq': 2})
+        self.assertEqual(wal._pending, 2)
+        # No further append arrives to notice the interval has passed
+        deadline = time.monotonic() + 2
+        while wal._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(wal._pending, 0)
+        self.assertIsNone(wal._timer)
+
+
+class TestFullTextSearch(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.owner = User(email="owner@example.com", password="pw")
+        self.facade.user_repo.add(self.owner)
+
+    def create_place(self, title, description=''):
+        return self.facade.create_place({'title': title, 'description': description,
+                                         'price': 50, 'owner_id': self.owner.id})
+
+    def test_bm25_prefers_denser_matches(self):
+        index = InvertedIndex()
+        index.index('a', 'a', 'quiet cabin by the lake')
+        index.index('b', 'b', 'lake lake lake view')
+        index.index('c', 'c', 'city loft')
+        ranked = [doc_id for doc_id, _ in index.search('Lake')]
+        self.assertEqual(ranked, ['b', 'a'])
+        self.assertEqual(index.search('nothing here'), [])
+
+    def test_places_ranked_by_title_and_reviews(self):
+        cabin = self.create_place("Lakeside cabin", "Wooden cabin")
+        loft = self.create_place("City loft", "Bright loft downtown")
+        self.facade.create_review({'text': "Cosy cabin vibes, loved the cabin",
+                                   'rating': 5, 'user_id': self.owner.id,
+                                   'place_id': loft.id})
+        results = self.facade.search_places("cabin")
+        self.assertEqual([place.id for place, _ in results], [cabin.id, loft.id])
+
+    def test_index_follows_review_and_place_changes(self):
+        place = self.create_place("Loft")
+        review = self.facade.create_review({'text': "Great sauna", 'rating': 4,
+                                            'user_id': self.owner.id,
+                                            'place_id': place.id})
+        self.assertEqual(len(self.facade.search_places("sauna")), 1)
+
+        self.facade.update_review(review.id, {'text': "Great terrace"})
+        self.assertEqual(self.facade.search_places("sauna"), [])
+        self.assertEqual(len(self.facade.search_places("terrace")), 1)
+
+        self.facade.delete_review(review.id)
+        self.assertEqual(self.facade.search_places("terrace"), [])
+
+        self.facade.update_place(place.id, {'title': "Penthouse"})
+        self.assertEqual(self.facade.search_places("loft"), [])
+        self.facade.delete_place(place.id)
+        self.assertEqual(self.facade.search_places("penthouse"), [])
+
+    def test_empty_query_rejected(self):
+        with self.assertRaises(ValueError):
+            self.facade.search_places("  ")
+
+
+class TestRatingAggregates(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.user = User(email="guest@example.com", password="pw")
+        self.facade.user_repo.add(self.user)
+        self.place = self.facade.create_place({'title': "Loft", 'price': 80,
+                                               'owner_id': self.user.id})
+
+    def review(self, rating):
+        return self.facade.create_review({'text': "Stay", 'rating': rating,
+                                          'user_id': self.user.id,
+                                          'place_id': self.place.id})
+
+    def test_empty_place(self):
+        self.assertEqual(self.facade.get_place_ratings(self.place.id),
+                         {'count': 0, 'sum': 0, 'average': None,
+                          'histogram': [0, 0, 0, 0, 0]})
+
+    def test_follows_review_changes(self):
+        first = self.review(5)
+        self.review(3)
+        self.review(4)
+        ratings = self.facade.get_place_ratings(self.place.id)
+        self.assertEqual((ratings['count'], ratings['sum'], ratings['average']), (3, 12, 4.0))
+        self.assertEqual(ratings['histogram'], [0, 0, 1, 1, 1])
+
+        self.facade.update_review(first.id, {'rating': 1})
+        ratings = self.facade.get_place_ratings(self.place.id)
+        self.assertEqual(ratings['histogram'], [1, 0, 1, 1, 0])
+        self.assertEqual(ratings['sum'], 8)
+
+        self.facade.delete_review(first.id)
+        ratings = self.facade.get_place_ratings(self.place.id)
+        self.assertEqual((ratings['count'], ratings['average']), (2, 3.5))
+
+    def test_rebuilt_from_recovered_reviews(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        facade.user_repo.add(self.user)
+        place = facade.create_place({'title': "Loft", 'price': 80, 'owner_id': self.user.id})
+        for rating in (2, 4):
+            facade.create_review({'text': "Stay", 'rating': rating,
+                                  'user_id': self.user.id, 'place_id': place.id})
+        for repo in (facade.user_repo, facade.place_repo, facade.review_repo, facade.amenity_repo):
+            repo.close()
+
+        reopened = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        self.assertEqual(reopened.get_place_ratings(place.id)['average'], 3.0)
+
+
+class TestTopPlaces(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.user = User(email="critic@example.com", password="pw")
+        self.facade.user_repo.add(self.user)
+
+    def place_with_ratings(self, title, *ratings):
+        place = self.facade.create_place({'title': title, 'price': 10, 'owner_id': self.user.id})
+        reviews = [self.facade.create_review({'text': "Ok", 'rating': rating,
+                                              'user_id': self.user.id,
+                                              'place_id': place.id})
+                   for rating in ratings]
+        return place, reviews
+
+    def top_ids(self, **kwargs):
+        return [place.id for place, _ in self.facade.get_top_places(**kwargs)]
+
+    def test_single_review_does_not_dominate(self):
+        lucky, _ = self.place_with_ratings("Lucky", 5)
+        solid, _ = self.place_with_ratings("Solid", 5, 5, 4, 5, 5, 4, 5, 5)
+        self.assertEqual(self.top_ids(by='rating'), [solid.id, lucky.id])
+        self.assertEqual(self.top_ids(by='rating', min_reviews=2), [solid.id])
+
+    def test_rankings_follow_review_changes(self):
+        busy, busy_reviews = self.place_with_ratings("Busy", 2, 2, 2)
+        quiet, _ = self.place_with_ratings("Quiet", 4, 4)
+        self.assertEqual(self.top_ids(by='reviews'), [busy.id, quiet.id])
+        self.assertEqual(self.top_ids(by='rating'), [quiet.id, busy.id])
+
+        for review in busy_reviews:
+            self.facade.update_review(review.id, {'rating': 5})
+        self.assertEqual(self.top_ids(by='rating', limit=1), [busy.id])
+
+        self.facade.delete_review(busy_reviews[0].id)
+        self.facade.delete_review(busy_reviews[1].id)
+        self.assertEqual(self.top_ids(by='reviews', limit=1), [quiet.id])
+
+        self.facade.delete_place(quiet.id)
+        self.assertEqual(self.top_ids(by='reviews'), [busy.id])
+
+    def test_invalid_ranking(self):
+        with self.assertRaises(ValueError):
+            self.facade.get_top_places(by='price')
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.users = [User(email=f"user{i}@example.com", password="pw", first_name=f"U{i}")
+                      for i in range(7)]
+        for user in self.users:
+            self.facade.user_repo.add(user)
+
+    def test_iter_all_walks_every_page(self):
+        ids = [user.id for user in self.facade.user_repo.iter_all(batch_size=3)]
+        self.assertEqual(ids, sorted(user.id for user in self.users))
+
+    def test_ndjson_and_csv(self):
+        lines = ''.join(export.export_chunks(self.facade.iter_export('users'), 'users',
+                                             rows_per_chunk=2)).splitlines()
+        first = json.loads(lines[0])
+        self.assertEqual(len(lines), 7)
+        self.assertNotIn('password', first)
+        self.assertEqual(first['email'], self.facade.user_repo.get(first['id']).email)
+
+        text = ''.join(export.export_chunks(self.facade.iter_export('users'), 'users', 'csv',
+                                            rows_per_chunk=3))
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(list(rows[0]), list(export.EXPORT_FIELDS['users']))
+
+    def test_since_and_gzip(self):
+        since = self.users[0].updated_at
+        self.users[3].updated_at = since.replace(year=since.year - 1)
+        rows = list(self.facade.iter_export('users', since))
+        self.assertEqual(len(rows), 6)
+
+        chunks = export.export_chunks(rows, 'users')
+        lines = gzip.decompress(b''.join(export.gzip_chunks(chunks))).splitlines()
+        self.assertEqual(len(lines), 6)
+
+        with self.assertRaises(ValueError):
+            self.facade.iter_export('bookings')
+        with self.assertRaises(ValueError):
+            export.parse_since('yesterday')
+
+    def test_write_export(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'users.csv.gz')
+        written = export.write_export(path, self.facade.iter_export('users'), 'users',
+                                      'csv', compress=True)
+        self.assertEqual(written, os.path.getsize(path))
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(len(f.read().splitlines()), 8)
+
+
+class TestAmenityBitmaps(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.owner = User(email="host@example.com", password="pw")
+        self.facade.user_repo.add(self.owner)
+        self.amenities = {}
+        for name in ("wifi", "pool", "parking"):
+            amenity = Amenity(name=name)
+            self.facade.amenity_repo.add(amenity)
+            self.amenities[name] = amenity.id
+
+    def create_place(self, price, *names):
+        return self.facade.create_place({
+            'title': "Place", 'price': price, 'owner_id': self.owner.id,
+            'amenity_ids': [self.amenities[name] for name in names]})
+
+    def filtered(self, names, **filters):
+        ids = self.facade.resolve_amenities(names)
+        places = self.facade.get_all_places(amenity_ids=ids, **filters)
+        return {place.id for place in places}, self.facade.get_amenity_facets(ids, **filters)
+
+    def test_bitmap_index_reuses_slots(self):
+        index = BitmapIndex()
+        index.add('a', 'wifi')
+        index.add('b', 'wifi')
+        index.add('b', 'pool')
+        self.assertEqual(index.ids(index.match_all(['wifi', 'pool'])), ['b'])
+        index.remove('a')
+        index.add('c', 'pool')
+        self.assertEqual(len(index._ids), 2)
+        self.assertEqual(sorted(index.ids(index.match_all(['pool']))), ['b', 'c'])
+        self.assertEqual(index.facets(index.match_all([])), {'wifi': 1, 'pool': 2})
+
+    def test_all_of_filter_with_facets(self):
+        both = self.create_place(50, "wifi", "pool")
+        wifi = self.create_place(60, "wifi", "parking")
+        self.create_place(70, "pool")
+
+        ids, facets = self.filtered(["wifi"])
+        self.assertEqual(ids, {both.id, wifi.id})
+        self.assertEqual(facets, {'wifi': 2, 'pool': 1, 'parking': 1})
+
+        ids, facets = self.filtered(["wifi", "pool"])
+        self.assertEqual(ids, {both.id})
+
+        ids, facets = self.filtered(["wifi"], min_price=55)
+        self.assertEqual(ids, {wifi.id})
+        self.assertEqual(facets, {'wifi': 1, 'parking': 1})
+
+        with self.assertRaises(ValueError):
+            self.facade.resolve_amenities(["sauna"])
+
+    def test_index_follows_amenity_changes(self):
+        place = self.create_place(50, "wifi")
+        self.facade.add_amenity_to_place(place.id, self.amenities["pool"])
+        self.assertEqual(self.filtered(["wifi", "pool"])[0], {place.id})
+
+        self.facade.remove_amenity_from_place(place.id, self.amenities["wifi"])
+        self.assertEqual(self.filtered(["wifi"])[0], set())
+        self.assertEqual(self.facade.get_amenity_facets(), {'pool': 1})
+
+        self.facade.delete_place(place.id)
+        self.assertEqual(self.facade.get_amenity_facets(), {})
+
+    def test_amenity_changes_survive_restart(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        facade.user_repo.add(self.owner)
+        for name, amenity_id in self.amenities.items():
+            facade.amenity_repo.add(Amenity(name=name, id=amenity_id))
+        place = facade.create_place({'title': "Place", 'price': 50, 'owner_id': self.owner.id,
+                                     'amenity_ids': [self.amenities["wifi"]]})
+        facade.add_amenity_to_place(place.id, self.amenities["pool"])
+        facade.remove_amenity_from_place(place.id, self.amenities["wifi"])
+        for repo in (facade.user_repo, facade.place_repo, facade.review_repo, facade.amenity_repo):
+            repo.close()
+
+        reopened = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        self.assertEqual(reopened.place_repo.get(place.id).amenities, [self.amenities["pool"]])
+        self.assertEqual(reopened.get_amenity_facets(), {'pool': 1})
+
+
+class TestRelationshipGraph(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.host = User(email="host@example.com", password="pw")
+        self.guest = User(email="guest@example.com", password="pw")
+        self.facade.user_repo.add(self.host)
+        self.facade.user_repo.add(self.guest)
+        self.wifi = Amenity(name="wifi")
+        self.facade.amenity_repo.add(self.wifi)
+
+    def create_place(self, owner):
+        return self.facade.create_place({'title': "Place", 'price': 10, 'owner_id': owner.id,
+                                         'amenity_ids': [self.wifi.id]})
+
+    def create_review(self, user, place, rating=4):
+        return self.facade.create_review({'text': "Nice", 'rating': rating,
+                                          'user_id': user.id, 'place_id': place.id})
+
+    def test_cascade_order_and_cleanup(self):
+        graph = RelationshipIndex({'owns': ('user', 'place', True),
+                                   'tagged': ('place', 'tag', False)})
+        graph.link('owns', 'u', 'p1')
+        graph.link('owns', 'u', 'p2')
+        graph.link('tagged', 'p1', 't')
+        self.assertEqual(graph.cascade_delete('user', 'u'),
+                         [('place', 'p2'), ('place', 'p1'), ('user', 'u')])
+        self.assertEqual(graph.sources('tagged', 't'), [])
+        self.assertEqual(graph.targets('owns', 'u'), [])
+
+    def test_reverse_lookups(self):
+        house = self.create_place(self.host)
+        flat = self.create_place(self.host)
+        review = self.create_review(self.guest, house)
+        self.assertEqual(self.facade.get_places_by_owner(self.host.id), [house, flat])
+        self.assertEqual(self.facade.get_reviews_by_user(self.guest.id), [review])
+        self.assertEqual(self.facade.get_reviews_by_place(house.id), [review])
+        self.assertEqual(self.facade.get_places_with_amenity(self.wifi.id), [house, flat])
+
+    def test_deleting_user_cascades(self):
+        house = self.create_place(self.host)
+        guest_place = self.create_place(self.guest)
+        on_house = self.create_review(self.guest, house)
+        by_host = self.create_review(self.host, guest_place, rating=2)
+        self.create_review(self.guest, guest_place, rating=5)
+
+        self.assertTrue(self.facade.delete_user(self.host.id))
+        self.assertIsNone(self.facade.user_repo.get(self.host.id))
+        self.assertIsNone(self.facade.place_repo.get(house.id))
+        self.assertIsNone(self.facade.review_repo.get(on_house.id))
+        self.assertIsNone(self.facade.review_repo.get(by_host.id))
+
+        # Survivors lose their references to the deleted objects
+        self.assertNotIn(by_host.id, guest_place.reviews)
+        self.assertEqual(self.facade.get_place_ratings(guest_place.id)['count'], 1)
+        self.assertEqual(len(self.facade.get_reviews_by_user(self.guest.id)), 1)
+        self.assertEqual(self.facade.get_places_with_amenity(self.wifi.id), [guest_place])
+        self.assertIsNotNone(self.facade.amenity_repo.get(self.wifi.id))
+        self.assertFalse(self.facade.delete_user(self.host.id))
+
+    def test_graph_rebuilt_from_recovered_data(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        facade.user_repo.add(self.host)
+        place = facade.create_place({'title': "Loft", 'price': 80, 'owner_id': self.host.id})
+        for repo in (facade.user_repo, facade.place_repo, facade.review_repo, facade.amenity_repo):
+            repo.close()
+
+        reopened = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        self.assertEqual([p.id for p in reopened.get_places_by_owner(self.host.id)], [place.id])
+
+    def test_review_links_survive_restart(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        facade = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        facade.user_repo.add(self.host)
+        facade.user_repo.add(self.guest)
+        place = facade.create_place({'title': "Loft", 'price': 80, 'owner_id': self.host.id})
+        kept = facade.create_review({'text': "Nice", 'rating': 4,
+                                     'user_id': self.guest.id, 'place_id': place.id})
+        dropped = facade.create_review({'text': "Meh", 'rating': 2,
+                                        'user_id': self.host.id, 'place_id': place.id})
+        facade.delete_review(dropped.id)
+        for repo in (facade.user_repo, facade.place_repo, facade.review_repo, facade.amenity_repo):
+            repo.close()
+
+        reopened = HBnBFacade(ThreadSafeInMemoryRepository, data_dir=directory)
+        self.assertEqual(reopened.place_repo.get(place.id).reviews, [kept.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,38 @@
+import os
 from flask import Flask
 from flask_restx import Api
 from config import DevelopmentConfig
-from app.extensions import db, bcrypt, jwt
+from app.extensions import db, bcrypt, jwt, migrate, cache, compression
+from app.persistence.pool import engine_options
+from app.persistence.routing import remember_last_write, replica_binds
+from app.persistence.sqlite import apply_pragmas
 
 def create_app(config_class=DevelopmentConfig):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    app.config['SQLALCHEMY_BINDS'] = {**replica_binds(app.config),
+                                      **app.config.get('SQLALCHEMY_BINDS', {})}
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_pragmas(engine, app.config.get('SQLITE_PRAGMAS'))
+    app.after_request(remember_last_write)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    compression.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
 
    
     from app.api.v1.auth import auth as auth_ns
     from app.api.v1.users import ns as users_ns, ns_users as admin_users_ns
     from app.api.v1.places import ns as places_ns
     from app.api.v1.reviews import ns as reviews_ns
+    from app.api.v1.export import api as export_ns
+    from app.api.v1.system import api as system_ns
 
     # Register all API namespaces
     api = Api(app, version="1.0", title="HBnB API", prefix="/api/v1")
@@ -25,6 +41,11 @@ def create_app(config_class=DevelopmentConfig):
     api.add_namespace(admin_users_ns, path="/admin/users")
     api.add_namespace(places_ns, path="/places")
     api.add_namespace(reviews_ns, path="/reviews")
+    api.add_namespace(export_ns, path="/export")
+    api.add_namespace(system_ns, path="/system")
+
+    from app.commands import register_commands
+    register_commands(app)
 
     print("Routes loaded:")
     print([str(rule) for rule in app.url_map.iter_rules()])
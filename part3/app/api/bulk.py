@@ -0,0 +1,55 @@
+import json
+from flask import request
+from flask_restx import fields, reqparse
+from app.api.streaming import NDJSON_MIMETYPE
+
+MAX_BULK_ITEMS = 50000
+
+bulk_parser = reqparse.RequestParser()
+bulk_parser.add_argument('mode', choices=('best_effort', 'atomic'), default='best_effort',
+                         location='args',
+                         help='atomic inserts all items or none; best_effort keeps every valid item')
+
+
+def bulk_result_model(api):
+    """Response model of the bulk create endpoints, registered on a namespace"""
+    item = api.model('BulkItemResult', {
+        'index': fields.Integer(description='Position of the item in the request'),
+        'status': fields.String(description='created, error or skipped'),
+        'id': fields.String(description='ID of the created object'),
+        'error': fields.String(description='Why the item was not created'),
+    })
+    return api.model('BulkResult', {
+        'created': fields.Integer,
+        'failed': fields.Integer,
+        'skipped': fields.Integer,
+        'results': fields.List(fields.Nested(item, skip_none=True)),
+    })
+
+
+def read_items():
+    """Items of a bulk request body, sent as a JSON array or as NDJSON"""
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = []
+        for number, line in enumerate(request.get_data(as_text=True).splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"Line {number} is not valid JSON")
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise ValueError("Body must be a JSON array or NDJSON")
+    if len(items) > MAX_BULK_ITEMS:
+        raise ValueError(f"At most {MAX_BULK_ITEMS} items per request")
+    return items
+
+
+def bulk_response(result):
+    """201 when every item was created, 207 for a partial success, 400 otherwise"""
+    body = result.to_dict()
+    if not body['failed'] and not body['skipped']:
+        return body, 201
+    return body, 207 if body['created'] else 400
@@ -0,0 +1,141 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised when brotli is absent
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv',
+                          'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class _Gzip:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            # Sync-flush every chunk so a streamed body still arrives progressively
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class _Brotli:
+    name = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class _Zstd:
+    name = 'zstd'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class Compression:
+    """
+    Compress responses with the best encoding the client accepts
+
+    gzip is always available; br and zstd are offered when the brotli or
+    zstandard package is installed. Bodies below COMPRESS_MIN_SIZE are sent
+    as they are, and responses that already carry a Content-Encoding (such
+    as the gzipped exports) are left alone. Streamed bodies are compressed
+    chunk by chunk, flushing after each one.
+    """
+
+    def __init__(self, app=None):
+        self.encoders = {}
+        self.min_size = 500
+        self.mimetypes = COMPRESSIBLE_MIMETYPES
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.min_size = config.get('COMPRESS_MIN_SIZE', 500)
+        self.mimetypes = tuple(config.get('COMPRESS_MIMETYPES', COMPRESSIBLE_MIMETYPES))
+        # Server preference order, used to break ties between equal q-values
+        encoders = {'zstd': _Zstd(config.get('COMPRESS_ZSTD_LEVEL', 3)) if zstandard else None,
+                    'br': _Brotli(config.get('COMPRESS_BROTLI_QUALITY', 4)) if brotli else None,
+                    'gzip': _Gzip(config.get('COMPRESS_LEVEL', 6))}
+        self.encoders = {name: encoder for name, encoder in encoders.items()
+                         if encoder is not None and name in config.get('COMPRESS_ALGORITHMS', encoders)}
+        app.after_request(self.after_request)
+
+    def negotiate(self, accept_encodings):
+        """Pick the accepted encoding with the highest q-value, or None"""
+        best, best_quality = None, 0
+        for name in self.encoders:
+            quality = accept_encodings[name]
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def after_request(self, response):
+        from flask import request
+
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or request.method == 'HEAD'
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+        response.vary.add('Accept-Encoding')
+        name = self.negotiate(request.accept_encodings)
+        if name is None:
+            return response
+        encoder = self.encoders[name]
+
+        if response.is_streamed:
+            response.response = encoder.stream(response.iter_encoded())
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(encoder.compress(data))
+        response.headers['Content-Encoding'] = name
+        # The compressed bytes differ from the identity ones, so a strong
+        # ETag becomes weak; If-None-Match still matches it by weak comparison
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import Response, request
+
+
+def _etag(*parts):
+    return hashlib.blake2b(':'.join(str(part) for part in parts).encode('utf-8'),
+                           digest_size=16).hexdigest()
+
+
+def entity_validators(entity):
+    """(etag, last_modified) of one entity, from its id and updated_at"""
+    if entity is None:
+        return None
+    return _etag(type(entity).__name__, entity.id, entity.updated_at.isoformat()), entity.updated_at
+
+
+def collection_validators(version):
+    """
+    (etag, last_modified) of a list response, from a CollectionVersion row
+
+    The query string and Accept header are part of the tag, since they pick
+    the page, filters and format of the representation.
+    """
+    number = version.version if version is not None else 0
+    last_modified = version.updated_at if version is not None else None
+    return (_etag(getattr(version, 'name', ''), number, request.full_path,
+                  request.headers.get('Accept', '')),
+            last_modified)
+
+
+def _http_date(value):
+    # Stored timestamps are naive UTC; HTTP dates carry whole seconds only
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def _with_headers(resp, headers):
+    if isinstance(resp, Response):
+        resp.headers.update(headers)
+        return resp
+    if isinstance(resp, tuple):
+        data, code, extra = (resp + (None, None))[:3]
+        return data, code or 200, {**headers, **(extra or {})}
+    return resp, 200, headers
+
+
+def conditional(validators):
+    """
+    Answer If-None-Match / If-Modified-Since with a 304 before the view runs
+
+    validators receives the endpoint's own arguments and returns
+    (etag, last_modified), or None to let the view answer (e.g. with a 404).
+    Must sit above marshal_with and streamable so a 304 skips serialization.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            found = validators(*args, **kwargs)
+            if found is None:
+                return f(*args, **kwargs)
+            etag, last_modified = found
+            headers = {'ETag': f'"{etag}"'}
+            if last_modified is not None:
+                headers['Last-Modified'] = _http_date(last_modified).strftime(
+                    '%a, %d %b %Y %H:%M:%S GMT')
+            if _not_modified(etag, last_modified):
+                return Response(status=304, headers=headers)
+            return _with_headers(f(*args, **kwargs), headers)
+        return wrapper
+    return decorator
@@ -0,0 +1,300 @@
+import json
+from datetime import datetime
+from functools import wraps
+from http import HTTPStatus
+
+from flask import Response, current_app, request
+from flask_restx import fields as restx_fields, marshal
+from flask_restx.fields import is_indexable_but_not_string
+from flask_restx.marshalling import make, marshal_with
+from flask_restx.utils import merge, unpack
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+# The only layout orjson writes; with these RESTX_JSON settings its output
+# matches json.dumps byte for byte
+COMPACT_JSON = {'separators': (',', ':'), 'ensure_ascii': False}
+
+_PRIMITIVES = {
+    restx_fields.String: str,
+    restx_fields.Integer: int,
+    restx_fields.Float: float,
+    restx_fields.Boolean: bool,
+}
+
+_compiled = {}
+
+
+class _ReprFloat(float):
+    """
+    A float orjson would spell differently from repr()
+
+    Exponents, NaN and infinities; orjson refuses float subclasses, so a body
+    holding one is encoded by json.dumps instead.
+    """
+    __slots__ = ()
+
+
+def _is_plain(value):
+    # repr() switches to an exponent below 1e-4 and from 1e16 on
+    return value == 0.0 or 1e-4 <= abs(value) < 1e16
+
+
+def _exact(value):
+    """Mark the floats of a value produced outside the compiled fast paths"""
+    if value.__class__ is float:
+        return value if _is_plain(value) else _ReprFloat(value)
+    if isinstance(value, (list, tuple)):
+        return [_exact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _exact(item) for key, item in value.items()}
+    return value
+
+
+def _constant_default(field, formatted=True):
+    """(True, value) when a field's None output does not depend on the object"""
+    if callable(field.default):
+        return False, None
+    default = field.default
+    if formatted and default:
+        return True, field.format(default)
+    return True, default
+
+
+def _primitive_type(field):
+    if type(field) in _PRIMITIVES and not field.mask:
+        return _PRIMITIVES[type(field)]
+    if type(field) is restx_fields.DateTime and field.dt_format == 'iso8601' and not field.mask:
+        return datetime
+    return None
+
+
+def _list_output(field, key, convert):
+    """List.output for list and tuple values, with convert for each item"""
+    def output(value, obj):
+        if isinstance(value, (list, tuple)):
+            result = convert(value)
+            if result is not None:
+                return result
+        return _exact(field.output(key, obj))
+    return output
+
+
+def _primitive_items(kind):
+    def convert(value):
+        for item in value:
+            if item.__class__ is not kind or (kind is float and not _is_plain(item)):
+                return None
+        return list(value)
+    return convert
+
+
+def _nested_items(serialize):
+    def convert(value):
+        if None in value:
+            return None
+        return [serialize(item) for item in value]
+    return convert
+
+
+class _Compiler:
+    """Generates the source of one model's serializer"""
+
+    def __init__(self, model):
+        self.model = model
+        self.namespace = {'datetime': datetime, '_exact': _exact}
+        self.names = 0
+
+    def bind(self, value):
+        name = f'_{self.names}'
+        self.names += 1
+        self.namespace[name] = value
+        return name
+
+    def getter(self, field, key, mapping):
+        attribute = key if field.attribute is None else field.attribute
+        if callable(attribute):
+            return f'{self.bind(attribute)}(obj)'
+        if not isinstance(attribute, str) or '.' in attribute:
+            return None
+        if mapping:
+            # dict methods would be found by restx's getattr() fallback
+            return None if hasattr(dict, attribute) else f'obj.get({attribute!r})'
+        return f'getattr(obj, {attribute!r}, None)'
+
+    def value(self, field, key, var):
+        """Expression formatting var the way field.output() would, or None"""
+        fallback = f'_exact({self.bind(field)}.output({key!r}, obj))'
+        kind = _primitive_type(field)
+        if kind is not None:
+            known, default = _constant_default(field)
+            if not known:
+                return None
+            fast = f'{var}.isoformat()' if kind is datetime else var
+            test = f'{var}.__class__ is {self.bind(kind)}'
+            if kind is float:
+                test += f' and ({var} == 0.0 or 1e-4 <= abs({var}) < 1e16)'
+            default = self.bind(_exact(default))
+            return f'({default} if {var} is None else {fast} if {test} else {fallback})'
+        if type(field) is restx_fields.Nested and not field.skip_none:
+            if field.allow_null:
+                on_none = 'None'
+            elif field.default is None:
+                # marshal(None, nested), which the compiled function reproduces
+                on_none = None
+            else:
+                on_none = fallback
+            serialize = self.bind(compile_model(field.nested))
+            if on_none is None:
+                return f'{serialize}({var})'
+            return f'({on_none} if {var} is None else {serialize}({var}))'
+        if type(field) is restx_fields.List:
+            container = field.container
+            kind = _primitive_type(container)
+            if container.attribute is not None:
+                return None
+            if kind in (str, int, float, bool) and container.default is None:
+                convert = _primitive_items(kind)
+            elif (type(container) is restx_fields.Nested and not container.skip_none
+                    and container.default is None):
+                convert = _nested_items(compile_model(container.nested))
+            else:
+                return None
+            known, default = _constant_default(field, formatted=False)
+            if not known:
+                return None
+            output = self.bind(_list_output(field, key, convert))
+            return f'({self.bind(default)} if {var} is None else {output}({var}, obj))'
+        return None
+
+    def branch(self, fields, mapping):
+        lines, items = [], []
+        for i, (key, field) in enumerate(fields.items()):
+            if isinstance(field, dict):
+                items.append(f'{key!r}: _exact({self.bind(marshal)}(obj, {self.bind(field)}))')
+                continue
+            field = make(field)
+            getter = self.getter(field, key, mapping)
+            value = self.value(field, key, f'v{i}') if getter else None
+            if value is None:
+                items.append(f'{key!r}: _exact({self.bind(field)}.output({key!r}, obj))')
+            else:
+                lines.append(f'v{i} = {getter}')
+                items.append(f'{key!r}: {value}')
+        lines.append('return {' + ', '.join(items) + '}')
+        return lines
+
+    def compile(self):
+        fields = getattr(self.model, 'resolved', self.model)
+        plain = set()
+        source = ['def serialize(obj):',
+                  '    cls = obj.__class__',
+                  f'    if cls in {self.bind(plain)}:']
+        source += ['        ' + line for line in self.branch(fields, mapping=False)]
+        source.append('    if cls is dict:')
+        source += ['        ' + line for line in self.branch(fields, mapping=True)]
+        source.append(f'    return {self.bind(self.classify)}(obj)')
+        self.plain = plain
+        exec('\n'.join(source), self.namespace)
+        self.serialize = self.namespace['serialize']
+        return self.serialize
+
+    def classify(self, obj):
+        # Mirrors marshal(): lists map over their items, other containers are
+        # read with obj[key], and everything else through getattr()
+        if isinstance(obj, (list, tuple)):
+            return [self.serialize(item) for item in obj]
+        if isinstance(obj, dict) or is_indexable_but_not_string(obj):
+            return _exact(marshal(obj, self.model))
+        self.plain.add(obj.__class__)
+        return self.serialize(obj)
+
+
+def compile_model(model):
+    """
+    Compile a flask_restx model into a function equivalent to marshal(data, model)
+
+    The fields are walked once, here, and common field types become inline
+    expressions; anything unusual falls back to the field's own output().
+    Floats orjson cannot reproduce come out as a float subclass it refuses.
+    Results are cached per model.
+    """
+    entry = _compiled.get(id(model))
+    if entry is not None and entry[0] is model:
+        return entry[1]
+    fields = getattr(model, 'resolved', model)
+    if getattr(model, '__mask__', None) or any(
+            isinstance(make(field), restx_fields.Wildcard)
+            for field in fields.values() if not isinstance(field, dict)):
+        def serialize(data):
+            return _exact(marshal(data, model))
+    else:
+        serialize = _Compiler(model).compile()
+    _compiled[id(model)] = (model, serialize)
+    return serialize
+
+
+def _json_settings():
+    settings = dict(current_app.config.get('RESTX_JSON', {}))
+    if current_app.debug:
+        settings.setdefault('indent', 4)
+    return settings
+
+
+def _is_compact(settings):
+    return (tuple(settings.get('separators') or ()) == COMPACT_JSON['separators']
+            and settings.get('ensure_ascii') is False
+            and not any(value for key, value in settings.items() if key not in COMPACT_JSON))
+
+
+def dumps(data):
+    """
+    Encode data to the bytes flask_restx's output_json would send
+
+    orjson is used when installed, allowed by JSON_ENCODER and the RESTX_JSON
+    settings ask for the compact layout it writes; otherwise json.dumps.
+    """
+    settings = _json_settings()
+    if (orjson is not None and current_app.config.get('JSON_ENCODER', 'auto') == 'auto'
+            and _is_compact(settings)):
+        try:
+            return orjson.dumps(data) + b'\n'
+        except TypeError:
+            # Marked floats, big integers and other values orjson refuses
+            pass
+    return (json.dumps(data, **settings) + '\n').encode('utf-8')
+
+
+def serialize_with(ns, model, as_list=False, code=HTTPStatus.OK, description=None):
+    """
+    Drop-in for ns.marshal_with that serializes with the compiled model
+
+    The response is documented the same way. Requests carrying a field mask
+    header are answered by flask_restx's marshal, which implements masks.
+    """
+    serialize = compile_model(model)
+
+    def decorator(f):
+        f.__apidoc__ = merge(getattr(f, '__apidoc__', {}), {
+            'responses': {str(code): (description, [model] if as_list else model, {})},
+            '__mask__': True,
+        })
+        masked = marshal_with(model, ordered=ns.ordered)(f)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if request.headers.get(current_app.config.get('RESTX_MASK_HEADER', 'X-Fields')):
+                return masked(*args, **kwargs)
+            data, status, headers = unpack(f(*args, **kwargs))
+            return Response(dumps(serialize(data)), status, headers,
+                            content_type='application/json')
+        return wrapper
+    return decorator
+
+
+def serialize_list_with(ns, model, **kwargs):
+    """Drop-in for ns.marshal_list_with"""
+    return serialize_with(ns, model, as_list=True, **kwargs)
@@ -0,0 +1,70 @@
+import json
+from functools import wraps
+from flask import Response, request, stream_with_context
+from flask_restx import inputs, reqparse
+from app.api.pagination import pagination_parser
+from app.api.serializers import compile_model
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+stream_parser = reqparse.RequestParser()
+stream_parser.add_argument('stream', type=inputs.boolean, location='args', default=False,
+                           help='Stream every row as JSON, or NDJSON if accepted')
+
+list_parser = pagination_parser.copy()
+for argument in stream_parser.args:
+    list_parser.add_argument(argument)
+
+
+def _generate(rows, fields, ndjson, rows_per_chunk):
+    """Marshal and encode rows one at a time, yielding a few rows per chunk"""
+    serialize = compile_model(fields)
+    chunk = []
+    first = True
+    if not ndjson:
+        yield '['
+    for row in rows:
+        encoded = json.dumps(serialize(row))
+        if ndjson:
+            chunk.append(encoded + '\n')
+        else:
+            chunk.append(encoded if first else ',' + encoded)
+            first = False
+        if len(chunk) >= rows_per_chunk:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+    if not ndjson:
+        yield ']'
+
+
+def stream_marshalled(rows, fields, rows_per_chunk=100):
+    """
+    Build a streamed response from an iterable of model objects
+
+    The body is a JSON array, or NDJSON when the client prefers
+    application/x-ndjson. Only one chunk of rows is held in memory at a time.
+    """
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    ndjson = best == NDJSON_MIMETYPE
+    return Response(
+        stream_with_context(_generate(rows, fields, ndjson, rows_per_chunk)),
+        mimetype=NDJSON_MIMETYPE if ndjson else 'application/json')
+
+
+def streamable(fields, rows_for):
+    """
+    Serve a list endpoint as a streamed body when called with ?stream=true
+
+    Must sit above marshal_list_with so the streamed response bypasses it.
+    rows_for receives the endpoint's own arguments and returns an iterable.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if stream_parser.parse_args().get('stream'):
+                return stream_marshalled(rows_for(*args, **kwargs), fields)
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,7 +1,12 @@
 from flask_restx import Namespace, Resource, fields, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services import facade as hbnb_facade
+from app.services.facade import facade as hbnb_facade
+from app.persistence.unit_of_work import transactional
 from app.services.auth import admin_required
+from app.api.streaming import stream_parser, streamable
+from app.api.conditional import conditional, collection_validators
+from app.api.serializers import serialize_with, serialize_list_with
+from app.api.bulk import bulk_parser, bulk_result_model, read_items, bulk_response
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -22,9 +27,13 @@ amenity_response_model = api.model('AmenityResponse', {
 @api.route('/')
 class AmenityList(Resource):
     @api.doc('list_amenities')
-    @api.marshal_list_with(amenity_response_model)
+    @api.expect(stream_parser)
+    @conditional(lambda self: collection_validators(
+        hbnb_facade.get_collection_version('amenities')))
+    @streamable(amenity_response_model, lambda self: hbnb_facade.iter_amenities())
+    @serialize_list_with(api, amenity_response_model)
     def get(self):
-        """List all amenities (public)"""
+        """List all amenities, optionally streamed (public)"""
         try:
             amenities = hbnb_facade.get_all_amenities()
             return amenities, 200
@@ -38,6 +47,7 @@ class AmenityList(Resource):
     @api.response(201, 'Amenity created')
     @api.marshal_with(amenity_response_model, code=201)
     @admin_required
+    @transactional
     def post(self):
         """Create a new amenity (admin only)"""
         data = api.payload
@@ -56,12 +66,36 @@ class AmenityList(Resource):
         except Exception as e:
             abort(500, str(e))
 
+bulk_model = bulk_result_model(api)
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.doc('bulk_create_amenities', security='apikey')
+    @api.expect(bulk_parser, [amenity_input_model])
+    @api.response(201, 'All amenities created')
+    @api.response(207, 'Some amenities created')
+    @api.response(400, 'Nothing created')
+    @api.response(403, 'Forbidden')
+    @api.marshal_with(bulk_model)
+    @admin_required
+    def post(self):
+        """Create many amenities from a JSON array or NDJSON body (admin only)"""
+        args = bulk_parser.parse_args()
+        try:
+            items = read_items()
+            result = hbnb_facade.bulk_create_amenities(items, atomic=args['mode'] == 'atomic')
+            return bulk_response(result)
+        except ValueError as e:
+            abort(400, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
 @api.response(404, 'Amenity not found')
 class AmenityResource(Resource):
     @api.doc('get_amenity')
-    @api.marshal_with(amenity_response_model)
+    @serialize_with(api, amenity_response_model)
     def get(self, amenity_id):
         """Get amenity by ID (public)"""
         try:
@@ -78,6 +112,7 @@ class AmenityResource(Resource):
     @api.response(403, 'Forbidden')
     @api.marshal_with(amenity_response_model)
     @admin_required
+    @transactional
     def put(self, amenity_id):
         """Update amenity details (admin only)"""
         data = api.payload
@@ -103,6 +138,7 @@ class AmenityResource(Resource):
     @api.response(403, 'Forbidden')
     @api.response(409, 'Amenity in use')
     @admin_required
+    @transactional
     def delete(self, amenity_id):
         """Delete amenity (admin only)"""
         try:
@@ -1,10 +1,33 @@
+import json
 from flask_restx import Namespace, Resource, fields, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.facade import facade as hbnb_facade
-from app.services.auth import admin_required
+from app.persistence.unit_of_work import transactional
+from app.services.auth import admin_required, current_user as authenticated_user
+from app.api.pagination import paginated
+from app.api.streaming import list_parser, streamable
+from app.api.conditional import conditional, collection_validators, entity_validators
+from app.api.serializers import serialize_with, serialize_list_with
+from app.api.bulk import bulk_parser, bulk_result_model, read_items, bulk_response
 
 api = Namespace('places', description='Place operations')
 
+place_filter_parser = list_parser.copy()
+place_filter_parser.add_argument('min_price', type=float, location='args',
+                                 help='Lowest price per night')
+place_filter_parser.add_argument('max_price', type=float, location='args',
+                                 help='Highest price per night')
+place_filter_parser.add_argument('amenities', type=str, location='args',
+                                 help='Comma-separated amenity names; places must have all of them')
+
+top_parser = api.parser()
+top_parser.add_argument('by', choices=('rating', 'reviews'), default='rating', location='args',
+                        help='Rank by Bayesian average rating or by review count')
+top_parser.add_argument('limit', type=int, default=10, location='args',
+                        help='Maximum number of places to return')
+top_parser.add_argument('min_reviews', type=int, default=0, location='args',
+                        help='Only rank places with at least this many reviews')
+
 place_input_model = api.model('PlaceInput', {
     'title': fields.String(required=True, description='Place title'),
     'description': fields.String(description='Place description'),
@@ -14,6 +37,8 @@ place_input_model = api.model('PlaceInput', {
     'amenity_ids': fields.List(fields.String, description='List of amenity IDs')
 })
 
+PLACE_FIELDS = ('title', 'description', 'price', 'latitude', 'longitude', 'amenity_ids')
+
 place_response_model = api.model('PlaceResponse', {
     'id': fields.String(description='Place ID'),
     'title': fields.String(description='Place title'),
@@ -26,18 +51,55 @@ place_response_model = api.model('PlaceResponse', {
         'id': fields.String,
         'name': fields.String
     }))),
+    'ratings': fields.Nested(api.model('RatingSummary', {
+        'count': fields.Integer(description='Number of reviews'),
+        'sum': fields.Integer(description='Sum of all ratings'),
+        'average': fields.Float(description='Mean rating, null without reviews'),
+        'histogram': fields.List(fields.Integer, description='Review counts for 1 to 5 stars')
+    }), attribute='rating_summary'),
     'created_at': fields.DateTime(description='Creation timestamp'),
     'updated_at': fields.DateTime(description='Last update timestamp')
 })
 
+def _place_filters(args):
+    """Facade keyword arguments for the price and amenity filters of a listing"""
+    names = [name.strip() for name in (args['amenities'] or '').split(',') if name.strip()]
+    return dict(min_price=args['min_price'],
+                max_price=args['max_price'],
+                amenity_ids=hbnb_facade.resolve_amenities(names))
+
+def _streamed_places(self):
+    try:
+        filters = _place_filters(place_filter_parser.parse_args())
+    except ValueError as e:
+        abort(400, str(e))
+    return hbnb_facade.iter_places(**filters)
+
 @api.route('/')
 class PlaceList(Resource):
     @api.doc('list_places')
-    @api.marshal_list_with(place_response_model)
+    @api.expect(place_filter_parser)
+    @conditional(lambda self: collection_validators(
+        hbnb_facade.get_collection_version('places')))
+    @streamable(place_response_model, _streamed_places)
+    @serialize_list_with(api, place_response_model)
     def get(self):
-        """List all places (public)"""
+        """
+        List places, optionally filtered by price and amenities, one page at a time or streamed (public)
+
+        The X-Amenity-Facets header holds a JSON object counting, per
+        amenity, how many of the filtered places have it.
+        """
+        args = place_filter_parser.parse_args()
         try:
-            return hbnb_facade.get_all_places(), 200
+            filters = _place_filters(args)
+            places, code, headers = paginated(
+                lambda limit, after: hbnb_facade.get_all_places(limit, after, **filters),
+                args)
+            headers['X-Amenity-Facets'] = json.dumps(hbnb_facade.get_amenity_facets(**filters))
+            return places, code, headers
+        except ValueError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -45,10 +107,13 @@ class PlaceList(Resource):
     @api.expect(place_input_model)
     @api.response(400, 'Invalid input')
     @api.response(201, 'Place created')
+    @transactional
     @api.marshal_with(place_response_model, code=201)
     @jwt_required()
     def post(self):
         """Create a new place (authenticated)"""
+        # transactional sits outside marshal_with: the response is built
+        # before the commit expires the place's attributes
         current_user = get_jwt_identity()
         data = api.payload
         
@@ -58,14 +123,64 @@ class PlaceList(Resource):
         if not isinstance(data.get('price'), (int, float)) or data['price'] <= 0:
             abort(400, 'Price must be a positive number')
 
-        # Set the owner to the current user
-        data['owner_id'] = current_user['id']
-
+        values = {key: data[key] for key in PLACE_FIELDS if key in data}
         try:
-            place = hbnb_facade.create_place(data)
+            # The owner is the current user
+            place = hbnb_facade.create_place(owner_id=current_user, **values)
             return place, 201
         except ValueError as e:
             abort(400, str(e))
+        except LookupError as e:
+            abort(404, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
+bulk_model = bulk_result_model(api)
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.doc('bulk_create_places', security='apikey')
+    @api.expect(bulk_parser, [place_input_model])
+    @api.response(201, 'All places created')
+    @api.response(207, 'Some places created')
+    @api.response(400, 'Nothing created')
+    @api.marshal_with(bulk_model)
+    @jwt_required()
+    def post(self):
+        """Create many places from a JSON array or NDJSON body (authenticated)"""
+        current_user = get_jwt_identity()
+        args = bulk_parser.parse_args()
+        try:
+            items = read_items()
+            result = hbnb_facade.bulk_create_places(
+                items, current_user, atomic=args['mode'] == 'atomic')
+            return bulk_response(result)
+        except ValueError as e:
+            abort(400, str(e))
+        except LookupError as e:
+            abort(404, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
+place_top_model = api.inherit('PlaceTop', place_response_model, {
+    'rating_score': fields.Float(description='Bayesian average rating')
+})
+
+@api.route('/top')
+class TopPlaces(Resource):
+    @api.doc('top_places')
+    @api.expect(top_parser)
+    @api.response(400, 'Invalid ranking parameters')
+    @conditional(lambda self: collection_validators(
+        hbnb_facade.get_collection_version('places')))
+    @serialize_list_with(api, place_top_model)
+    def get(self):
+        """List the best-rated or most-reviewed places (public)"""
+        args = top_parser.parse_args()
+        try:
+            return hbnb_facade.get_top_places(args['by'], args['limit'], args['min_reviews']), 200
+        except ValueError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -74,7 +189,8 @@ class PlaceList(Resource):
 @api.response(404, 'Place not found')
 class PlaceResource(Resource):
     @api.doc('get_place')
-    @api.marshal_with(place_response_model)
+    @conditional(lambda self, place_id: entity_validators(hbnb_facade.get_place(place_id)))
+    @serialize_with(api, place_response_model)
     def get(self, place_id):
         """Get place by ID (public)"""
         try:
@@ -89,35 +205,38 @@ class PlaceResource(Resource):
     @api.expect(place_input_model)
     @api.response(400, 'Invalid input')
     @api.response(403, 'Forbidden')
+    @transactional
     @api.marshal_with(place_response_model)
     @jwt_required()
     def put(self, place_id):
         """Update place details (owner or admin)"""
         current_user = get_jwt_identity()
-        
+        place = hbnb_facade.get_place(place_id)
+        if not place:
+            abort(404, 'Place not found')
+
+        # Check if current user is owner or admin
+        user = authenticated_user()
+        is_admin = bool(user and user.is_admin)
+        if place.owner_id != current_user and not is_admin:
+            abort(403, 'Only the owner or admin can update this place')
+
+        data = api.payload
+        # Price validation if provided
+        if 'price' in data and (not isinstance(data['price'], (int, float)) or data['price'] <= 0):
+            abort(400, 'Price must be a positive number')
+
+        updates = {key: data[key] for key in PLACE_FIELDS if key in data}
+        # Prevent owner_id change unless admin
+        if 'owner_id' in data and is_admin:
+            updates['owner_id'] = data['owner_id']
+
         try:
-            place = hbnb_facade.get_place(place_id)
-            if not place:
-                abort(404, 'Place not found')
-            
-            # Check if current user is owner or admin
-            is_admin = current_user.get('is_admin', False)
-            if place['owner_id'] != current_user['id'] and not is_admin:
-                abort(403, 'Only the owner or admin can update this place')
-
-            data = api.payload
-            # Price validation if provided
-            if 'price' in data and (not isinstance(data['price'], (int, float)) or data['price'] <= 0):
-                abort(400, 'Price must be a positive number')
-
-            # Prevent owner_id change unless admin
-            if 'owner_id' in data and not is_admin:
-                del data['owner_id']
-
-            place = hbnb_facade.update_place(place_id, data)
-            return place, 200
+            return hbnb_facade.update_place(place, **updates), 200
         except ValueError as e:
             abort(400, str(e))
+        except LookupError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -125,21 +244,21 @@ class PlaceResource(Resource):
     @api.response(204, 'Place deleted')
     @api.response(403, 'Forbidden')
     @jwt_required()
+    @transactional
     def delete(self, place_id):
         """Delete a place (owner or admin)"""
         current_user = get_jwt_identity()
-        
-        try:
-            place = hbnb_facade.get_place(place_id)
-            if not place:
-                abort(404, 'Place not found')
-            
-            # Check if current user is owner or admin
-            is_admin = current_user.get('is_admin', False)
-            if place['owner_id'] != current_user['id'] and not is_admin:
-                abort(403, 'Only the owner or admin can delete this place')
+        place = hbnb_facade.get_place(place_id)
+        if not place:
+            abort(404, 'Place not found')
 
-            hbnb_facade.delete_place(place_id)
+        # Check if current user is owner or admin
+        user = authenticated_user()
+        if place.owner_id != current_user and not (user and user.is_admin):
+            abort(403, 'Only the owner or admin can delete this place')
+
+        try:
+            hbnb_facade.delete(place)
             return '', 204
         except Exception as e:
             abort(500, str(e))
@@ -153,20 +272,18 @@ class PlaceTransfer(Resource):
     @api.expect(api.model('TransferInput', {
         'new_owner_id': fields.String(required=True)
     }))
+    @transactional
     @api.marshal_with(place_response_model)
     @admin_required
     def put(self, place_id):
         """Transfer place ownership (admin only)"""
+        place = hbnb_facade.get_place(place_id)
+        if not place:
+            abort(404, 'Place not found')
+
         try:
-            place = hbnb_facade.get_place(place_id)
-            if not place:
-                abort(404, 'Place not found')
-            
-            new_owner_id = api.payload['new_owner_id']
-            if not hbnb_facade.user_repo.get(new_owner_id):
-                abort(400, 'New owner not found')
-            
-            updated_place = hbnb_facade.update_place(place_id, {'owner_id': new_owner_id})
-            return updated_place, 200
+            return hbnb_facade.update_place(place, owner_id=api.payload['new_owner_id']), 200
+        except LookupError:
+            abort(400, 'New owner not found')
         except Exception as e:
             abort(500, str(e))
@@ -1,6 +1,12 @@
 from flask_restx import Namespace, Resource, fields, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services import facade as hbnb_facade
+from app.services.facade import facade as hbnb_facade
+from app.persistence.unit_of_work import transactional
+from app.api.pagination import pagination_parser, paginated
+from app.api.streaming import list_parser, streamable
+from app.api.conditional import conditional, collection_validators, entity_validators
+from app.api.serializers import serialize_with, serialize_list_with
+from app.api.bulk import bulk_parser, bulk_result_model, read_items, bulk_response
 
 api = Namespace('reviews', description='Review operations')
 
@@ -19,7 +25,7 @@ review_response_model = api.model(
         'id': fields.String(description='Review ID'),
         'text': fields.String(description='Review content'),
         'rating': fields.Integer(description='Rating (1-5)'),
-        'user_id': fields.String(description='User ID'),
+        'user_id': fields.String(attribute='owner_id', description='User ID'),
         'place_id': fields.String(description='Place ID'),
         'created_at': fields.DateTime(description='Creation date'),
         'updated_at': fields.DateTime(description='Last update date'),
@@ -29,11 +35,18 @@ review_response_model = api.model(
 @api.route('/')
 class ReviewList(Resource):
     @api.doc('list_reviews')
-    @api.marshal_list_with(review_response_model)
+    @api.expect(list_parser)
+    @conditional(lambda self: collection_validators(
+        hbnb_facade.get_collection_version('reviews')))
+    @streamable(review_response_model, lambda self: hbnb_facade.iter_reviews())
+    @serialize_list_with(api, review_response_model)
     def get(self):
-        """List all reviews (public)"""
+        """List reviews, one page at a time or streamed (public)"""
+        args = pagination_parser.parse_args()
         try:
-            return hbnb_facade.get_all_reviews(), 200
+            return paginated(hbnb_facade.get_all_reviews, args)
+        except ValueError as e:
+            abort(400, str(e))
         except Exception as e:
             abort(500, str(e))
 
@@ -46,6 +59,7 @@ class ReviewList(Resource):
     @api.response(201, 'Review created')
     @api.marshal_with(review_response_model, code=201)
     @jwt_required()
+    @transactional
     def post(self):
         """Create a new review (authenticated)"""
         current_user = get_jwt_identity()
@@ -54,28 +68,28 @@ class ReviewList(Resource):
         if not data.get('text'):
             abort(400, 'Review text is required')
 
+        if not data.get('place_id'):
+            abort(400, 'Place ID is required')
+
         if not isinstance(data.get('rating'), int) or not (1 <= data['rating'] <= 5):
             abort(400, 'Rating must be an integer between 1 and 5')
 
+        # Check if place exists
+        place = hbnb_facade.get_place(data['place_id'])
+        if not place:
+            abort(404, 'Place not found')
+
+        # Check if user is trying to review their own place
+        if place.owner_id == current_user:
+            abort(403, 'Cannot review your own place')
+
+        # Check for existing review by this user for this place
+        if hbnb_facade.has_reviewed(current_user, place.id):
+            abort(409, 'You have already reviewed this place')
+
         try:
-            # Check if place exists
-            place = hbnb_facade.get_place(data['place_id'])
-            if not place:
-                abort(404, 'Place not found')
-            
-            # Check if user is trying to review their own place
-            if place['owner_id'] == current_user:
-                abort(403, 'Cannot review your own place')
-            
-            # Check for existing review by this user for this place
-            existing_reviews = hbnb_facade.get_reviews_by_place(data['place_id'])
-            for review in existing_reviews:
-                if review['user_id'] == current_user:
-                    abort(409, 'You have already reviewed this place')
-            
-            # Add the current user as the reviewer
-            data['user_id'] = current_user
-            review = hbnb_facade.create_review(data)
+            # The current user is the reviewer
+            review = hbnb_facade.create_review(data['text'], current_user, place.id, data['rating'])
             return review, 201
         except ValueError as e:
             abort(400, str(e))
@@ -84,21 +98,46 @@ class ReviewList(Resource):
         except Exception as e:
             abort(500, str(e))
 
+bulk_model = bulk_result_model(api)
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @api.doc('bulk_create_reviews', security='apikey')
+    @api.expect(bulk_parser, [review_input_model])
+    @api.response(201, 'All reviews created')
+    @api.response(207, 'Some reviews created')
+    @api.response(400, 'Nothing created')
+    @api.marshal_with(bulk_model)
+    @jwt_required()
+    def post(self):
+        """Create many reviews from a JSON array or NDJSON body (authenticated)"""
+        current_user = get_jwt_identity()
+        args = bulk_parser.parse_args()
+        try:
+            items = read_items()
+            result = hbnb_facade.bulk_create_reviews(
+                items, current_user, atomic=args['mode'] == 'atomic')
+            return bulk_response(result)
+        except ValueError as e:
+            abort(400, str(e))
+        except LookupError as e:
+            abort(404, str(e))
+        except Exception as e:
+            abort(500, str(e))
+
 @api.route('/<string:review_id>')
 @api.param('review_id', 'The review identifier')
 @api.response(404, 'Review not found')
 class ReviewResource(Resource):
     @api.doc('get_review')
-    @api.marshal_with(review_response_model)
+    @conditional(lambda self, review_id: entity_validators(hbnb_facade.get_review(review_id)))
+    @serialize_with(api, review_response_model)
     def get(self, review_id):
         """Get review by ID (public)"""
-        try:
-            review = hbnb_facade.get_review(review_id)
-            if not review:
-                abort(404, 'Review not found')
-            return review, 200
-        except Exception as e:
-            abort(500, str(e))
+        review = hbnb_facade.get_review(review_id)
+        if not review:
+            abort(404, 'Review not found')
+        return review, 200
 
     @api.doc('update_review', security='apikey')
     @api.expect(review_input_model)
@@ -106,6 +145,7 @@ class ReviewResource(Resource):
     @api.response(403, 'Forbidden')
     @api.marshal_with(review_response_model)
     @jwt_required()
+    @transactional
     def put(self, review_id):
         """Update review details (reviewer only)"""
         current_user = get_jwt_identity()
@@ -113,23 +153,18 @@ class ReviewResource(Resource):
         if 'rating' in api.payload and (not isinstance(api.payload['rating'], int) or not (1 <= api.payload['rating'] <= 5)):
             abort(400, 'Rating must be an integer between 1 and 5')
 
+        review = hbnb_facade.get_review(review_id)
+        if not review:
+            abort(404, 'Review not found')
+
+        if review.owner_id != current_user:
+            abort(403, 'Only the reviewer can update this review')
+
+        # Only text and rating can change, never place_id or user_id
+        updates = {key: api.payload[key] for key in ('text', 'rating') if key in api.payload}
+
         try:
-            review = hbnb_facade.get_review(review_id)
-            if not review:
-                abort(404, 'Review not found')
-            
-            if review['user_id'] != current_user:
-                abort(403, 'Only the reviewer can update this review')
-            
-            # Prevent changing place_id or user_id
-            data = api.payload
-            if 'place_id' in data:
-                del data['place_id']
-            if 'user_id' in data:
-                del data['user_id']
-            
-            review = hbnb_facade.update_review(review_id, data)
-            return review, 200
+            return hbnb_facade.update_review(review, **updates), 200
         except ValueError as e:
             abort(400, str(e))
         except Exception as e:
@@ -139,22 +174,21 @@ class ReviewResource(Resource):
     @api.response(204, 'Review deleted')
     @api.response(403, 'Forbidden')
     @jwt_required()
+    @transactional
     def delete(self, review_id):
         """Delete a review (reviewer or admin only)"""
         current_user = get_jwt_identity()
         
+        review = hbnb_facade.get_review(review_id)
+        if not review:
+            abort(404, 'Review not found')
+
+        # In a real app, you might want to check for admin role here too
+        if review.owner_id != current_user:
+            abort(403, 'Only the reviewer can delete this review')
+
         try:
-            review = hbnb_facade.get_review(review_id)
-            if not review:
-                abort(404, 'Review not found')
-            
-            # In a real app, you might want to check for admin role here too
-            if review['user_id'] != current_user:
-                abort(403, 'Only the reviewer can delete this review')
-            
-            success = hbnb_facade.delete_review(review_id)
-            if not success:
-                abort(404, 'Review not found')
+            hbnb_facade.delete_review(review)
             return '', 204
         except Exception as e:
             abort(500, str(e))
@@ -164,12 +198,21 @@ class ReviewResource(Resource):
 @api.response(404, 'Place not found')
 class PlaceReviews(Resource):
     @api.doc('get_place_reviews')
-    @api.marshal_list_with(review_response_model)
+    @api.expect(list_parser)
+    @conditional(lambda self, place_id: collection_validators(
+        hbnb_facade.get_collection_version('reviews')))
+    @streamable(review_response_model,
+                lambda self, place_id: hbnb_facade.iter_reviews_by_place(place_id))
+    @serialize_list_with(api, review_response_model)
     def get(self, place_id):
-        """Get all reviews for a specific place (public)"""
+        """Get the reviews for a specific place, one page at a time or streamed (public)"""
+        args = pagination_parser.parse_args()
         try:
-            reviews = hbnb_facade.get_reviews_by_place(place_id)
-            return reviews, 200
+            return paginated(
+                lambda limit, after: hbnb_facade.get_reviews_by_place(place_id, limit, after),
+                args)
+        except ValueError as e:
+            abort(400, str(e))
         except LookupError as e:
             abort(404, str(e))
         except Exception as e:
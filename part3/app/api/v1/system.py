@@ -0,0 +1,47 @@
+from flask_restx import Namespace, Resource, fields
+from app.extensions import db, cache
+from app.services.auth import admin_required
+from app.persistence.pool import pool_status
+
+api = Namespace('system', description='Operational metrics')
+
+pool_model = api.model('PoolStatus', {
+    'pool': fields.String(description='Pool implementation'),
+    'size': fields.Integer(description='Configured pool size'),
+    'checked_in': fields.Integer(description='Idle connections in the pool'),
+    'checked_out': fields.Integer(description='Connections in use'),
+    'overflow': fields.Integer(description='Connections opened beyond the pool size'),
+    'max_overflow': fields.Integer(description='Allowed overflow connections'),
+    'waits': fields.Integer(description='Checkouts since startup'),
+    'wait_avg_ms': fields.Float(description='Mean time spent waiting for a connection'),
+    'wait_max_ms': fields.Float(description='Longest time spent waiting for a connection'),
+})
+
+cache_model = api.model('CacheStats', {
+    'backend': fields.String(description='Cache backend, null when caching is off'),
+    'entries': fields.Integer(description='Entries currently cached'),
+    'hits': fields.Integer(description='Lookups answered from the cache'),
+    'misses': fields.Integer(description='Lookups that went to the database'),
+    'evictions': fields.Integer(description='Entries dropped to stay within CACHE_MAX_ENTRIES'),
+    'invalidations': fields.Integer(description='Keys dropped by committed writes'),
+})
+
+@api.route('/pool')
+class PoolStatus(Resource):
+    @api.doc('pool_status', security='apikey')
+    @api.response(403, 'Forbidden')
+    @api.marshal_with(pool_model, skip_none=True)
+    @admin_required
+    def get(self):
+        """Connection pool occupancy and checkout wait times (admin only)"""
+        return pool_status(db.engine), 200
+
+@api.route('/cache')
+class CacheStats(Resource):
+    @api.doc('cache_stats', security='apikey')
+    @api.response(403, 'Forbidden')
+    @api.marshal_with(cache_model)
+    @admin_required
+    def get(self):
+        """Read-through cache counters (admin only)"""
+        return cache.stats(), 200
@@ -1,7 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.auth import admin_required
-from app.services import facade
+from app.services.facade import facade
+from app.persistence.unit_of_work import transactional
+from app.api.pagination import pagination_parser, paginated
+from app.api.bulk import bulk_parser, bulk_result_model, read_items, bulk_response
+from app.api.serializers import serialize_with, serialize_list_with
 
 api = Namespace('users', description='User operations')
 
@@ -27,16 +31,22 @@ user_request_model = api.model('UserRequest', {
 
 @api.route('/')
 class UserList(Resource):
-    @api.marshal_list_with(user_response_model)
+    @api.expect(pagination_parser)
+    @serialize_list_with(api, user_response_model)
     @admin_required
     def get(self):
-        """List all users (Admin only)"""
-        users = facade.user_repo.get_all()
-        return [user.to_dict() for user in users]
+        """List users, one page at a time (Admin only)"""
+        args = pagination_parser.parse_args()
+        try:
+            users, code, headers = paginated(facade.get_all_users, args)
+        except ValueError as e:
+            api.abort(400, str(e))
+        return users, code, headers
 
     @api.expect(user_request_model)
     @api.marshal_with(user_response_model, code=201)
     @admin_required
+    @transactional
     def post(self):
         """Create a new user (Admin only)"""
         data = api.payload
@@ -49,9 +59,26 @@ class UserList(Resource):
         user = facade.create_user(data)
         return user.to_dict(), 201
 
+bulk_model = bulk_result_model(api)
+
+@api.route('/bulk')
+class UserBulk(Resource):
+    @api.expect(bulk_parser, [user_request_model])
+    @api.marshal_with(bulk_model)
+    @admin_required
+    def post(self):
+        """Create many users from a JSON array or NDJSON body (Admin only)"""
+        args = bulk_parser.parse_args()
+        try:
+            items = read_items()
+        except ValueError as e:
+            api.abort(400, str(e))
+        result = facade.bulk_create_users(items, atomic=args['mode'] == 'atomic')
+        return bulk_response(result)
+
 @api.route('/<string:user_id>')
 class UserResource(Resource):
-    @api.marshal_with(user_response_model)
+    @serialize_with(api, user_response_model)
     @jwt_required()
     def get(self, user_id):
         """Get user details"""
@@ -65,11 +92,12 @@ class UserResource(Resource):
         if not user:
             api.abort(404, "User not found")
             
-        return user.to_dict()
+        return user
 
     @api.expect(user_request_model)
     @api.marshal_with(user_response_model)
     @admin_required
+    @transactional
     def put(self, user_id):
         """Update any user (Admin only)"""
         user = facade.user_repo.get(user_id)
@@ -88,6 +116,7 @@ class UserResource(Resource):
 
     @api.response(204, 'User deleted')
     @admin_required
+    @transactional
     def delete(self, user_id):
         """Delete a user (Admin only)"""
         if not facade.user_repo.get(user_id):
@@ -100,6 +129,7 @@ class UserResource(Resource):
 class AdminUser(Resource):
     @api.response(200, 'Admin status updated')
     @admin_required
+    @transactional
     def post(self, user_id):
         """Promote/demote user admin status (Admin only)"""
         user = facade.user_repo.get(user_id)
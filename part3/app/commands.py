@@ -0,0 +1,30 @@
+import click
+from app.extensions import db, cache
+from app.services.export import EXPORT_FIELDS, FORMATS, parse_since, write_export
+from app.services.facade import Facade
+
+
+def register_commands(app):
+    @app.cli.command('rebuild-ratings')
+    def rebuild_ratings():
+        """Recompute the denormalized rating columns of every place from its reviews"""
+        # With the app's cache, so every worker sharing it drops the old aggregates
+        count = Facade(db.session, cache=cache).rebuild_rating_aggregates()
+        click.echo(f"Rebuilt ratings for {count} places")
+
+    @app.cli.command('export')
+    @click.argument('entity', type=click.Choice(sorted(EXPORT_FIELDS)))
+    @click.option('--output', '-o', required=True, type=click.Path(dir_okay=False),
+                  help='File to write')
+    @click.option('--format', 'fmt', type=click.Choice(FORMATS), default='ndjson')
+    @click.option('--since', help='Only rows updated at or after this ISO 8601 timestamp')
+    @click.option('--gzip', 'compress', is_flag=True, help='Gzip the output')
+    def export(entity, output, fmt, since, compress):
+        """Write every row of ENTITY to a file, as GET /export/<entity> would stream it"""
+        try:
+            since = parse_since(since) if since else None
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--since')
+        rows = Facade(db.session).iter_export(entity, since)
+        written = write_export(output, rows, entity, fmt, compress)
+        click.echo(f"Wrote {written} bytes to {output}")
@@ -1,7 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from app.api.compression import Compression
+from app.persistence.cache import EntityCache
+from app.persistence.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+migrate = Migrate()
+cache = EntityCache()
+compression = Compression()
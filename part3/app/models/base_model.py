@@ -1,6 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 from app.extensions import db
+from app.persistence.unit_of_work import commit
 
 class BaseModel(db.Model):
     """Base model with common fields"""
@@ -12,8 +13,8 @@ class BaseModel(db.Model):
     
     def save(self):
         db.session.add(self)
-        db.session.commit()
+        commit(db.session)
     
     def delete(self):
         db.session.delete(self)
-        db.session.commit()
+        commit(db.session)
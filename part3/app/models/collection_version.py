@@ -0,0 +1,12 @@
+from app.extensions import db
+
+class CollectionVersion(db.Model):
+    """Counter bumped by every transaction that changes a collection, for list ETags"""
+    __tablename__ = 'collection_versions'
+
+    name = db.Column(db.String(32), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<CollectionVersion {self.name}={self.version}>"
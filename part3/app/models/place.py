@@ -3,22 +3,43 @@ from .base_model import BaseModel
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.review import Review
+from app.models.collection_version import CollectionVersion  # noqa: F401
 
 place_amenities = db.Table('place_amenities',
-    db.Column('place_id', db.Integer, db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.Integer, db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
+    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    # The primary key serves lookups by place; this one serves lookups by amenity
+    db.Index('ix_place_amenities_amenity_place', 'amenity_id', 'place_id')
 )
 
+# Denormalized review aggregates, kept current by the facade's review methods
+STAR_COLUMNS = ('stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5')
+RATING_COLUMNS = ('review_count', 'rating_sum') + STAR_COLUMNS
+# Bayesian average prior: every place starts as if it had PRIOR_WEIGHT
+# reviews of PRIOR_MEAN stars, so a single 5-star review can't top the board
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
 class Place(BaseModel):
     __tablename__ = 'places'
 
     title = db.Column(db.String(128), nullable=False)
     description = db.Column(db.String(512), nullable=True)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
 
-    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    review_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
+    # Bayesian average of the ratings, indexed for the top-rated leaderboard
+    rating_score = db.Column(db.Float, nullable=False, default=PRIOR_MEAN, index=True)
+
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
     owner = db.relationship('User', backref='places')
 
     amenities = db.relationship('Amenity', secondary=place_amenities, backref='places')
@@ -34,10 +55,27 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner = owner
 
+    @property
+    def rating_average(self):
+        return self.rating_sum / self.review_count if self.review_count else None
+
+    @property
+    def rating_summary(self):
+        return {
+            'count': self.review_count or 0,
+            'sum': self.rating_sum or 0,
+            'average': self.rating_average,
+            'histogram': [getattr(self, column) or 0 for column in STAR_COLUMNS],
+        }
+
     def add_amenity(self, amenity):
         if amenity not in self.amenities:
             self.amenities.append(amenity)
 
+    def remove_amenity(self, amenity):
+        if amenity in self.amenities:
+            self.amenities.remove(amenity)
+
     def add_review(self, review):
         if review not in self.reviews:
             self.reviews.append(review)
@@ -4,12 +4,16 @@ from app.models.user import User
 
 class Review(BaseModel):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # One review per user and place; also serves lookups by place_id
+        db.UniqueConstraint('place_id', 'owner_id', name='uq_reviews_place_owner'),
+    )
 
     text = db.Column(db.String(512), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
 
-    place_id = db.Column(db.Integer, db.ForeignKey('places.id'), nullable=False)
-    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
 
     place = db.relationship('Place', back_populates='reviews')
     owner = db.relationship('User', back_populates='reviews')
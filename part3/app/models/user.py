@@ -1,4 +1,5 @@
 from app.extensions import db
+from app.persistence.unit_of_work import commit
 from werkzeug.security import generate_password_hash, check_password_hash
 from .base_model import BaseModel
 
@@ -59,7 +60,7 @@ class User(BaseModel):
 
     def set_admin(self, is_admin=True):
         self.is_admin = is_admin
-        db.session.commit()
+        commit(db.session)
 
     def __repr__(self):
         return f"<User {self.email}>"
@@ -0,0 +1,340 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+from app.persistence.routing import has_pending_writes, primary_reads
+from app.persistence.unit_of_work import in_unit_of_work
+
+
+class MemoryBackend:
+    """
+    Bounded in-process LRU store with a per-entry TTL
+
+    Deleted keys are remembered for one TTL, so a value loaded before the
+    delete cannot be stored after it (see set).
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._deleted = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now():
+        return time.monotonic()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, loaded_at=None):
+        """
+        Store value, unless it was loaded (at loaded_at, from now()) before
+        key was last deleted; returns whether it was stored
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._forget_deletes(now)
+            if loaded_at is not None and (loaded_at <= now - self.ttl
+                                          or self._deleted.get(key, loaded_at - 1) >= loaded_at):
+                return False
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._deleted[key] = now
+                self._deleted.move_to_end(key)
+            self._forget_deletes(now)
+
+    def _forget_deletes(self, now):
+        # Older loads are refused outright, so their deletes need no record
+        while self._deleted and next(iter(self._deleted.values())) <= now - self.ttl:
+            self._deleted.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """
+    LRU store with a TTL kept in a local SQLite file
+
+    Every worker process on the host opening the same file shares one cache,
+    so an invalidation made by one worker is seen by all of them, including
+    by a load another worker started before it (see MemoryBackend.set).
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                           'key TEXT PRIMARY KEY, value BLOB, expires REAL, accessed REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS deleted (key TEXT PRIMARY KEY, at REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_deleted_at ON deleted (at)')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now():
+        # Wall-clock time, comparable between the processes sharing the file
+        return time.time()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT count(*) FROM cache').fetchone()[0]
+
+    def get(self, key):
+        # Wall-clock time, since the entries outlive any one process
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, expires FROM cache WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            self._conn.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+            return row[0]
+
+    def set(self, key, value, loaded_at=None):
+        now = time.time()
+        if loaded_at is not None and loaded_at <= now - self.ttl:
+            return False
+        with self._lock:
+            # IMMEDIATE, so no worker's delete lands between the check and the insert
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if loaded_at is not None:
+                    row = self._conn.execute('SELECT at FROM deleted WHERE key = ?',
+                                             (key,)).fetchone()
+                    if row is not None and row[0] >= loaded_at:
+                        return False
+                self._conn.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                                   (key, value, now + self.ttl, now))
+                excess = (self._conn.execute('SELECT count(*) FROM cache').fetchone()[0]
+                          - self.max_entries)
+                if excess > 0:
+                    self._conn.execute('DELETE FROM cache WHERE key IN '
+                                       '(SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+                                       (excess,))
+                    self.evictions += excess
+                return True
+            finally:
+                self._conn.execute('COMMIT')
+
+    def delete(self, keys):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany('DELETE FROM cache WHERE key = ?', [(key,) for key in keys])
+                self._conn.executemany('INSERT OR REPLACE INTO deleted VALUES (?, ?)',
+                                       [(key, now) for key in keys])
+                self._conn.execute('DELETE FROM deleted WHERE at <= ?', (now - self.ttl,))
+            finally:
+                self._conn.execute('COMMIT')
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+
+def entity_key(kind, *parts):
+    """Cache key for one lookup, e.g. entity_key('place', place_id)"""
+    return ':'.join((kind,) + parts)
+
+
+def invalidation_keys(obj):
+    """Keys whose cached values go stale when obj is written"""
+    from app.models.amenity import Amenity
+    from app.models.place import Place
+    from app.models.review import Review
+
+    keys = set()
+    if isinstance(obj, Place) and obj.id is not None:
+        keys.add(entity_key('place', obj.id))
+    elif isinstance(obj, Review) and obj.id is not None:
+        keys.add(entity_key('review', obj.id))
+    elif isinstance(obj, Amenity):
+        keys.add(entity_key('amenities'))
+        # Both the current name and the one it is being renamed from
+        names = {obj.name, *inspect(obj).attrs.name.history.deleted}
+        keys.update(entity_key('amenity_name', name) for name in names if name)
+        if obj.id is not None:
+            # Cached places embed their amenities
+            keys.update(entity_key('place', place.id) for place in obj.places
+                        if place.id is not None)
+    return keys
+
+
+class EntityCache:
+    """
+    Read-through cache of facade lookups, invalidated by committed writes
+
+    Values are pickled ORM objects, merged into the reading session without
+    a query on a hit. Every flush records the keys of the objects it writes
+    and they are dropped once the transaction commits, so writes made
+    through the facade, the repositories or the models themselves all
+    invalidate precisely. Sessions holding uncommitted writes bypass the
+    cache in both directions. Misses are loaded from the primary, never a
+    replica that may lag behind the last invalidation, and a value whose
+    load began before its key was invalidated is not stored.
+
+    Like the other extensions it does nothing until init_app() picks a
+    backend from the CACHE_* config values.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._watched = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        kind = app.config.get('CACHE_BACKEND', 'memory')
+        options = {'max_entries': app.config.get('CACHE_MAX_ENTRIES', 10000),
+                   'ttl': app.config.get('CACHE_TTL', 300)}
+        if kind == 'memory':
+            self.backend = MemoryBackend(**options)
+        elif kind == 'sqlite':
+            path = app.config.get('CACHE_PATH') or os.path.join(app.instance_path, 'cache.db')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.backend = SQLiteBackend(path, **options)
+        elif kind == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND '{kind}'")
+
+    def watch(self, session):
+        """Collect invalidations from a session, sessionmaker or scoped session"""
+        if id(session) in self._watched:
+            return
+        self._watched.add(id(session))
+        event.listen(session, 'before_flush', self._collect)
+        event.listen(session, 'after_begin', self._begin)
+        event.listen(session, 'after_transaction_end', self._end)
+        event.listen(session, 'after_commit', self._flush_pending)
+        event.listen(session, 'after_soft_rollback', self._forget_pending)
+
+    @property
+    def _pending_key(self):
+        return ('cache_invalidations', id(self))
+
+    @property
+    def _began_key(self):
+        return ('cache_transaction_began', id(self))
+
+    def _begin(self, session, transaction, connection):
+        if self.backend is not None:
+            session.info.setdefault(self._began_key, self.backend.now())
+
+    def _end(self, session, transaction):
+        if transaction.parent is None:
+            session.info.pop(self._began_key, None)
+
+    def _collect(self, session, flush_context, instances):
+        if self.backend is None:
+            return
+        keys = set()
+        with session.no_autoflush:
+            for obj in (*session.new, *session.dirty, *session.deleted):
+                keys |= invalidation_keys(obj)
+        self.defer(session, keys)
+
+    def defer(self, session, keys):
+        """Invalidate keys when session's transaction commits"""
+        if keys and self.backend is not None:
+            session.info.setdefault(self._pending_key, set()).update(keys)
+
+    def _flush_pending(self, session):
+        keys = session.info.pop(self._pending_key, None)
+        if keys:
+            self.invalidate(keys)
+
+    def _forget_pending(self, session, previous_transaction):
+        if not session.in_transaction():
+            session.info.pop(self._pending_key, None)
+
+    def invalidate(self, keys):
+        if self.backend is not None:
+            self.backend.delete(keys)
+            with self._lock:
+                self.invalidations += len(keys)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def get_or_load(self, session, key, load):
+        """
+        Return the cached value for key, or load() it and cache the result
+
+        A None result is not cached. Lists of objects are supported.
+        """
+        if (self.backend is None or in_unit_of_work(session)
+                or has_pending_writes(session)):
+            return load()
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            value = pickle.loads(cached)
+            if isinstance(value, list):
+                return [session.merge(obj, load=False) for obj in value]
+            return session.merge(value, load=False)
+        with self._lock:
+            self.misses += 1
+        # A transaction that began earlier may read from an older snapshot
+        loaded_at = min(session.info.get(self._began_key, float('inf')), self.backend.now())
+        with primary_reads(session):
+            value = load()
+        if value is not None:
+            self.backend.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                             loaded_at=loaded_at)
+        return value
+
+    def stats(self):
+        backend = self.backend
+        return {
+            'backend': type(backend).__name__ if backend is not None else None,
+            'entries': len(backend) if backend is not None else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': backend.evictions if backend is not None else 0,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,88 @@
+import threading
+import time
+from sqlalchemy.pool import QueuePool
+
+IN_MEMORY_SQLITE = ('sqlite://', 'sqlite:///:memory:')
+
+
+class WaitStats:
+    """Running count, total and maximum of connection checkout waits"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'waits': self.count,
+                'wait_avg_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+                'wait_max_ms': round(self.max * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = WaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep the statistics running
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS built from the DB_POOL_* config values
+
+    In-memory SQLite lives on a single static connection, so it gets no
+    pool settings at all.
+    """
+    if config.get('SQLALCHEMY_DATABASE_URI') in IN_MEMORY_SQLITE:
+        return {}
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def pool_status(engine):
+    """Occupancy and wait statistics of an engine's connection pool"""
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            # Negative until the pool has opened pool_size connections
+            'overflow': pool.overflow(),
+            'max_overflow': pool._max_overflow,
+        })
+    wait_stats = getattr(pool, 'wait_stats', None)
+    if wait_stats is not None:
+        status.update(wait_stats.to_dict())
+    return status
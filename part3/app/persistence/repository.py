@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
 
 class Repository(ABC):
     @abstractmethod
@@ -10,7 +11,7 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self):
+    def get_all(self, limit=None, after=None):
         pass
 
     @abstractmethod
@@ -27,26 +28,149 @@ class Repository(ABC):
 
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    def __init__(self, indexes=(), unique_indexes=()):
+        """
+        Initialize the repository
+
+        Args:
+            indexes (iterable, optional): Attribute names to keep a
+                non-unique hash index on
+            unique_indexes (iterable, optional): Attribute names whose
+                values must be unique across stored objects
+        """
         self._storage = {}
+        # Ids kept in sorted order for keyset pagination
+        self._sorted_ids = []
+        # attr_name -> {value: {obj_id: None}} (dict used as an ordered set)
+        self._indexes = {}
+        # attr_name -> {value: obj_id}
+        self._unique_indexes = {}
+        for attr_name in indexes:
+            self.add_index(attr_name)
+        for attr_name in unique_indexes:
+            self.add_index(attr_name, unique=True)
+
+    def add_index(self, attr_name, unique=False):
+        """Declare a secondary index and build it from the stored objects"""
+        if attr_name in self._indexes or attr_name in self._unique_indexes:
+            return
+        if unique:
+            index = {}
+            for obj in self._storage.values():
+                value = getattr(obj, attr_name, None)
+                if value is None:
+                    continue
+                if value in index:
+                    raise ValueError(f"Duplicate value for unique attribute '{attr_name}'")
+                index[value] = obj.id
+            self._unique_indexes[attr_name] = index
+        else:
+            index = {}
+            for obj in self._storage.values():
+                value = getattr(obj, attr_name, None)
+                if value is not None:
+                    index.setdefault(value, {})[obj.id] = None
+            self._indexes[attr_name] = index
+
+    def _check_unique(self, obj_id, values):
+        """Raise ValueError if any unique-indexed value belongs to another object"""
+        for attr_name, value in values.items():
+            index = self._unique_indexes.get(attr_name)
+            if index is None or value is None:
+                continue
+            owner_id = index.get(value)
+            if owner_id is not None and owner_id != obj_id:
+                raise ValueError(f"Duplicate value for unique attribute '{attr_name}'")
+
+    def _index_obj(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index[value] = obj.id
+        for attr_name, index in self._indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None:
+                index.setdefault(value, {})[obj.id] = None
+
+    def _unindex_obj(self, obj):
+        for attr_name, index in self._unique_indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value is not None and index.get(value) == obj.id:
+                del index[value]
+        for attr_name, index in self._indexes.items():
+            value = getattr(obj, attr_name, None)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(obj.id, None)
+                if not bucket:
+                    del index[value]
 
     def add(self, obj):
+        self._check_unique(obj.id, {
+            attr_name: getattr(obj, attr_name, None)
+            for attr_name in self._unique_indexes
+        })
+        previous = self._storage.get(obj.id)
+        if previous is not None:
+            self._unindex_obj(previous)
+        else:
+            insort(self._sorted_ids, obj.id)
         self._storage[obj.id] = obj
+        self._index_obj(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
-    def get_all(self):
-        return list(self._storage.values())
+    def get_all(self, limit=None, after=None):
+        """Return stored objects, or one page of them ordered by id
+
+        With neither argument every object is returned in insertion order.
+        Otherwise objects are ordered by id, start strictly after the id
+        `after` and stop after `limit` items.
+        """
+        if limit is None and after is None:
+            return list(self._storage.values())
+        start = bisect_right(self._sorted_ids, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        return [self._storage[obj_id] for obj_id in self._sorted_ids[start:stop]]
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
+            self._check_unique(obj_id, data)
+            self._unindex_obj(obj)
             obj.update(data)
+            self._index_obj(obj)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
+            self._unindex_obj(self._storage[obj_id])
             del self._storage[obj_id]
+            del self._sorted_ids[bisect_left(self._sorted_ids, obj_id)]
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+        # None values are never indexed, so they always take the scan path
+        if attr_value is not None:
+            if attr_name in self._unique_indexes:
+                obj_id = self._unique_indexes[attr_name].get(attr_value)
+                return self._storage.get(obj_id) if obj_id is not None else None
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value)
+                return self._storage[next(iter(bucket))] if bucket else None
+        return next(
+            (obj for obj in self._storage.values()
+             if getattr(obj, attr_name) == attr_value),
+            None
+        )
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Return every stored object whose attribute equals the given value"""
+        if attr_value is not None:
+            if attr_name in self._unique_indexes:
+                obj = self.get_by_attribute(attr_name, attr_value)
+                return [obj] if obj is not None else []
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value, {})
+                return [self._storage[obj_id] for obj_id in bucket]
+        return [obj for obj in self._storage.values()
+                if getattr(obj, attr_name) == attr_value]
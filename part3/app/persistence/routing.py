@@ -0,0 +1,149 @@
+import itertools
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import UpdateBase, event
+
+from app.persistence.unit_of_work import in_unit_of_work
+
+REPLICA_BIND_PREFIX = 'replica_'
+_READ_ONLY = 'replica_read_depth'
+_PENDING_WRITE = 'pending_write'
+_LAST_WRITE = 'hbnb.last_write'
+LAST_WRITE_COOKIE = 'hbnb_last_write'
+
+# Shared round-robin position across sessions and threads; next() on an
+# itertools.count is atomic under the GIL
+_next_replica = itertools.count()
+
+# Wall-clock time of the last write committed outside a request (CLI
+# commands, jobs, tests); requests track their client's writes instead
+_process_last_write = None
+
+
+def replica_binds(config):
+    """SQLALCHEMY_BINDS entries for the DB_REPLICA_URLS config value"""
+    return {f'{REPLICA_BIND_PREFIX}{i}': url for i, url in enumerate(config['DB_REPLICA_URLS'])}
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of read-only facade methods to a replica
+
+    Everything else goes to the primary: writes, flushes, reads inside a
+    unit of work or a transaction that already wrote, and any read within
+    DB_READ_YOUR_WRITES_SECONDS of the client's last committed write (see
+    last_write), so a client never reads a replica that has not caught up
+    with it yet. Replicas are picked round-robin; with none configured this
+    behaves exactly like the Flask-SQLAlchemy session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info[_PENDING_WRITE] = True
+            elif self._reads_from_replica():
+                replicas = sorted(key for key in self._db.engines
+                                  if key and key.startswith(REPLICA_BIND_PREFIX))
+                if replicas:
+                    return self._db.engines[replicas[next(_next_replica) % len(replicas)]]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self):
+        info = self.info
+        if not info.get(_READ_ONLY) or in_unit_of_work(self) or has_pending_writes(self):
+            return False
+        window = current_app.config.get('DB_READ_YOUR_WRITES_SECONDS', 0)
+        written = last_write()
+        return written is None or time.time() - written >= window
+
+
+def has_pending_writes(session):
+    """Whether the session's transaction holds changes other sessions cannot see yet"""
+    return bool(session.info.get(_PENDING_WRITE) or session.new or session.dirty
+                or session.deleted)
+
+
+def last_write():
+    """
+    When the current client last committed a write, as a time.time() value
+
+    Sessions are request-scoped, so the time outlives them. In a request it
+    is the later of a write made by the request itself and the
+    LAST_WRITE_COOKIE the client sent back from an earlier response, which
+    follows the client to any worker or host. A client that drops cookies
+    is only guaranteed to read its writes within the request making them.
+    Outside a request the process's last write is used.
+    """
+    if not has_request_context():
+        return _process_last_write
+    written = request.environ.get(_LAST_WRITE)
+    try:
+        remembered = float(request.cookies[LAST_WRITE_COOKIE])
+    except (KeyError, ValueError):
+        remembered = None
+    if remembered is not None:
+        # A cookie from the future would pin the client to the primary
+        remembered = min(remembered, time.time()) if math.isfinite(remembered) else None
+    candidates = [value for value in (written, remembered) if value is not None]
+    return max(candidates) if candidates else None
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _start_read_your_writes_window(session):
+    global _process_last_write
+    if session.info.pop(_PENDING_WRITE, False):
+        if has_request_context():
+            request.environ[_LAST_WRITE] = time.time()
+        else:
+            _process_last_write = time.time()
+
+
+def remember_last_write(response):
+    """after_request hook handing the client the time of the request's write"""
+    written = request.environ.get(_LAST_WRITE)
+    window = current_app.config.get('DB_READ_YOUR_WRITES_SECONDS', 0)
+    if written is not None and window > 0:
+        response.set_cookie(LAST_WRITE_COOKIE, repr(written), max_age=math.ceil(window),
+                            httponly=True, samesite='Lax')
+    return response
+
+
+@event.listens_for(RoutingSession, 'after_soft_rollback')
+def _forget_rolled_back_write(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_WRITE, None)
+
+
+@contextmanager
+def replica_reads(session):
+    """Allow the queries made inside the block to be served by a replica"""
+    session.info[_READ_ONLY] = session.info.get(_READ_ONLY, 0) + 1
+    try:
+        yield session
+    finally:
+        session.info[_READ_ONLY] -= 1
+
+
+@contextmanager
+def primary_reads(session):
+    """Send the queries made inside the block to the primary, even within replica_reads"""
+    depth = session.info.get(_READ_ONLY, 0)
+    session.info[_READ_ONLY] = 0
+    try:
+        yield session
+    finally:
+        session.info[_READ_ONLY] = depth
+
+
+def read_only(method):
+    """Mark a facade method as safe to answer from a replica"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with replica_reads(self.session):
+            return method(self, *args, **kwargs)
+    return wrapper
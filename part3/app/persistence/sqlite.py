@@ -0,0 +1,28 @@
+from sqlalchemy import event
+
+
+def apply_pragmas(engine, pragmas):
+    """
+    Run PRAGMA statements on every new connection of a SQLite engine
+
+    Most pragmas only last as long as the connection, so they are set from
+    the engine's connect event and every pooled connection gets them.
+    Engines of other databases are left alone.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def pragma_values(connection, names):
+    """Current value of each named pragma on a connection"""
+    return {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from functools import wraps
+
+_DEPTH = 'unit_of_work_depth'
+
+
+def in_unit_of_work(session):
+    return session.info.get(_DEPTH, 0) > 0
+
+
+@contextmanager
+def unit_of_work(session):
+    """
+    Group every mutation made inside the block into a single commit
+
+    Nested blocks join the outermost one, which commits when it exits
+    normally and rolls the whole unit back if an exception escapes it.
+    """
+    depth = session.info.get(_DEPTH, 0)
+    session.info[_DEPTH] = depth + 1
+    try:
+        yield session
+        if not depth:
+            session.commit()
+    except BaseException:
+        if not depth:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH] = depth
+
+
+def commit(session):
+    """Commit now, or only flush when an enclosing unit of work will commit"""
+    if in_unit_of_work(session):
+        # Flushing still assigns ids and surfaces constraint errors here
+        session.flush()
+    else:
+        session.commit()
+
+
+def transactional(f):
+    """Run a view or job inside one unit of work on the app's scoped session"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        from app.extensions import db
+        with unit_of_work(db.session):
+            return f(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import UpdateBase, event, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.models.amenity import Amenity
+from app.models.collection_version import CollectionVersion
+from app.models.place import Place
+from app.persistence.routing import RoutingSession
+
+# Collections whose serialized form changes when a table is written.
+# Place responses embed amenity names, so amenities count for places too.
+TABLE_COLLECTIONS = {
+    'users': ('users',),
+    'places': ('places',),
+    'place_amenities': ('places',),
+    'reviews': ('reviews',),
+    'amenities': ('amenities', 'places'),
+}
+_CHANGED = 'changed_collections'
+
+
+def _mark(session, table_name):
+    collections = TABLE_COLLECTIONS.get(table_name)
+    if collections:
+        session.info.setdefault(_CHANGED, set()).update(collections)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _collect_changes(session, flush_context, instances):
+    now = datetime.utcnow()
+    with session.no_autoflush:
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            _mark(session, obj.__table__.name)
+            # updated_at has to move whenever the entity's response changes,
+            # including through its amenity links or an amenity's new name
+            if isinstance(obj, Place) and obj not in session.deleted:
+                if inspect(obj).attrs.amenities.history.has_changes():
+                    obj.updated_at = now
+            elif isinstance(obj, Amenity) and obj.id is not None:
+                if obj in session.deleted or inspect(obj).attrs.name.history.has_changes():
+                    for place in obj.places:
+                        place.updated_at = now
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _collect_statement(orm_execute_state):
+    statement = orm_execute_state.statement
+    if isinstance(statement, UpdateBase):
+        _mark(orm_execute_state.session, getattr(statement.table, 'name', None))
+
+
+def _bump_statement(dialect_name, name, now):
+    """
+    One statement adding 1 to a collection's version, creating its row if needed
+
+    An upsert where the dialect has one, so concurrent first writes cannot
+    both insert; elsewhere a plain UPDATE of the row migration 0003 seeds.
+    """
+    table = CollectionVersion.__table__
+    bumped = {'version': table.c.version + 1, 'updated_at': now}
+    if dialect_name in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect_name == 'sqlite' else postgresql.insert
+        return (insert(table).values(name=name, version=1, updated_at=now)
+                .on_conflict_do_update(index_elements=[table.c.name], set_=bumped))
+    if dialect_name in ('mysql', 'mariadb'):
+        return (mysql.insert(table).values(name=name, version=1, updated_at=now)
+                .on_duplicate_key_update(**bumped))
+    return table.update().where(table.c.name == name).values(**bumped)
+
+
+@event.listens_for(RoutingSession, 'before_commit')
+def _bump_versions(session):
+    session.flush()
+    changed = session.info.pop(_CHANGED, None)
+    if not changed:
+        return
+    table = CollectionVersion.__table__
+    dialect_name = session.get_bind(clause=table.update()).dialect.name
+    now = datetime.utcnow()
+    # Always in name order, so concurrent commits lock the rows in the same order
+    for name in sorted(changed):
+        session.execute(_bump_statement(dialect_name, name, now))
+
+
+@event.listens_for(RoutingSession, 'after_soft_rollback')
+def _forget_changes(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_CHANGED, None)
@@ -0,0 +1,23 @@
+from functools import wraps
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_restx import abort
+from app.models.user import User
+from app.services.facade import facade
+
+
+def current_user():
+    """The User the request's token was issued to, or None"""
+    identity = get_jwt_identity()
+    return facade.get(User, identity) if identity else None
+
+
+def admin_required(f):
+    """Require a valid token issued to an admin"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        user = current_user()
+        if not user or not user.is_admin:
+            abort(403, 'Admin privileges required')
+        return f(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,52 @@
+from itertools import islice
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def chunked(items, size=DEFAULT_CHUNK_SIZE):
+    """Split a sequence into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkResult:
+    """Per-item outcome of a bulk create
+
+    Every submitted item gets exactly one entry, in submission order, with
+    status 'created' (and the new id), 'error' (and the reason) or
+    'skipped' when an all-or-nothing batch was abandoned because of
+    another item.
+    """
+
+    def __init__(self, total):
+        self._results = [None] * total
+
+    def created(self, index, obj_id):
+        self._results[index] = {'index': index, 'status': 'created', 'id': obj_id}
+
+    def failed(self, index, error):
+        self._results[index] = {'index': index, 'status': 'error', 'error': error}
+
+    def skip_pending(self, reason):
+        for index, entry in enumerate(self._results):
+            if entry is None or entry['status'] == 'created':
+                self._results[index] = {'index': index, 'status': 'skipped', 'error': reason}
+
+    def count(self, status):
+        return sum(1 for entry in self._results if entry and entry['status'] == status)
+
+    @property
+    def ids(self):
+        return [entry['id'] for entry in self._results if entry and entry['status'] == 'created']
+
+    def to_dict(self):
+        return {
+            'created': self.count('created'),
+            'failed': self.count('error'),
+            'skipped': self.count('skipped'),
+            'results': self._results,
+        }
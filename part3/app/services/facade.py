@@ -1,19 +1,81 @@
-from sqlalchemy.orm import Session
+from uuid import uuid4
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from werkzeug.security import generate_password_hash
 from app.models.user import User
-from app.models.place import Place
+from app.models.place import Place, RATING_COLUMNS, PRIOR_MEAN, PRIOR_WEIGHT, place_amenities
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.models.collection_version import CollectionVersion
+from app.persistence import versions  # noqa: F401  (registers the version counters)
+from app.persistence.pagination import keyset_query
+from app.persistence.routing import read_only
+from app.persistence.unit_of_work import commit, in_unit_of_work, unit_of_work
+from app.extensions import db, cache as entity_cache
+from app.persistence.cache import entity_key
+from app.services.bulk import BulkResult, chunked, DEFAULT_CHUNK_SIZE
+
+# Each read query states what its endpoint serializes. PlaceResponse nests
+# amenities, fetched with one extra SELECT ... WHERE place_id IN (...) per
+# page instead of one per place.
+PLACE_LOADS = (selectinload(Place.amenities),)
+# Listings only serialize, so any relationship they did not plan for raises
+# instead of issuing a hidden SELECT per row
+PLACE_LIST_LOADS = PLACE_LOADS + (raiseload('*'),)
+# Detail views that list reviews with their authors
+PLACE_REVIEWS_LOADS = (selectinload(Place.amenities),
+                       selectinload(Place.reviews).joinedload(Review.owner),
+                       raiseload('*'))
+
+
+def validate_place(fields, partial=False):
+    """Raise ValueError for invalid place fields; partial only checks those present"""
+    if not partial or 'title' in fields:
+        if not fields.get('title'):
+            raise ValueError("Title is required")
+    if not partial or 'price' in fields:
+        price = fields.get('price')
+        if not isinstance(price, (int, float)) or price <= 0:
+            raise ValueError("Price must be a positive number")
+    if not partial or 'latitude' in fields:
+        latitude = fields.get('latitude')
+        if not isinstance(latitude, (int, float)) or not -90 <= latitude <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+    if not partial or 'longitude' in fields:
+        longitude = fields.get('longitude')
+        if not isinstance(longitude, (int, float)) or not -180 <= longitude <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+
 
 class Facade:
     """Complete Facade for all entities with simplified SQLAlchemy integration"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache=None):
         self.session = session
+        self.cache = cache
+        if cache is not None:
+            cache.watch(session)
+
+    def unit_of_work(self):
+        """Context manager batching every facade call inside it into one commit"""
+        return unit_of_work(self.session)
+
+    def _cached(self, key, load):
+        """Read-through lookup; writes invalidate the key when they commit"""
+        if self.cache is None:
+            return load()
+        return self.cache.get_or_load(self.session, key, load)
+
+    def _invalidate_on_commit(self, keys):
+        """For writes that bypass the ORM flush, such as Core INSERT/UPDATE"""
+        if self.cache is not None:
+            self.cache.defer(self.session, keys)
 
     # ===== Core CRUD Operations =====
     def add(self, entity):
         self.session.add(entity)
-        self.session.commit()
+        commit(self.session)
         return entity
 
     def get(self, model, id):
@@ -21,14 +83,227 @@ class Facade:
 
     def delete(self, entity):
         self.session.delete(entity)
-        self.session.commit()
+        commit(self.session)
 
     def update(self, entity, **updates):
         for key, value in updates.items():
             setattr(entity, key, value)
-        self.session.commit()
+        commit(self.session)
         return entity
 
+    def iter_all(self, query, model, batch_size=500):
+        """Iterate over a query through a server-side cursor, batch_size rows at a time"""
+        return query.order_by(model.id).yield_per(batch_size)
+
+    def iter_export(self, entity, since=None):
+        """Stream every row of an entity, optionally only those updated at or after since"""
+        models = {'users': User, 'places': Place, 'reviews': Review, 'amenities': Amenity}
+        if entity not in models:
+            raise ValueError(f"Unknown entity '{entity}'")
+        model = models[entity]
+        query = self.session.query(model)
+        if since is not None:
+            query = query.filter(model.updated_at >= since)
+        return self.iter_all(query, model)
+
+    @read_only
+    def get_collection_version(self, name):
+        """The CollectionVersion row of users, places, reviews or amenities, None if never written"""
+        return self.session.get(CollectionVersion, name)
+
+    # ===== Bulk Operations =====
+    def _bulk_insert(self, model, rows, to_mapping, atomic=False,
+                     chunk_size=DEFAULT_CHUNK_SIZE, after_insert=None):
+        """
+        Validate rows and insert them with one executemany per chunk
+
+        Args:
+            model: Model class whose table receives the rows
+            rows (list): Submitted items
+            to_mapping (callable): Turns one item into a column mapping,
+                raising ValueError when it is invalid
+            atomic (bool): All-or-nothing; otherwise every valid item is
+                kept and each chunk is committed on its own
+            chunk_size (int): Rows per INSERT statement and transaction
+            after_insert (callable, optional): Called with the inserted
+                mappings inside the same transaction, for link tables and
+                denormalized columns
+
+        Returns:
+            BulkResult
+        """
+        if not atomic and in_unit_of_work(self.session):
+            raise RuntimeError("Best-effort bulk inserts commit per chunk; "
+                               "run them outside a unit of work or use atomic mode")
+        result = BulkResult(len(rows))
+        valid = []
+        for index, row in enumerate(rows):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("Item must be an object")
+                valid.append((index, to_mapping(row)))
+            except ValueError as e:
+                result.failed(index, str(e))
+        if atomic and result.count('error'):
+            result.skip_pending("Batch rejected because of invalid items")
+            return result
+
+        insert = model.__table__.insert()
+
+        def write(chunk):
+            self.session.execute(insert, [mapping for _, mapping in chunk])
+            if after_insert:
+                after_insert([mapping for _, mapping in chunk])
+
+        if atomic:
+            try:
+                for chunk in chunked(valid, chunk_size):
+                    write(chunk)
+                commit(self.session)
+            except SQLAlchemyError as e:
+                self.session.rollback()
+                result.skip_pending(f"Batch rolled back: {getattr(e, 'orig', e)}")
+                return result
+            for index, mapping in valid:
+                result.created(index, mapping['id'])
+            return result
+
+        for chunk in chunked(valid, chunk_size):
+            try:
+                write(chunk)
+                self.session.commit()
+            except IntegrityError:
+                self.session.rollback()
+                # Find the offending rows one at a time
+                for item in chunk:
+                    try:
+                        write([item])
+                        self.session.commit()
+                    except IntegrityError as e:
+                        self.session.rollback()
+                        result.failed(item[0], str(e.orig))
+                    else:
+                        result.created(item[0], item[1]['id'])
+            else:
+                for index, mapping in chunk:
+                    result.created(index, mapping['id'])
+        return result
+
+    def bulk_create_users(self, rows, atomic=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        emails = {row.get('email') for row in rows if isinstance(row, dict)}
+        taken = {email for email, in self.session.query(User.email).filter(User.email.in_(emails))}
+
+        def to_mapping(row):
+            email = row.get('email')
+            if not email or '@' not in email:
+                raise ValueError("Invalid email")
+            if email in taken:
+                raise ValueError("Email already used")
+            if not row.get('password'):
+                raise ValueError("Password is required")
+            taken.add(email)
+            return {
+                'id': str(uuid4()),
+                'email': email,
+                'password_hash': generate_password_hash(row['password']),
+                'first_name': row.get('first_name'),
+                'last_name': row.get('last_name'),
+                'is_admin': bool(row.get('is_admin', False)),
+            }
+
+        result = self._bulk_insert(User, rows, to_mapping, atomic, chunk_size)
+        User._used_emails.update(email for email, in self.session.query(User.email)
+                                 .filter(User.id.in_(result.ids)))
+        return result
+
+    def bulk_create_places(self, rows, owner_id, atomic=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        if not self.get(User, owner_id):
+            raise LookupError("Owner not found")
+        amenity_ids = {amenity_id for row in rows if isinstance(row, dict)
+                       for amenity_id in row.get('amenity_ids') or ()}
+        known_amenities = {amenity_id for amenity_id, in self.session.query(Amenity.id)
+                           .filter(Amenity.id.in_(amenity_ids))}
+        links = {}
+
+        def to_mapping(row):
+            validate_place(row)
+            missing = set(row.get('amenity_ids') or ()) - known_amenities
+            if missing:
+                raise ValueError(f"Amenity not found: {sorted(missing)[0]}")
+            place_id = str(uuid4())
+            links[place_id] = list(dict.fromkeys(row.get('amenity_ids') or ()))
+            return {
+                'id': place_id,
+                'title': row['title'],
+                'description': row.get('description'),
+                'price': float(row['price']),
+                'latitude': row['latitude'],
+                'longitude': row['longitude'],
+                'owner_id': owner_id,
+            }
+
+        def link_amenities(mappings):
+            pairs = [{'place_id': mapping['id'], 'amenity_id': amenity_id}
+                     for mapping in mappings for amenity_id in links[mapping['id']]]
+            if pairs:
+                self.session.execute(place_amenities.insert(), pairs)
+
+        return self._bulk_insert(Place, rows, to_mapping, atomic, chunk_size, link_amenities)
+
+    def bulk_create_amenities(self, rows, atomic=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        def to_mapping(row):
+            name = row.get('name')
+            if not name:
+                raise ValueError("Name cannot be empty")
+            if len(name) > 50:
+                raise ValueError("Name too long")
+            return {'id': str(uuid4()), 'name': name}
+
+        def invalidate(mappings):
+            self._invalidate_on_commit({entity_key('amenities')} | {
+                entity_key('amenity_name', mapping['name']) for mapping in mappings})
+
+        return self._bulk_insert(Amenity, rows, to_mapping, atomic, chunk_size, invalidate)
+
+    def bulk_create_reviews(self, rows, user_id, atomic=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        if not self.get(User, user_id):
+            raise LookupError("User not found")
+        place_ids = {row.get('place_id') for row in rows if isinstance(row, dict)}
+        owners = dict(self.session.query(Place.id, Place.owner_id).filter(Place.id.in_(place_ids)))
+        reviewed = {place_id for place_id, in self.session.query(Review.place_id)
+                    .filter(Review.owner_id == user_id, Review.place_id.in_(place_ids))}
+
+        def to_mapping(row):
+            if not row.get('text'):
+                raise ValueError("Review text is required")
+            rating = row.get('rating')
+            if not isinstance(rating, int) or not 1 <= rating <= 5:
+                raise ValueError("Rating must be an integer between 1 and 5")
+            place_id = row.get('place_id')
+            if place_id not in owners:
+                raise ValueError("Place not found")
+            if owners[place_id] == user_id:
+                raise ValueError("Cannot review your own place")
+            if place_id in reviewed:
+                raise ValueError("You have already reviewed this place")
+            reviewed.add(place_id)
+            return {'id': str(uuid4()), 'text': row['text'], 'rating': rating,
+                    'place_id': place_id, 'owner_id': user_id}
+
+        def update_ratings(mappings):
+            deltas = {}
+            for mapping in mappings:
+                self._rating_deltas(deltas.setdefault(mapping['place_id'], {}),
+                                    added=mapping['rating'])
+            for place_id, place_deltas in deltas.items():
+                self.session.query(Place).filter(Place.id == place_id).update(
+                    self._rating_assignments(place_deltas), synchronize_session=False)
+            self._invalidate_on_commit({entity_key('place', place_id) for place_id in deltas})
+
+        result = self._bulk_insert(Review, rows, to_mapping, atomic, chunk_size, update_ratings)
+        self.session.expire_all()
+        return result
+
     # ===== User Operations =====
     def create_user(self, email, password, **kwargs):
         user = User(email=email, **kwargs)
@@ -38,22 +313,247 @@ class Facade:
     def get_user_by_email(self, email):
         return self.session.query(User).filter_by(email=email).first()
 
+    @read_only
+    def get_all_users(self, limit=None, after=None):
+        return keyset_query(self.session.query(User), User, limit, after).all()
+
     # ===== Place Operations =====
-    def create_place(self, title, owner_id, **kwargs):
-        place = Place(title=title, owner_id=owner_id, **kwargs)
+    def _amenities_by_id(self, amenity_ids):
+        amenity_ids = list(dict.fromkeys(amenity_ids or ()))
+        if not amenity_ids:
+            return []
+        found = {amenity.id: amenity for amenity in
+                 self.session.query(Amenity).filter(Amenity.id.in_(amenity_ids))}
+        missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in found]
+        if missing:
+            raise ValueError(f"Amenity not found: {missing[0]}")
+        return [found[amenity_id] for amenity_id in amenity_ids]
+
+    def create_place(self, title, owner_id, description=None, price=None, latitude=None,
+                     longitude=None, amenity_ids=()):
+        validate_place(dict(title=title, price=price, latitude=latitude, longitude=longitude))
+        owner = self.get(User, owner_id)
+        if not owner:
+            raise LookupError("Owner not found")
+        amenities = self._amenities_by_id(amenity_ids)
+        place = Place(title, description, float(price), latitude, longitude, owner)
+        place.amenities = amenities
         return self.add(place)
 
+    def update_place(self, place, owner_id=None, amenity_ids=None, **updates):
+        """Change a place's fields, owner or amenities"""
+        validate_place(updates, partial=True)
+        for key, value in updates.items():
+            setattr(place, key, value)
+        if owner_id is not None:
+            owner = self.get(User, owner_id)
+            if not owner:
+                raise LookupError("Owner not found")
+            place.owner = owner
+        if amenity_ids is not None:
+            place.amenities = self._amenities_by_id(amenity_ids)
+        commit(self.session)
+        return place
+
+    @read_only
+    def get_place(self, place_id):
+        return self._cached(entity_key('place', place_id), lambda: (
+            # Also loads places about to be modified, so nothing raises here
+            self.session.query(Place).options(*PLACE_LOADS).filter_by(id=place_id).first()))
+
+    @read_only
+    def get_place_with_reviews(self, place_id):
+        return (self.session.query(Place).options(*PLACE_REVIEWS_LOADS)
+                .filter_by(id=place_id).first())
+
+    @read_only
     def get_places_by_owner(self, owner_id):
-        return self.session.query(Place).filter_by(owner_id=owner_id).all()
+        return (self.session.query(Place).options(*PLACE_LIST_LOADS)
+                .filter_by(owner_id=owner_id).all())
+
+    def _filtered_places(self, min_price=None, max_price=None, amenity_ids=None):
+        query = self.session.query(Place)
+        # Range predicates on the indexed price column
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if amenity_ids:
+            # Places linked to every requested amenity, answered from the
+            # (amenity_id, place_id) index without touching the places table
+            amenity_ids = set(amenity_ids)
+            having_all = (select(place_amenities.c.place_id)
+                          .where(place_amenities.c.amenity_id.in_(amenity_ids))
+                          .group_by(place_amenities.c.place_id)
+                          .having(func.count() == len(amenity_ids)))
+            query = query.filter(Place.id.in_(having_all))
+        return query
+
+    @read_only
+    def get_all_places(self, limit=None, after=None, min_price=None, max_price=None,
+                       amenity_ids=None):
+        query = self._filtered_places(min_price, max_price, amenity_ids).options(*PLACE_LIST_LOADS)
+        return keyset_query(query, Place, limit, after).all()
+
+    @read_only
+    def resolve_amenities(self, names):
+        """Map amenity names (or ids) to amenity ids"""
+        amenity_ids = []
+        for name in names:
+            amenity = self.get(Amenity, name) or self.get_amenity_by_name(name)
+            if not amenity:
+                raise ValueError(f"Unknown amenity '{name}'")
+            amenity_ids.append(amenity.id)
+        return amenity_ids
+
+    @read_only
+    def get_amenity_facets(self, min_price=None, max_price=None, amenity_ids=None):
+        """How many of the filtered places have each amenity, keyed by amenity name"""
+        filtered = self._filtered_places(min_price, max_price, amenity_ids).with_entities(Place.id)
+        rows = (self.session.query(Amenity.name, func.count())
+                .join(place_amenities, place_amenities.c.amenity_id == Amenity.id)
+                .filter(place_amenities.c.place_id.in_(filtered.scalar_subquery()))
+                .group_by(Amenity.id, Amenity.name))
+        return {name: count for name, count in rows}
+
+    def iter_places(self, min_price=None, max_price=None, amenity_ids=None):
+        # selectinload runs once per yield_per batch, so memory stays bounded
+        query = self._filtered_places(min_price, max_price, amenity_ids).options(*PLACE_LIST_LOADS)
+        return self.iter_all(query, Place)
+
+    @staticmethod
+    def _rating_deltas(deltas, added=None, removed=None):
+        """Accumulate the column changes caused by adding and/or removing a rating"""
+        for rating, sign in ((added, 1), (removed, -1)):
+            if rating is None:
+                continue
+            for column, delta in (('review_count', sign), ('rating_sum', sign * rating),
+                                  (f'stars_{rating}', sign)):
+                deltas[column] = deltas.get(column, 0) + delta
+        return deltas
+
+    @staticmethod
+    def _rating_assignments(deltas):
+        """SQL expressions applying deltas to the rating columns as in-database increments"""
+        # column = column + delta, so concurrent reviews don't lose updates
+        values = {column: getattr(Place, column) + delta
+                  for column, delta in deltas.items() if delta}
+        if deltas:
+            # Computed from the pre-update columns plus the same deltas
+            values['rating_score'] = (
+                (PRIOR_WEIGHT * PRIOR_MEAN + Place.rating_sum + deltas['rating_sum'])
+                / (PRIOR_WEIGHT + Place.review_count + deltas['review_count']))
+        return values
+
+    def _adjust_ratings(self, place, added=None, removed=None):
+        """Apply a review change to the place's rating columns"""
+        deltas = self._rating_deltas({}, added, removed)
+        for column, value in self._rating_assignments(deltas).items():
+            setattr(place, column, value)
+
+    def rebuild_rating_aggregates(self):
+        """Recompute every place's rating columns from its reviews, returning the places touched"""
+        totals = {}
+        rows = (self.session.query(Review.place_id, Review.rating, func.count(Review.id))
+                .group_by(Review.place_id, Review.rating))
+        for place_id, rating, count in rows:
+            values = totals.setdefault(place_id, dict.fromkeys(RATING_COLUMNS, 0))
+            values['review_count'] += count
+            values['rating_sum'] += rating * count
+            values[f'stars_{rating}'] += count
+
+        reset = dict.fromkeys(RATING_COLUMNS, 0)
+        reset['rating_score'] = PRIOR_MEAN
+        self.session.query(Place).update(reset, synchronize_session=False)
+        for place_id, values in totals.items():
+            values['rating_score'] = ((PRIOR_WEIGHT * PRIOR_MEAN + values['rating_sum'])
+                                      / (PRIOR_WEIGHT + values['review_count']))
+            self.session.query(Place).filter(Place.id == place_id).update(
+                values, synchronize_session=False)
+        commit(self.session)
+        self.session.expire_all()
+        if self.cache is not None:
+            # Every place's rating columns may have moved
+            self.cache.clear()
+        return len(totals)
+
+    @read_only
+    def get_top_places(self, by='rating', limit=10, min_reviews=0):
+        """Best-rated or most-reviewed places, read off the indexed aggregate columns"""
+        columns = {'rating': Place.rating_score, 'reviews': Place.review_count}
+        if by not in columns:
+            raise ValueError("Ranking must be 'rating' or 'reviews'")
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        query = self.session.query(Place).options(*PLACE_LIST_LOADS)
+        if min_reviews:
+            query = query.filter(Place.review_count >= min_reviews)
+        return query.order_by(columns[by].desc(), Place.id).limit(limit).all()
 
     # ===== Review Operations =====
     def create_review(self, text, user_id, place_id, rating):
-        review = Review(text=text, user_id=user_id, place_id=place_id, rating=rating)
-        return self.add(review)
+        place = self.get(Place, place_id)
+        if not place:
+            raise LookupError("Place not found")
+        owner = self.get(User, user_id)
+        if not owner:
+            raise LookupError("User not found")
+        review = Review(text=text, rating=rating, place=place, owner=owner)
+        self.session.add(review)
+        self._adjust_ratings(place, added=rating)
+        try:
+            commit(self.session)
+        except IntegrityError:
+            # A concurrent request got past has_reviewed() first
+            if not in_unit_of_work(self.session):
+                self.session.rollback()
+            raise ValueError("You have already reviewed this place")
+        return review
+
+    @read_only
+    def get_review(self, review_id):
+        return self._cached(entity_key('review', review_id),
+                            lambda: self.session.get(Review, review_id))
+
+    def has_reviewed(self, user_id, place_id):
+        """Whether user_id already reviewed place_id, via the unique (place_id, owner_id) index"""
+        return self.session.query(
+            self.session.query(Review.id).filter_by(place_id=place_id, owner_id=user_id).exists()
+        ).scalar()
 
+    def update_review(self, review, **updates):
+        old_rating = review.rating
+        for key, value in updates.items():
+            setattr(review, key, value)
+        if review.rating != old_rating:
+            self._adjust_ratings(review.place, added=review.rating, removed=old_rating)
+        commit(self.session)
+        return review
+
+    def delete_review(self, review):
+        self._adjust_ratings(review.place, removed=review.rating)
+        self.session.delete(review)
+        commit(self.session)
+
+    @read_only
     def get_reviews_for_place(self, place_id):
         return self.session.query(Review).filter_by(place_id=place_id).all()
 
+    @read_only
+    def get_reviews_by_place(self, place_id, limit=None, after=None):
+        query = self.session.query(Review).filter_by(place_id=place_id)
+        return keyset_query(query, Review, limit, after).all()
+
+    @read_only
+    def get_all_reviews(self, limit=None, after=None):
+        return keyset_query(self.session.query(Review), Review, limit, after).all()
+
+    def iter_reviews(self):
+        return self.iter_all(self.session.query(Review), Review)
+
+    def iter_reviews_by_place(self, place_id):
+        return self.iter_all(self.session.query(Review).filter_by(place_id=place_id), Review)
+
     # ===== Amenity Operations =====
     def create_amenity(self, name, description=None):
         amenity = Amenity(name=name)
@@ -62,4 +562,19 @@ class Facade:
         return self.add(amenity)
 
     def get_amenity_by_name(self, name):
-        return self.session.query(Amenity).filter_by(name=name).first()
+        return self._cached(entity_key('amenity_name', name),
+                            lambda: self.session.query(Amenity).filter_by(name=name).first())
+
+    @read_only
+    def get_all_amenities(self):
+        return self._cached(entity_key('amenities'), lambda: self.session.query(Amenity).all())
+
+    def iter_amenities(self):
+        return self.iter_all(self.session.query(Amenity), Amenity)
+
+
+# Shared by the API. db.session is a scoped session bound to the Flask app
+# context: each request gets its own Session, and Flask-SQLAlchemy removes
+# it (rolling back anything uncommitted and returning the connection to the
+# pool) when the context is torn down.
+facade = Facade(db.session, cache=entity_cache)
@@ -14,8 +14,8 @@ class BaseRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Any]:
-        """Get all entities"""
+    def get_all(self, limit: Optional[int] = None, after: Optional[str] = None) -> List[Any]:
+        """Get all entities, or one page of them ordered by id"""
         pass
 
     @abstractmethod
@@ -1,11 +1,13 @@
 from typing import List, Dict, Any, Optional, Type
 from sqlalchemy.orm import Session
-from repositories.base_repository import BaseRepository
+from app.services.repositories.base_repository import BaseRepository
+from app.persistence.pagination import keyset_query
+from app.persistence.unit_of_work import commit
 
 class SQLAlchemyRepository(BaseRepository):
     """SQLAlchemy implementation of the repository interface"""
     
-    def init(self, session: Session, model_class: Type):
+    def __init__(self, session: Session, model_class: Type):
         """
         Initialize the repository with a SQLAlchemy session and model class
         
@@ -26,14 +28,17 @@ class SQLAlchemyRepository(BaseRepository):
             getattr(self.model_class, attribute) == value
         ).first()
 
-    def get_all(self) -> List[Any]:
-        """Get all entities using SQLAlchemy's query interface"""
-        return self.session.query(self.model_class).all()
+    def get_all(self, limit: Optional[int] = None, after: Optional[str] = None) -> List[Any]:
+        """Get all entities, or one keyset-paginated page of them ordered by id"""
+        query = self.session.query(self.model_class)
+        if limit is None and after is None:
+            return query.all()
+        return keyset_query(query, self.model_class, limit, after).all()
 
     def add(self, entity: Any) -> Any:
         """Add a new entity using SQLAlchemy's session"""
         self.session.add(entity)
-        self.session.commit()
+        commit(self.session)
         self.session.refresh(entity)
         return entity
 
@@ -43,7 +48,7 @@ class SQLAlchemyRepository(BaseRepository):
         if entity:
             for key, value in updates.items():
                 setattr(entity, key, value)
-            self.session.commit()
+            commit(self.session)
             self.session.refresh(entity)
         return entity
 
@@ -52,6 +57,6 @@ class SQLAlchemyRepository(BaseRepository):
         entity = self.get(id)
         if entity:
             self.session.delete(entity)
-            self.session.commit()
+            commit(self.session)
             return True
         return False
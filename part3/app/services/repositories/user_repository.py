@@ -1,4 +1,5 @@
 from models.user import User
+from app.persistence.unit_of_work import commit
 
 class UserRepository:
     """Handles all database operations for Users"""
@@ -24,7 +25,7 @@ class UserRepository:
             is_admin=user_data.get('is_admin', False)
         )
         self.session.add(user)
-        self.session.commit()
+        commit(self.session)
         return user
     
     def update(self, user_id, updates):
@@ -32,13 +33,13 @@ class UserRepository:
         if user:
             for key, value in updates.items():
                 setattr(user, key, value)
-            self.session.commit()
+            commit(self.session)
         return user
     
     def delete(self, user_id):
         user = self.get(user_id)
         if user:
             self.session.delete(user)
-            self.session.commit()
+            commit(self.session)
             return True
         return False
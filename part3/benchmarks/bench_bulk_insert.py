@@ -0,0 +1,65 @@
+"""Compare bulk place creation against one add-and-commit per place.
+
+Run from the part3 directory:
+
+    python benchmarks/bench_bulk_insert.py [places]
+
+Uses a throwaway SQLite file so every commit really reaches the disk.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services.facade import Facade
+
+
+def rows(count):
+    return [{'title': f"Place {i}", 'description': "Partner listing", 'price': 50 + i % 100,
+             'latitude': (i % 180) - 90.0, 'longitude': (i % 360) - 180.0}
+            for i in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    directory = tempfile.mkdtemp()
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+    db.init_app(app)
+
+    with app.app_context():
+        from app.models import review, amenity  # noqa: F401
+        db.create_all()
+        facade = Facade(db.session)
+        owner = User("Bench", "Owner", "bench@example.com")
+        owner.password_hash = "x"
+        facade.add(owner)
+        items = rows(count)
+
+        # What a partner feed costs today: one request and commit per place
+        single_count = max(1, count // 10)
+        start = time.perf_counter()
+        for item in items[:single_count]:
+            facade.add(Place(item['title'], item['description'], item['price'],
+                             item['latitude'], item['longitude'], owner))
+        single = (time.perf_counter() - start) / single_count
+
+        start = time.perf_counter()
+        result = facade.bulk_create_places(items, owner.id)
+        bulk = (time.perf_counter() - start) / count
+        assert len(result.ids) == count
+
+    print(f"{count} places, SQLite file database")
+    print(f"single add+commit: {1 / single:10.0f} places/s")
+    print(f"bulk, best effort: {1 / bulk:10.0f} places/s")
+    print(f"speed-up:          {single / bulk:10.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Bytes on the wire and CPU cost of each response encoding, per endpoint.
+
+Run from the part3 directory:
+
+    python benchmarks/bench_compression.py
+
+Payloads have the shape of the API's place and review responses. The
+end-to-end columns add compression CPU time to the transfer time at two
+link speeds, which is what decides whether a setting lowers latency.
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from app.api.compression import Compression
+
+AMENITIES = [{'id': str(uuid.uuid4()), 'name': name}
+             for name in ("Wifi", "Pool", "Kitchen", "Parking", "Air conditioning", "Washer")]
+LINKS_MBIT = (10, 100)
+
+
+def place(i):
+    now = datetime(2026, 10, 18, 9, i % 60).isoformat()
+    return {
+        'id': str(uuid.uuid4()), 'title': f"Sunny loft {i}",
+        'description': "Bright apartment close to the old town, with a balcony and a view.",
+        'price': 50.0 + i % 200, 'latitude': 48.85 + i / 1e4, 'longitude': 2.35 - i / 1e4,
+        'owner_id': str(uuid.uuid4()), 'amenities': AMENITIES[:2 + i % 5],
+        'ratings': {'count': i % 40, 'sum': (i % 40) * 4, 'average': 4.0 if i % 40 else None,
+                    'histogram': [0, 1, 2, 3, i % 40 - 6 if i % 40 > 6 else 0]},
+        'created_at': now, 'updated_at': now,
+    }
+
+
+def review(i):
+    now = datetime(2026, 10, 18, 9, i % 60).isoformat()
+    return {'id': str(uuid.uuid4()), 'text': "Great stay, spotless and the host was lovely.",
+            'rating': 1 + i % 5, 'user_id': str(uuid.uuid4()), 'place_id': str(uuid.uuid4()),
+            'created_at': now, 'updated_at': now}
+
+
+ENDPOINTS = {
+    'GET /places/<id>': place(0),
+    'GET /places (page of 100)': [place(i) for i in range(100)],
+    'GET /places?limit=1000': [place(i) for i in range(1000)],
+    'GET /reviews (page of 100)': [review(i) for i in range(100)],
+}
+
+
+def settings():
+    yield 'identity', None
+    for level in (1, 6, 9):
+        app = Flask(__name__)
+        app.config.update(COMPRESS_ALGORITHMS=['gzip'], COMPRESS_LEVEL=level)
+        yield f'gzip -{level}', Compression(app).encoders['gzip']
+    for name, key, values in (('br', 'COMPRESS_BROTLI_QUALITY', (1, 4, 11)),
+                              ('zstd', 'COMPRESS_ZSTD_LEVEL', (1, 3, 19))):
+        for value in values:
+            app = Flask(__name__)
+            app.config.update(COMPRESS_ALGORITHMS=[name], **{key: value})
+            encoder = Compression(app).encoders.get(name)
+            if encoder is not None:
+                yield f'{name} -{value}', encoder
+
+
+def cpu_ms(encoder, body, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        encoder.compress(body)
+    return (time.process_time() - start) / repeat * 1000
+
+
+def main():
+    candidates = list(settings())
+    for endpoint, payload in ENDPOINTS.items():
+        body = json.dumps(payload).encode('utf-8')
+        repeat = max(3, 2_000_000 // len(body))
+        print(f"\n{endpoint}: {len(body)} bytes of JSON")
+        print(f"  {'encoding':<10} {'bytes':>9} {'ratio':>6} {'cpu ms':>8}"
+              + ''.join(f" {f'e2e@{mbit}Mb ms':>14}" for mbit in LINKS_MBIT))
+        for label, encoder in candidates:
+            wire = len(encoder.compress(body)) if encoder else len(body)
+            cpu = cpu_ms(encoder, body, repeat) if encoder else 0.0
+            e2e = ''.join(f" {cpu + wire * 8 / (mbit * 1000):14.2f}" for mbit in LINKS_MBIT)
+            print(f"  {label:<10} {wire:>9} {len(body) / wire:6.1f} {cpu:8.3f}{e2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Per-row cost of serializing a 10k-place listing, marshal vs compiled models.
+
+Run from the part3 directory:
+
+    python benchmarks/bench_serializers.py
+
+Rows are plain objects with the attributes of a loaded Place, so the numbers
+cover serialization and encoding only. "default" is flask_restx's layout
+(json.dumps with its default separators); "compact" is the RESTX_JSON layout
+orjson can reproduce.
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask_restx import Namespace, fields, marshal
+from app.api import serializers
+from app.api.serializers import COMPACT_JSON, compile_model
+
+ROWS = 10000
+REPEAT = 5
+
+# Same shape as place_response_model in app/api/v1/places.py
+ns = Namespace('bench')
+place_response_model = ns.model('PlaceResponse', {
+    'id': fields.String, 'title': fields.String, 'description': fields.String,
+    'price': fields.Float, 'latitude': fields.Float, 'longitude': fields.Float,
+    'owner_id': fields.String,
+    'amenities': fields.List(fields.Nested(ns.model('PlaceAmenity', {
+        'id': fields.String, 'name': fields.String}))),
+    'ratings': fields.Nested(ns.model('RatingSummary', {
+        'count': fields.Integer, 'sum': fields.Integer, 'average': fields.Float,
+        'histogram': fields.List(fields.Integer)}), attribute='rating_summary'),
+    'created_at': fields.DateTime, 'updated_at': fields.DateTime,
+})
+
+
+class Amenity:
+    def __init__(self, name):
+        self.id = str(uuid.uuid4())
+        self.name = name
+
+
+AMENITIES = [Amenity(name) for name in ("Wifi", "Pool", "Kitchen", "Parking", "Washer")]
+
+
+class Place:
+    def __init__(self, i):
+        self.id = str(uuid.uuid4())
+        self.title = f"Sunny loft {i}"
+        self.description = "Bright apartment close to the old town, with a balcony."
+        self.price = 50.0 + i % 200
+        self.latitude = 48.85 + i / 1e3
+        self.longitude = 2.35 - i / 1e3
+        self.owner_id = str(uuid.uuid4())
+        self.amenities = AMENITIES[:i % 6]
+        count = i % 40
+        self.rating_summary = {'count': count, 'sum': count * 4,
+                               'average': 4.0 if count else None,
+                               'histogram': [0, 1, 2, 3, max(count - 6, 0)]}
+        self.created_at = self.updated_at = datetime(2026, 10, 18, 9, i % 60, 1, 500)
+
+
+def timed(fn):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    places = [Place(i) for i in range(ROWS)]
+    serialize = compile_model(place_response_model)
+    assert serialize(places) == marshal(places, place_response_model)
+
+    app = Flask(__name__)
+    cases = [
+        ('marshal + json, default', {}, lambda: json.dumps(marshal(places, place_response_model))),
+        ('compiled + json, default', {}, lambda: serializers.dumps(serialize(places))),
+        ('marshal + json, compact', COMPACT_JSON,
+         lambda: json.dumps(marshal(places, place_response_model), **COMPACT_JSON)),
+        ('compiled + json, compact', dict(COMPACT_JSON, JSON_ENCODER='stdlib'),
+         lambda: serializers.dumps(serialize(places))),
+    ]
+    if serializers.orjson is not None:
+        cases.append(('compiled + orjson, compact', COMPACT_JSON,
+                      lambda: serializers.dumps(serialize(places))))
+
+    print(f"{ROWS} places, best of {REPEAT}")
+    print(f"{'':28} {'total ms':>9} {'us/row':>7} {'speed-up':>9}")
+    baseline = None
+    for name, settings, fn in cases:
+        settings = dict(settings)
+        app.config['JSON_ENCODER'] = settings.pop('JSON_ENCODER', 'auto')
+        app.config['RESTX_JSON'] = settings
+        with app.app_context():
+            elapsed = timed(fn)
+        baseline = baseline or elapsed
+        print(f"{name:28} {elapsed * 1e3:9.1f} {elapsed / ROWS * 1e6:7.2f} {baseline / elapsed:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Throughput of concurrent readers and writers on SQLite, default pragmas vs production.
+
+Run from the part3 directory:
+
+    python benchmarks/bench_sqlite_concurrency.py [readers] [writers] [seconds]
+
+Readers fetch a page of places and one place's reviews; writers add a
+review and update the place's rating aggregates in one transaction, like
+create_review. Every operation checks a connection out of the pool the app
+configures. Each profile gets a fresh SQLite file in a temporary directory.
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.pool import engine_options
+from app.persistence.sqlite import apply_pragmas
+from config import DevelopmentConfig, ProductionSQLiteConfig
+
+PLACES = 2000
+REVIEWS = 20000
+
+places = Place.__table__
+reviews = Review.__table__
+
+
+def config_of(config_class):
+    return {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+
+
+def make_engine(path, config_class):
+    config = config_of(config_class)
+    config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{path}"
+    engine = create_engine(config['SQLALCHEMY_DATABASE_URI'], **engine_options(config))
+    apply_pragmas(engine, config.get('SQLITE_PRAGMAS'))
+    return engine
+
+
+def seed(engine):
+    db.metadata.create_all(engine)
+    now = datetime.utcnow()
+    owner = str(uuid.uuid4())
+    place_ids = [str(uuid.uuid4()) for _ in range(PLACES)]
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [{
+            'id': owner, 'email': 'host@example.com', 'password_hash': 'x',
+            'first_name': 'Host', 'last_name': 'User', 'created_at': now, 'updated_at': now}])
+        connection.execute(insert(places), [{
+            'id': place_id, 'title': f"Place {i}", 'description': "Benchmark listing",
+            'price': 50.0 + i % 200, 'latitude': 0.0, 'longitude': 0.0, 'owner_id': owner,
+            'created_at': now, 'updated_at': now} for i, place_id in enumerate(place_ids)])
+        connection.execute(insert(reviews), [{
+            'id': str(uuid.uuid4()), 'text': "Lovely stay", 'rating': 1 + i % 5,
+            'place_id': place_ids[i % PLACES], 'owner_id': str(uuid.uuid4()),
+            'created_at': now, 'updated_at': now} for i in range(REVIEWS)])
+    return sorted(place_ids)
+
+
+def read(engine, place_ids):
+    after = random.choice(place_ids)
+    with engine.connect() as connection:
+        connection.execute(select(places).where(places.c.id > after)
+                           .order_by(places.c.id).limit(20)).all()
+        connection.execute(select(reviews).where(reviews.c.place_id == after)).all()
+
+
+def write(engine, place_ids):
+    place_id = random.choice(place_ids)
+    rating = random.randint(1, 5)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(reviews).values(
+            id=str(uuid.uuid4()), text="Benchmark review", rating=rating, place_id=place_id,
+            owner_id=str(uuid.uuid4()), created_at=now, updated_at=now))
+        connection.execute(update(places).where(places.c.id == place_id).values(
+            review_count=places.c.review_count + 1, rating_sum=places.c.rating_sum + rating,
+            updated_at=now))
+
+
+def worker(operation, engine, place_ids, stop, results):
+    latencies, errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            operation(engine, place_ids)
+        except OperationalError:
+            # "database is locked" once the busy timeout runs out
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    results.append((latencies, errors))
+
+
+def summary(results, seconds):
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in results)
+    if not latencies:
+        return 0.0, 0.0, errors
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / seconds, p99 * 1000, errors
+
+
+def run(config_class, readers, writers, seconds):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(os.path.join(directory, 'bench.db'), config_class)
+        place_ids = seed(engine)
+        stop = threading.Event()
+        read_results, write_results = [], []
+        threads = ([threading.Thread(target=worker, args=(read, engine, place_ids, stop,
+                                                          read_results))
+                    for _ in range(readers)]
+                   + [threading.Thread(target=worker, args=(write, engine, place_ids, stop,
+                                                            write_results))
+                      for _ in range(writers)])
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    return summary(read_results, seconds), summary(write_results, seconds)
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f"{readers} readers, {writers} writers, {seconds:g} s per profile")
+    print(f"{'':12} {'reads/s':>9} {'read p99 ms':>12} {'writes/s':>9} "
+          f"{'write p99 ms':>13} {'errors':>7}")
+    for label, config_class in (('defaults', DevelopmentConfig),
+                                ('production', ProductionSQLiteConfig)):
+        (reads, read_p99, read_errors), (writes, write_p99, write_errors) = run(
+            config_class, readers, writers, seconds)
+        print(f"{label:12} {reads:9.0f} {read_p99:12.1f} {writes:9.0f} {write_p99:13.1f} "
+              f"{read_errors + write_errors:7}")
+
+
+if __name__ == '__main__':
+    main()
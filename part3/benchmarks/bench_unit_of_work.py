@@ -0,0 +1,79 @@
+"""Compare commit-per-call writes against one unit of work per request.
+
+Run from the part3 directory:
+
+    python benchmarks/bench_unit_of_work.py [requests]
+
+Each simulated request creates five amenities and a place linked to them,
+then updates the place's price. Uses a throwaway SQLite file so every
+commit really reaches the disk.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.services.facade import Facade
+
+
+def write_request(facade, owner, n):
+    amenities = [facade.add(Amenity(f"Amenity {n}-{i}")) for i in range(5)]
+    place = Place(f"Place {n}", "Benchmark listing", 80.0, 0.0, 0.0, owner)
+    for amenity in amenities:
+        place.add_amenity(amenity)
+    facade.add(place)
+    facade.update(place, price=95.0)
+
+
+def run(facade, owner, label, count, batched):
+    commits = []
+    listener = lambda session: commits.append(1)  # noqa: E731
+    event.listen(facade.session, 'after_commit', listener)
+    latencies = []
+    for n in range(count):
+        start = time.perf_counter()
+        if batched:
+            with facade.unit_of_work():
+                write_request(facade, owner, f"{label}{n}")
+        else:
+            write_request(facade, owner, f"{label}{n}")
+        latencies.append(time.perf_counter() - start)
+    event.remove(facade.session, 'after_commit', listener)
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(commits) / count, p99 * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    directory = tempfile.mkdtemp()
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+    db.init_app(app)
+
+    with app.app_context():
+        from app.models import review  # noqa: F401
+        db.create_all()
+        facade = Facade(db.session)
+        owner = User("Bench", "Owner", "uow-bench@example.com")
+        owner.password_hash = "x"
+        facade.add(owner)
+
+        per_call = run(facade, owner, 'c', count, batched=False)
+        batched = run(facade, owner, 'u', count, batched=True)
+
+    print(f"{count} requests, SQLite file database")
+    print(f"commit per call: {per_call[0]:4.1f} commits/request, p99 {per_call[1]:7.2f} ms")
+    print(f"unit of work:    {batched[0]:4.1f} commits/request, p99 {batched[1]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
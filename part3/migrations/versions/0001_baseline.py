@@ -0,0 +1,80 @@
+"""Baseline schema, as created by db.create_all() before migrations existed
+
+Databases created that way are adopted with `flask db stamp 0001_baseline`.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade():
+    op.create_table('users',
+        *timestamps(),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=128), nullable=False),
+        sa.Column('first_name', sa.String(length=50), nullable=True),
+        sa.Column('last_name', sa.String(length=50), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    op.create_table('amenities',
+        *timestamps(),
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('places',
+        *timestamps(),
+        sa.Column('title', sa.String(length=128), nullable=False),
+        sa.Column('description', sa.String(length=512), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('place_amenities',
+        sa.Column('place_id', sa.Integer(), nullable=False),
+        sa.Column('amenity_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['amenity_id'], ['amenities.id']),
+        sa.ForeignKeyConstraint(['place_id'], ['places.id']),
+        sa.PrimaryKeyConstraint('place_id', 'amenity_id')
+    )
+    op.create_table('reviews',
+        *timestamps(),
+        sa.Column('text', sa.String(length=512), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('place_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['place_id'], ['places.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('reviews')
+    op.drop_table('place_amenities')
+    op.drop_table('places')
+    op.drop_table('amenities')
+    op.drop_table('users')
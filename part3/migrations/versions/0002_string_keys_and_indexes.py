@@ -0,0 +1,63 @@
+"""String(36) foreign keys, owner indexes and one review per user and place
+
+Foreign keys were declared Integer while every primary key is a String(36)
+uuid. Duplicate reviews are removed before the unique constraint is added,
+keeping each user's earliest review of a place.
+
+Revision ID: 0002_string_keys_and_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_string_keys_and_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+FOREIGN_KEYS = {
+    'places': ('owner_id',),
+    'reviews': ('place_id', 'owner_id'),
+    'place_amenities': ('place_id', 'amenity_id'),
+}
+
+
+def change_key_types(type_, target):
+    for table, columns in FOREIGN_KEYS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=type_, existing_nullable=False,
+                                      postgresql_using=f'{column}::{target}')
+
+
+def upgrade():
+    change_key_types(sa.String(length=36), 'varchar(36)')
+
+    op.execute("""
+        DELETE FROM reviews WHERE EXISTS (
+            SELECT 1 FROM reviews AS earlier
+            WHERE earlier.place_id = reviews.place_id
+              AND earlier.owner_id = reviews.owner_id
+              AND (earlier.created_at < reviews.created_at
+                   OR (earlier.created_at = reviews.created_at AND earlier.id < reviews.id))
+        )
+    """)
+    with op.batch_alter_table('reviews') as batch_op:
+        batch_op.create_unique_constraint('uq_reviews_place_owner', ['place_id', 'owner_id'])
+        batch_op.create_index('ix_reviews_owner_id', ['owner_id'])
+    with op.batch_alter_table('places') as batch_op:
+        batch_op.create_index('ix_places_owner_id', ['owner_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('places') as batch_op:
+        batch_op.drop_index('ix_places_owner_id')
+    with op.batch_alter_table('reviews') as batch_op:
+        batch_op.drop_index('ix_reviews_owner_id')
+        batch_op.drop_constraint('uq_reviews_place_owner', type_='unique')
+
+    change_key_types(sa.Integer(), 'integer')
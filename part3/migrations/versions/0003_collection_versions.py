@@ -0,0 +1,31 @@
+"""Per-collection version counters behind list ETags
+
+Revision ID: 0003_collection_versions
+Revises: 0002_string_keys_and_indexes
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_collection_versions'
+down_revision = '0002_string_keys_and_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    versions = op.create_table('collection_versions',
+        sa.Column('name', sa.String(length=32), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(versions, [{'name': name, 'version': 0}
+                              for name in ('users', 'places', 'reviews', 'amenities')])
+
+
+def downgrade():
+    op.drop_table('collection_versions')
@@ -0,0 +1,72 @@
+"""Place rating aggregates and the price, ranking and amenity lookup indexes
+
+The rating columns are backfilled from the reviews already stored, as
+`flask rebuild-ratings` would compute them.
+
+Revision ID: 0004_place_ratings_and_indexes
+Revises: 0003_collection_versions
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_place_ratings_and_indexes'
+down_revision = '0003_collection_versions'
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = ('review_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4',
+                 'stars_5')
+# PRIOR_MEAN and PRIOR_WEIGHT in app/models/place.py when this revision was written
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+def upgrade():
+    # Server defaults fill the existing rows; the models set the values from then on
+    with op.batch_alter_table('places') as batch_op:
+        for column in COUNT_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), nullable=False,
+                                          server_default='0'))
+        batch_op.add_column(sa.Column('rating_score', sa.Float(), nullable=False,
+                                      server_default=str(PRIOR_MEAN)))
+
+    reviews = 'FROM reviews WHERE reviews.place_id = places.id'
+    op.execute(f"""
+        UPDATE places SET
+            review_count = (SELECT count(*) {reviews}),
+            rating_sum = (SELECT coalesce(sum(rating), 0) {reviews}),
+            {', '.join(f"stars_{stars} = (SELECT count(*) {reviews} AND rating = {stars})"
+                       for stars in range(1, 6))}
+    """)
+    op.execute(f"""
+        UPDATE places SET rating_score =
+            ({PRIOR_MEAN * PRIOR_WEIGHT} + rating_sum) / ({float(PRIOR_WEIGHT)} + review_count)
+    """)
+
+    with op.batch_alter_table('places') as batch_op:
+        for column in COUNT_COLUMNS:
+            batch_op.alter_column(column, server_default=None, existing_type=sa.Integer(),
+                                  existing_nullable=False)
+        batch_op.alter_column('rating_score', server_default=None, existing_type=sa.Float(),
+                              existing_nullable=False)
+        batch_op.create_index('ix_places_price', ['price'])
+        batch_op.create_index('ix_places_review_count', ['review_count'])
+        batch_op.create_index('ix_places_rating_score', ['rating_score'])
+    with op.batch_alter_table('place_amenities') as batch_op:
+        batch_op.create_index('ix_place_amenities_amenity_place', ['amenity_id', 'place_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('place_amenities') as batch_op:
+        batch_op.drop_index('ix_place_amenities_amenity_place')
+    with op.batch_alter_table('places') as batch_op:
+        batch_op.drop_index('ix_places_rating_score')
+        batch_op.drop_index('ix_places_review_count')
+        batch_op.drop_index('ix_places_price')
+        batch_op.drop_column('rating_score')
+        for column in reversed(COUNT_COLUMNS):
+            batch_op.drop_column(column)
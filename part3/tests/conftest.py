@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from flask import Flask
+from app.extensions import db
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        # Import every model so create_all() sees the full schema
+        from app.models import user, place, review, amenity  # noqa: F401
+        # Models live on the default bind; other tests may register replica binds
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def session(app):
+    return db.session
+
+
+@pytest.fixture
+def make_user(session):
+    """Add committed users; emails are unique because User tracks them process-wide"""
+    from app.models.user import User
+
+    def make(first_name="Host", is_admin=False):
+        user = User(first_name, "User", f"{uuid.uuid4().hex}@example.com", is_admin=is_admin)
+        user.password_hash = "x"
+        session.add(user)
+        session.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def owner(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def make_place(session, owner):
+    """Add committed places hosted by owner"""
+    from app.models.place import Place
+
+    def make(title="Loft", price=80.0):
+        place = Place(title, "", price, 0.0, 0.0, owner)
+        session.add(place)
+        session.commit()
+        return place
+    return make
+
+
+@pytest.fixture
+def place(make_place):
+    return make_place()
@@ -0,0 +1,51 @@
+import pytest
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.services.facade import Facade
+
+
+@pytest.fixture
+def catalogue(session, owner):
+    amenities = {name: Amenity(name) for name in ("wifi", "pool", "parking")}
+    places = {}
+    for title, price, names in (("both", 50.0, ("wifi", "pool")),
+                                ("wifi", 60.0, ("wifi", "parking")),
+                                ("pool", 70.0, ("pool",))):
+        place = Place(title, "", price, 0.0, 0.0, owner)
+        for name in names:
+            place.add_amenity(amenities[name])
+        places[title] = place
+        session.add(place)
+    session.commit()
+    return places, amenities
+
+
+def titles(places):
+    return {place.title for place in places}
+
+
+def test_all_of_filter_with_facets(session, catalogue):
+    facade = Facade(session)
+    wifi = facade.resolve_amenities(["wifi"])
+    assert titles(facade.get_all_places(amenity_ids=wifi)) == {"both", "wifi"}
+    assert facade.get_amenity_facets(amenity_ids=wifi) == {'wifi': 2, 'pool': 1, 'parking': 1}
+
+    both = facade.resolve_amenities(["wifi", "pool"])
+    assert titles(facade.get_all_places(amenity_ids=both)) == {"both"}
+
+    assert titles(facade.get_all_places(min_price=55, amenity_ids=wifi)) == {"wifi"}
+    assert facade.get_amenity_facets(min_price=55, amenity_ids=wifi) == {'wifi': 1, 'parking': 1}
+
+    with pytest.raises(ValueError):
+        facade.resolve_amenities(["sauna"])
+
+
+def test_filter_follows_amenity_changes(session, catalogue):
+    places, amenities = catalogue
+    facade = Facade(session)
+    pool = facade.resolve_amenities(["pool"])
+
+    places["wifi"].add_amenity(amenities["pool"])
+    places["pool"].remove_amenity(amenities["pool"])
+    session.commit()
+    assert titles(facade.get_all_places(amenity_ids=pool)) == {"both", "wifi"}
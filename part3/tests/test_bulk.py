@@ -0,0 +1,125 @@
+import pytest
+from flask import Flask
+from app.api.bulk import read_items, bulk_response
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services.facade import Facade
+
+
+def make_user(session, email):
+    user = User("Bulk", "User", email)
+    user.password_hash = "x"
+    session.add(user)
+    session.commit()
+    return user
+
+
+def place_row(i, **overrides):
+    row = {'title': f"Place {i}", 'price': 10 + i, 'latitude': 1.0, 'longitude': 2.0}
+    row.update(overrides)
+    return row
+
+
+def test_best_effort_keeps_valid_items(session):
+    facade = Facade(session)
+    owner = make_user(session, "owner@bulk.example")
+    wifi = Amenity("Wifi")
+    session.add(wifi)
+    session.commit()
+
+    rows = [place_row(i) for i in range(5)]
+    rows[1]['price'] = -1
+    rows[3]['amenity_ids'] = [wifi.id]
+    rows.append("not an object")
+    result = facade.bulk_create_places(rows, owner.id, chunk_size=2).to_dict()
+
+    assert (result['created'], result['failed']) == (4, 2)
+    assert [entry['status'] for entry in result['results']] == [
+        'created', 'error', 'created', 'created', 'created', 'error']
+    assert session.query(Place).count() == 4
+    place = session.get(Place, result['results'][3]['id'])
+    assert [amenity.name for amenity in place.amenities] == ['Wifi']
+
+
+def test_atomic_rejects_whole_batch(session):
+    facade = Facade(session)
+    owner = make_user(session, "atomic@bulk.example")
+    rows = [place_row(0), place_row(1, title='')]
+    result = facade.bulk_create_places(rows, owner.id, atomic=True).to_dict()
+    assert (result['created'], result['failed'], result['skipped']) == (0, 1, 1)
+    assert session.query(Place).count() == 0
+
+    result = facade.bulk_create_places([place_row(0), place_row(1)], owner.id, atomic=True)
+    assert len(result.ids) == 2
+    assert session.query(Place).count() == 2
+
+
+def test_database_conflicts_reported_per_item(session):
+    facade = Facade(session)
+    make_user(session, "taken@bulk.example")
+    rows = [{'email': f"user{i}@bulk.example", 'password': "pw"} for i in range(3)]
+    rows.append({'email': "taken@bulk.example", 'password': "pw"})
+    rows.append({'email': "user0@bulk.example", 'password': "pw"})
+    result = facade.bulk_create_users(rows).to_dict()
+    assert [entry['status'] for entry in result['results']] == [
+        'created', 'created', 'created', 'error', 'error']
+    assert session.query(User).filter(User.email.like('user%')).count() == 3
+
+
+def test_failed_chunk_retried_row_by_row(session):
+    facade = Facade(session)
+    rows = [{'id': str(i), 'email': f"{i % 3}@retry.example", 'password_hash': "x"}
+            for i in range(5)]
+    result = facade._bulk_insert(User, rows, dict, chunk_size=5).to_dict()
+    assert [entry['status'] for entry in result['results']] == [
+        'created', 'created', 'created', 'error', 'error']
+    assert 'UNIQUE' in result['results'][3]['error']
+
+    result = facade._bulk_insert(User, [dict(rows[3], id='9')], dict, atomic=True).to_dict()
+    assert result['skipped'] == 1
+
+
+def test_bulk_reviews_update_ratings(session):
+    facade = Facade(session)
+    owner = make_user(session, "host@bulk.example")
+    guest = make_user(session, "guest@bulk.example")
+    first, second = facade.bulk_create_places([place_row(0), place_row(1)], owner.id).ids
+
+    rows = [{'text': "Nice", 'rating': 4, 'place_id': first},
+            {'text': "Great", 'rating': 5, 'place_id': second},
+            {'text': "Again", 'rating': 5, 'place_id': first}]
+    result = facade.bulk_create_reviews(rows, guest.id).to_dict()
+    assert [entry['status'] for entry in result['results']] == ['created', 'created', 'error']
+    assert session.query(Review).count() == 2
+    assert session.get(Place, first).rating_summary['histogram'] == [0, 0, 0, 1, 0]
+    assert session.get(Place, second).review_count == 1
+
+
+def test_read_items_accepts_json_and_ndjson():
+    app = Flask(__name__)
+    with app.test_request_context(json=[{'name': 'a'}]):
+        assert read_items() == [{'name': 'a'}]
+    with app.test_request_context(data='{"name": "a"}\n\n{"name": "b"}\n',
+                                  content_type='application/x-ndjson'):
+        assert read_items() == [{'name': 'a'}, {'name': 'b'}]
+    with app.test_request_context(data='{"name": ', content_type='application/x-ndjson'):
+        with pytest.raises(ValueError):
+            read_items()
+    with app.test_request_context(json={'name': 'a'}):
+        with pytest.raises(ValueError):
+            read_items()
+
+
+def test_bulk_response_status():
+    class Result:
+        def __init__(self, created, failed, skipped=0):
+            self.body = {'created': created, 'failed': failed, 'skipped': skipped, 'results': []}
+
+        def to_dict(self):
+            return self.body
+
+    assert bulk_response(Result(3, 0))[1] == 201
+    assert bulk_response(Result(2, 1))[1] == 207
+    assert bulk_response(Result(0, 1, 2))[1] == 400
@@ -0,0 +1,148 @@
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.cache import EntityCache, MemoryBackend, SQLiteBackend, entity_key
+from app.services.facade import Facade
+
+
+@pytest.fixture
+def cached(session):
+    cache = EntityCache(MemoryBackend(max_entries=100, ttl=60))
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    yield Facade(session, cache=cache), cache, statements
+    event.remove(db.engine, 'before_cursor_execute', listener)
+
+
+def add_wifi(facade, place):
+    wifi = Amenity("Wifi")
+    place.add_amenity(wifi)
+    facade.add(wifi)
+    return place.id, wifi.id
+
+
+def new_request():
+    """Drop the session, as Flask-SQLAlchemy does when a request ends"""
+    db.session.remove()
+
+
+def test_hits_skip_the_database(cached, place):
+    facade, cache, statements = cached
+    place_id, _ = add_wifi(facade, place)
+    new_request()
+    assert facade.get_place(place_id).title == "Loft"
+    new_request()
+    statements.clear()
+    place = facade.get_place(place_id)
+    assert statements == []
+    assert place in db.session
+    assert [amenity.name for amenity in place.amenities] == ["Wifi"]
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_committed_writes_invalidate_precisely(cached, make_place):
+    facade, cache, statements = cached
+    place_id, wifi_id = add_wifi(facade, make_place())
+    other_id, _ = add_wifi(facade, make_place())
+    new_request()
+    facade.get_place(place_id)
+    facade.get_place(other_id)
+    assert [a.name for a in facade.get_all_amenities()] == ["Wifi", "Wifi"]
+
+    facade.update(facade.get(Place, place_id), price=95.0)
+    assert cache.stats()['entries'] == 2
+    new_request()
+    assert facade.get_place(place_id).price == 95.0
+
+    # Renaming an amenity drops the list, both names and the places embedding it
+    facade.get_amenity_by_name("Wifi")
+    facade.update(facade.get(Amenity, wifi_id), name="Fibre")
+    new_request()
+    assert facade.get_amenity_by_name("Wifi").id != wifi_id
+    assert sorted(a.name for a in facade.get_all_amenities()) == ["Fibre", "Wifi"]
+    assert [a.name for a in facade.get_place(place_id).amenities] == ["Fibre"]
+
+
+def test_uncommitted_writes_bypass_the_cache(cached, place):
+    facade, cache, statements = cached
+    place_id = place.id
+    new_request()
+    facade.get_place(place_id)
+    invalidations = cache.stats()['invalidations']
+    with pytest.raises(RuntimeError):
+        with facade.unit_of_work():
+            facade.update(facade.get(Place, place_id), price=1.0)
+            assert facade.get_place(place_id).price == 1.0
+            raise RuntimeError("rolled back")
+    new_request()
+    assert facade.get_place(place_id).price == 80.0
+    assert cache.stats()['invalidations'] == invalidations
+
+
+def test_memory_backend_evicts_lru_and_expires():
+    backend = MemoryBackend(max_entries=2, ttl=60)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')
+    backend.set('c', 3)
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (1, None, 3)
+    assert backend.evictions == 1
+
+    backend.ttl = 0
+    backend.set('d', 4)
+    assert backend.get('d') is None
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    first = SQLiteBackend(str(tmp_path / 'cache.db'), max_entries=2)
+    second = SQLiteBackend(str(tmp_path / 'cache.db'), max_entries=2)
+    first.set('a', b'1')
+    assert second.get('a') == b'1'
+    second.delete(['a'])
+    assert first.get('a') is None
+
+    first.set('b', b'2')
+    time.sleep(0.01)
+    first.set('c', b'3')
+    first.get('b')
+    first.set('d', b'4')
+    assert first.get('c') is None and first.evictions == 1
+
+
+def test_load_started_before_an_invalidation_is_not_cached(cached, place):
+    facade, cache, statements = cached
+    place_id = place.id
+    new_request()
+
+    def load():
+        place = db.session.get(Place, place_id)
+        # Another worker commits a write while this load is in flight
+        cache.invalidate([entity_key('place', place_id)])
+        return place
+
+    assert cache.get_or_load(db.session, entity_key('place', place_id), load).id == place_id
+    assert cache.stats()['entries'] == 0
+    new_request()
+    facade.get_place(place_id)
+    assert cache.stats()['entries'] == 1
+
+
+@pytest.mark.parametrize('make_backend', [
+    lambda tmp_path: MemoryBackend(ttl=60),
+    lambda tmp_path: SQLiteBackend(str(tmp_path / 'cache.db'), ttl=60),
+])
+def test_backends_refuse_values_loaded_before_a_delete(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+    loaded_at = backend.now()
+    backend.delete(['a'])
+    assert backend.set('a', b'stale', loaded_at=loaded_at) is False
+    assert backend.get('a') is None
+    assert backend.set('a', b'fresh', loaded_at=backend.now()) is True
+    assert backend.get('a') == b'fresh'
+    assert backend.set('b', b'old', loaded_at=backend.now() - 61) is False
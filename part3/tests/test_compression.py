@@ -0,0 +1,70 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from app.api.compression import Compression
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['COMPRESS_ALGORITHMS'] = ['gzip']
+    Compression(app)
+    rows = [{'id': i, 'title': f"Place {i}", 'amenities': ["Wifi", "Pool"]} for i in range(200)]
+
+    @app.route('/big')
+    def big():
+        response = jsonify(rows)
+        response.set_etag('abc')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify(ok=True)
+
+    @app.route('/stream')
+    def stream():
+        return Response((json.dumps(row) + '\n' for row in rows), mimetype='application/x-ndjson')
+
+    @app.route('/encoded')
+    def encoded():
+        return Response(gzip.compress(b'[]' * 1000), mimetype='application/json',
+                        headers={'Content-Encoding': 'gzip'})
+
+    app.rows = rows
+    return app.test_client()
+
+
+def test_negotiates_gzip_above_the_threshold(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data)) == client.application.rows
+    assert int(response.headers['Content-Length']) == len(response.data)
+    # The strong validator no longer describes these bytes
+    assert response.headers['ETag'] == 'W/"abc"'
+
+    assert 'Content-Encoding' not in client.get('/big').headers
+    assert 'Content-Encoding' not in client.get('/big', headers={'Accept-Encoding': 'gzip;q=0'}).headers
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+
+
+def test_streams_are_compressed_chunk_by_chunk(client):
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    decompressor = zlib.decompressobj(31)
+    chunks = list(response.response)
+    # Each sync-flushed chunk decodes on its own, before the stream ends
+    assert decompressor.decompress(chunks[0]).startswith(b'{"id": 0')
+    body = decompressor.decompress(b''.join(chunks[1:]))
+    assert decompressor.eof
+    assert len(body.splitlines()) == 199
+
+
+def test_already_encoded_responses_are_left_alone(client):
+    response = client.get('/encoded', headers={'Accept-Encoding': 'gzip'})
+    assert gzip.decompress(response.data) == b'[]' * 1000
@@ -0,0 +1,94 @@
+from flask import jsonify
+
+from app.api.conditional import conditional, collection_validators, entity_validators
+from app.models.amenity import Amenity
+from app.services.facade import Facade
+
+
+def version(facade, name):
+    row = facade.get_collection_version(name)
+    return row.version if row is not None else 0
+
+
+def test_commits_bump_the_collections_they_change(session, owner, make_place):
+    facade = Facade(session)
+    assert (version(facade, 'places'), version(facade, 'users')) == (0, 1)
+    place = make_place()
+    assert version(facade, 'places') == 1
+
+    facade.get_all_amenities()
+    session.commit()
+    assert version(facade, 'places') == 1
+
+    wifi = facade.add(Amenity("Wifi"))
+    assert (version(facade, 'amenities'), version(facade, 'places')) == (1, 2)
+
+    # Linking and renaming amenities moves the place's updated_at too
+    before = place.updated_at
+    place = facade.get_place(place.id)
+    place.add_amenity(wifi)
+    session.commit()
+    linked = place.updated_at
+    assert linked > before
+    facade.update(wifi, name="Fibre")
+    assert place.updated_at > linked
+    assert version(facade, 'places') == 4
+
+    facade.create_review("Nice", place.owner_id, place.id, 4)
+    assert version(facade, 'reviews') == 1
+
+
+def test_conditional_get(app, session, place):
+    facade = Facade(session)
+    calls = []
+
+    @conditional(lambda place_id: entity_validators(facade.get_place(place_id)))
+    def show(place_id):
+        calls.append(place_id)
+        return jsonify(title=facade.get_place(place_id).title)
+
+    @conditional(lambda: collection_validators(facade.get_collection_version('places')))
+    def listing():
+        calls.append('list')
+        return jsonify([p.title for p in facade.get_all_places()])
+
+    app.add_url_rule('/places/<place_id>', view_func=show)
+    app.add_url_rule('/places', view_func=listing)
+    client = app.test_client()
+
+    first = client.get(f'/places/{place.id}')
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+    assert first.status_code == 200 and etag.startswith('"')
+
+    assert client.get(f'/places/{place.id}', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get(f'/places/{place.id}',
+                      headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert len(calls) == 1
+
+    listed = client.get('/places')
+    again = client.get('/places', headers={'If-None-Match': listed.headers['ETag']})
+    assert again.status_code == 304 and again.headers['ETag'] == listed.headers['ETag']
+    # A different page or filter is a different representation
+    assert client.get('/places?limit=1',
+                      headers={'If-None-Match': listed.headers['ETag']}).status_code == 200
+
+    facade.update(facade.get_place(place.id), price=95.0)
+    changed = client.get(f'/places/{place.id}', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert client.get('/places', headers={'If-None-Match': listed.headers['ETag']}).status_code == 200
+
+
+def test_version_bumps_are_single_upserts():
+    from datetime import datetime
+    from sqlalchemy.dialects import mysql, postgresql
+    from app.persistence.versions import _bump_statement
+
+    now = datetime(2026, 10, 18)
+    compiled = str(_bump_statement('postgresql', 'places', now).compile(
+        dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (name) DO UPDATE' in compiled
+    assert 'version = (collection_versions.version +' in compiled
+    compiled = str(_bump_statement('mysql', 'places', now).compile(dialect=mysql.dialect()))
+    assert 'ON DUPLICATE KEY UPDATE' in compiled
+    # Other dialects rely on the rows migration 0003 seeds
+    assert str(_bump_statement('oracle', 'places', now)).startswith('UPDATE collection_versions')
@@ -0,0 +1,54 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from app.models.amenity import Amenity
+from app.services.export import export_chunks, gzip_chunks
+from app.services.facade import Facade
+
+
+def add_amenities(session, count):
+    for i in range(count):
+        session.add(Amenity(f"Amenity {i}"))
+    session.commit()
+
+
+def test_export_formats(session):
+    add_amenities(session, 12)
+    facade = Facade(session)
+
+    lines = ''.join(export_chunks(facade.iter_export('amenities'), 'amenities',
+                                  rows_per_chunk=5)).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert len(rows) == 12
+    assert [row['id'] for row in rows] == sorted(row['id'] for row in rows)
+
+    chunks = export_chunks(facade.iter_export('amenities'), 'amenities', 'csv')
+    text = gzip.decompress(b''.join(gzip_chunks(chunks))).decode('utf-8')
+    assert len(list(csv.DictReader(io.StringIO(text)))) == 12
+
+
+def test_since_filter(session):
+    add_amenities(session, 3)
+    old = session.query(Amenity).first()
+    old.updated_at = datetime.utcnow() - timedelta(days=30)
+    session.commit()
+
+    since = datetime.utcnow() - timedelta(days=1)
+    rows = list(Facade(session).iter_export('amenities', since))
+    assert len(rows) == 2
+    assert old not in rows
+
+
+def test_export_command(app, session, tmp_path):
+    from app.commands import register_commands
+    register_commands(app)
+    add_amenities(session, 4)
+
+    output = tmp_path / 'amenities.csv.gz'
+    result = app.test_cli_runner().invoke(
+        args=['export', 'amenities', '-o', str(output), '--format', 'csv', '--gzip'])
+    assert result.exit_code == 0, result.output
+    with gzip.open(output, 'rt') as f:
+        assert len(f.read().splitlines()) == 5
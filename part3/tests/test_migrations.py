@@ -0,0 +1,64 @@
+import os
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask import Flask
+from flask_migrate import upgrade
+from sqlalchemy import inspect, text
+
+from app.extensions import db, migrate
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+
+def make_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + str(path)
+    db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS)
+    return app
+
+
+def test_upgrade_fixes_keys_drops_duplicate_reviews_and_backfills_ratings(tmp_path):
+    app = make_app(tmp_path / 'hbnb.db')
+    with app.app_context():
+        from app.models import user, place, review, amenity  # noqa: F401
+        upgrade(revision='0001_baseline')
+        db.session.execute(text(
+            "INSERT INTO users (id, email, password_hash) VALUES ('u1', 'a@x.io', 'x'), ('u2', 'b@x.io', 'x')"))
+        db.session.execute(text(
+            "INSERT INTO places (id, title, price, latitude, longitude, owner_id)"
+            " VALUES ('p1', 'Loft', 80, 0, 0, 'u1'), ('p2', 'Hut', 20, 0, 0, 'u2')"))
+        db.session.execute(text(
+            "INSERT INTO reviews (id, text, rating, place_id, owner_id, created_at) VALUES"
+            " ('r1', 'First', 5, 'p1', 'u2', '2024-01-01'), ('r2', 'Again', 4, 'p1', 'u2', '2024-02-01')"))
+        db.session.commit()
+
+        upgrade()
+
+        assert db.session.execute(text("SELECT id FROM reviews")).scalars().all() == ['r1']
+        ratings = db.session.execute(text(
+            "SELECT id, review_count, rating_sum, stars_5, rating_score FROM places ORDER BY id"))
+        assert [tuple(row) for row in ratings] == [('p1', 1, 5, 1, 20 / 6), ('p2', 0, 0, 0, 3.0)]
+        inspector = inspect(db.engine)
+        assert {'ix_places_owner_id'} <= {ix['name'] for ix in inspector.get_indexes('places')}
+        assert {'ix_reviews_owner_id'} <= {ix['name'] for ix in inspector.get_indexes('reviews')}
+        assert {'ix_places_price', 'ix_places_rating_score'} <= {
+            ix['name'] for ix in inspector.get_indexes('places')}
+        # The migrated schema is exactly what the models declare
+        with db.engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={'compare_type': True})
+            assert compare_metadata(context, db.metadata) == []
+        db.session.remove()
+
+
+def test_baseline_matches_the_original_schema(tmp_path):
+    app = make_app(tmp_path / 'hbnb.db')
+    with app.app_context():
+        upgrade(revision='0001_baseline')
+        inspector = inspect(db.engine)
+        assert [column['name'] for column in inspector.get_columns('places')] == [
+            'id', 'created_at', 'updated_at', 'title', 'description', 'price', 'latitude',
+            'longitude', 'owner_id']
+        assert inspector.get_indexes('places') == []
+        assert inspector.get_indexes('place_amenities') == []
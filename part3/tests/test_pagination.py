@@ -0,0 +1,57 @@
+import pytest
+from app.models.amenity import Amenity
+from app.persistence.pagination import paginate, keyset_query, encode_cursor, decode_cursor
+from app.persistence.repository import InMemoryRepository
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("0f8c1e2a-id")
+    assert "0f8c1e2a-id" not in cursor
+    assert decode_cursor(cursor) == "0f8c1e2a-id"
+
+    with pytest.raises(ValueError):
+        decode_cursor("%%%")
+
+
+def test_keyset_pages_cover_table_once(session):
+    for i in range(25):
+        session.add(Amenity(f"Amenity {i}"))
+    session.commit()
+
+    def fetch(limit, after):
+        return keyset_query(session.query(Amenity), Amenity, limit, after).all()
+
+    seen = []
+    items, cursor = paginate(fetch, limit=10)
+    seen.extend(items)
+    while cursor:
+        items, cursor = paginate(fetch, limit=10, cursor=cursor)
+        seen.extend(items)
+
+    ids = [amenity.id for amenity in seen]
+    assert len(ids) == 25
+    assert ids == sorted(ids)
+
+
+def test_keyset_query_uses_where_not_offset(session):
+    sql = str(keyset_query(session.query(Amenity), Amenity, 10, "abc").statement)
+    assert "amenities.id >" in sql
+    assert "OFFSET" not in sql.upper()
+
+
+def test_in_memory_repository_pages():
+    class Obj:
+        def __init__(self, obj_id):
+            self.id = obj_id
+
+    repo = InMemoryRepository()
+    for obj_id in ["c", "a", "e", "b", "d"]:
+        repo.add(Obj(obj_id))
+    repo.delete("b")
+
+    assert [obj.id for obj in repo.get_all()] == ["c", "a", "e", "d"]
+    items, cursor = paginate(repo.get_all, limit=2)
+    assert [obj.id for obj in items] == ["a", "c"]
+    items, cursor = paginate(repo.get_all, limit=2, cursor=cursor)
+    assert [obj.id for obj in items] == ["d", "e"]
+    assert cursor is None
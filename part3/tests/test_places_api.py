@@ -0,0 +1,85 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from flask_restx import Api
+
+from app.extensions import jwt
+from app.models.amenity import Amenity
+from app.services.facade import facade
+
+
+@pytest.fixture
+def client(app):
+    from app.api.v1.places import api as places_ns
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-that-is-long-enough'
+    jwt.init_app(app)
+    api = Api(app)
+    api.add_namespace(places_ns, path='/places')
+    return app.test_client()
+
+
+def auth(user):
+    return {'Authorization': f"Bearer {create_access_token(identity=user.id)}"}
+
+
+def test_write_endpoints_return_the_written_place(client, make_user):
+    owner, admin, guest = make_user(), make_user(is_admin=True), make_user()
+    wifi, pool = facade.add(Amenity("Wifi")), facade.add(Amenity("Pool"))
+
+    response = client.post('/places/', headers=auth(owner), json={
+        'title': "Loft", 'description': "Bright", 'price': 80.0,
+        'latitude': 48.85, 'longitude': 2.35, 'amenity_ids': [wifi.id]})
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['title'] == "Loft" and body['owner_id'] == owner.id
+    assert body['amenities'] == [{'id': wifi.id, 'name': "Wifi"}]
+    assert body['ratings']['count'] == 0
+    place_id = body['id']
+
+    response = client.put(f'/places/{place_id}', headers=auth(owner),
+                          json={'price': 95.0, 'amenity_ids': [wifi.id, pool.id]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['price'] == 95.0
+    assert sorted(a['name'] for a in body['amenities']) == ["Pool", "Wifi"]
+
+    assert client.put(f'/places/{place_id}', headers=auth(guest),
+                      json={'price': 1.0}).status_code == 403
+
+    response = client.put(f'/places/{place_id}/transfer', headers=auth(admin),
+                          json={'new_owner_id': guest.id})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['owner_id'] == guest.id
+    assert len(body['amenities']) == 2
+
+    assert client.put(f'/places/{place_id}/transfer', headers=auth(owner),
+                      json={'new_owner_id': owner.id}).status_code == 403
+
+
+def test_invalid_place_writes_are_rejected(client, make_user):
+    owner = make_user()
+    response = client.post('/places/', headers=auth(owner), json={
+        'title': "Loft", 'price': 80.0, 'latitude': 100.0, 'longitude': 0.0})
+    assert response.status_code == 400
+    response = client.post('/places/', headers=auth(owner), json={
+        'title': "Loft", 'price': 80.0, 'latitude': 0.0, 'longitude': 0.0,
+        'amenity_ids': ['missing']})
+    assert response.status_code == 400
+
+
+def test_stream_applies_the_listing_filters(client, make_user):
+    owner = make_user()
+    wifi = facade.add(Amenity("Wifi"))
+    for title, price, amenity_ids in [("Hut", 40.0, [wifi.id]), ("Loft", 80.0, [wifi.id]),
+                                      ("Villa", 90.0, [])]:
+        facade.create_place(title, owner.id, price=price, latitude=0.0, longitude=0.0,
+                            amenity_ids=amenity_ids)
+    facade.session.commit()
+
+    query = {'min_price': 50, 'amenities': 'Wifi'}
+    paged = client.get('/places/', query_string=query).get_json()
+    streamed = client.get('/places/', query_string=dict(query, stream='true')).get_json()
+    assert [place['title'] for place in streamed] == [place['title'] for place in paged] == ["Loft"]
+
+    response = client.get('/places/', query_string={'stream': 'true', 'amenities': 'Sauna'})
+    assert response.status_code == 400
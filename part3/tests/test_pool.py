@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from app.extensions import db
+from app.persistence.pool import TimedQueuePool, engine_options, pool_status
+from app.services.facade import facade
+from config import DevelopmentConfig
+
+
+def config_for(uri):
+    config = {key: getattr(DevelopmentConfig, key) for key in dir(DevelopmentConfig)
+              if key.isupper()}
+    config['SQLALCHEMY_DATABASE_URI'] = uri
+    return config
+
+
+def test_engine_options():
+    assert engine_options(config_for('sqlite://')) == {}
+    options = engine_options(config_for('postgresql://db/hbnb'))
+    assert options['poolclass'] is TimedQueuePool
+    assert options['pool_size'] == DevelopmentConfig.DB_POOL_SIZE
+    assert options['pool_pre_ping'] is DevelopmentConfig.DB_POOL_PRE_PING
+
+
+def test_pool_status_tracks_checkouts_and_waits(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    first = engine.connect()
+    status = pool_status(engine)
+    assert (status['size'], status['checked_out'], status['waits']) == (1, 1, 1)
+
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+    status = pool_status(engine)
+    assert status['waits'] == 2
+    assert status['wait_max_ms'] >= 50
+
+    first.close()
+    engine.dispose()
+    assert pool_status(engine)['waits'] == 2
+    assert pool_status(engine)['checked_out'] == 0
+
+
+def test_facade_uses_the_app_context_session(app):
+    assert facade.session is db.session
+    assert facade.session() is db.session()
@@ -0,0 +1,96 @@
+import uuid
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import Facade
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def serialize(place):
+    """Touch everything PlaceResponse marshals"""
+    return {
+        'id': place.id, 'title': place.title, 'owner_id': place.owner_id,
+        'amenities': [{'id': amenity.id, 'name': amenity.name} for amenity in place.amenities],
+        'ratings': place.rating_summary,
+    }
+
+
+@pytest.fixture
+def facade(session, owner, make_user):
+    guest = make_user("Guest")
+    amenities = [Amenity(f"Amenity {i}") for i in range(3)]
+    for i in range(30):
+        place = Place(f"Place {i}", "", 10.0 + i, 0.0, 0.0, owner)
+        place.add_amenity(amenities[i % 3])
+        place.add_amenity(amenities[(i + 1) % 3])
+        session.add(place)
+        session.add(Review("Nice", 4, place, guest))
+    session.commit()
+    session.expunge_all()
+    return Facade(session)
+
+
+def test_place_list_endpoints_use_fixed_query_counts(facade):
+    owner_id = facade.session.query(Place.owner_id).first()[0]
+    listings = {
+        'list': lambda: facade.get_all_places(limit=100),
+        'filtered': lambda: facade.get_all_places(limit=100, min_price=15),
+        'top': lambda: facade.get_top_places('rating', limit=100),
+        'by_owner': lambda: facade.get_places_by_owner(owner_id),
+        'stream': lambda: list(facade.iter_places()),
+    }
+    for name, fetch in listings.items():
+        facade.session.expunge_all()
+        with count_queries() as statements:
+            rows = [serialize(place) for place in fetch()]
+        assert rows, name
+        # One SELECT for the places, one for all of their amenities
+        assert len(statements) == 2, (name, statements)
+
+
+def test_place_with_reviews_and_authors(facade):
+    place_id = facade.session.query(Place.id).first()[0]
+    facade.session.expunge_all()
+    with count_queries() as statements:
+        place = facade.get_place_with_reviews(place_id)
+        authors = [review.owner.first_name for review in place.reviews]
+    assert authors == ["Guest"]
+    assert len(statements) == 3
+
+
+def test_unplanned_lazy_load_raises_in_listings(facade):
+    place = facade.get_all_places(limit=1)[0]
+    with pytest.raises(InvalidRequestError):
+        place.reviews
+    with pytest.raises(InvalidRequestError):
+        place.owner
+
+
+def test_places_loaded_elsewhere_still_lazy_load(facade):
+    place = facade.session.query(Place).first()
+    amenity = Amenity(f"Amenity {uuid.uuid4()}")
+    place.add_amenity(amenity)
+    with facade.session.no_autoflush:
+        place.add_review(Review("Again", 5, place, place.owner))
+    assert amenity in place.amenities
+    assert len(place.reviews) == 2
+    place.remove_amenity(amenity)
+    assert amenity not in place.amenities
@@ -0,0 +1,96 @@
+import pytest
+
+from app.services.facade import Facade
+
+
+def test_aggregates_follow_review_changes(session, place, make_user):
+    facade = Facade(session)
+    assert place.rating_summary == {'count': 0, 'sum': 0, 'average': None,
+                                    'histogram': [0, 0, 0, 0, 0]}
+
+    alice, bob = make_user("Guest"), make_user("Guest")
+    first = facade.create_review("Great", alice.id, place.id, 5)
+    facade.create_review("Fine", bob.id, place.id, 3)
+    assert place.rating_summary == {'count': 2, 'sum': 8, 'average': 4.0,
+                                    'histogram': [0, 0, 1, 0, 1]}
+
+    facade.update_review(first, rating=1)
+    assert place.rating_summary['histogram'] == [1, 0, 1, 0, 0]
+    assert place.rating_average == 2.0
+
+    facade.delete_review(first)
+    assert place.rating_summary == {'count': 1, 'sum': 3, 'average': 3.0,
+                                    'histogram': [0, 0, 1, 0, 0]}
+
+
+def test_rebuild_repairs_drift(session, place, make_user):
+    facade = Facade(session)
+    for guest in (make_user("Guest"), make_user("Guest")):
+        facade.create_review("Good", guest.id, place.id, 4)
+
+    place.review_count = 7
+    place.stars_1 = 3
+    session.commit()
+
+    assert facade.rebuild_rating_aggregates() == 1
+    assert place.rating_summary == {'count': 2, 'sum': 8, 'average': 4.0,
+                                    'histogram': [0, 0, 0, 2, 0]}
+
+
+def test_top_places(session, make_place, make_user):
+    facade = Facade(session)
+    lucky, solid, empty = make_place(), make_place(), make_place()
+    guests = [make_user("Guest") for _ in range(8)]
+    facade.create_review("Wow", guests[0].id, lucky.id, 5)
+    reviews = [facade.create_review("Good", guest.id, solid.id, rating)
+               for guest, rating in zip(guests, (5, 5, 4, 5, 5, 4, 5, 5))]
+
+    assert facade.get_top_places('rating') == [solid, lucky, empty]
+    assert facade.get_top_places('rating', min_reviews=2) == [solid]
+    assert facade.get_top_places('reviews', limit=1) == [solid]
+
+    for review in reviews:
+        facade.update_review(review, rating=1)
+    assert facade.get_top_places('rating', limit=1) == [lucky]
+
+    facade.rebuild_rating_aggregates()
+    assert facade.get_top_places('rating', limit=1) == [lucky]
+    assert lucky.rating_score == (5 * 3.0 + 5) / 6
+
+
+def test_one_review_per_user_and_place(session, place, make_user):
+    facade = Facade(session)
+    guest = make_user("Guest")
+    assert not facade.has_reviewed(guest.id, place.id)
+    facade.create_review("Nice", guest.id, place.id, 4)
+    assert facade.has_reviewed(guest.id, place.id)
+
+    with pytest.raises(ValueError):
+        facade.create_review("Again", guest.id, place.id, 5)
+    # The rejected review left neither a row nor a rating behind
+    assert place.rating_summary['count'] == 1
+    assert len(facade.get_reviews_by_place(place.id)) == 1
+
+
+def test_rebuild_command_clears_the_shared_cache(app, session, place, make_user):
+    from app.commands import register_commands
+    from app.extensions import cache
+
+    app.config['CACHE_BACKEND'] = 'memory'
+    cache.init_app(app)
+    register_commands(app)
+    try:
+        facade = Facade(session, cache=cache)
+        facade.create_review("Good", make_user("Guest").id, place.id, 4)
+        place.review_count = 9
+        session.commit()
+        place_id = place.id
+        session.remove()
+        assert facade.get_place(place_id).review_count == 9
+
+        result = app.test_cli_runner().invoke(args=['rebuild-ratings'])
+        assert result.exit_code == 0, result.output
+        session.remove()
+        assert facade.get_place(place_id).rating_summary['count'] == 1
+    finally:
+        cache.backend = None
@@ -0,0 +1,124 @@
+import shutil
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.persistence import routing
+from app.persistence.cache import EntityCache, MemoryBackend
+from app.persistence.routing import LAST_WRITE_COOKIE, remember_last_write, replica_binds
+from app.services.facade import Facade
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """A primary SQLite file and two replicas copied from it after seeding"""
+    primary = tmp_path / 'primary.db'
+    replicas = [tmp_path / 'replica0.db', tmp_path / 'replica1.db']
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{primary}'
+    app.config['DB_REPLICA_URLS'] = [f'sqlite:///{path}' for path in replicas]
+    app.config['SQLALCHEMY_BINDS'] = replica_binds(app.config)
+    app.config['DB_READ_YOUR_WRITES_SECONDS'] = 60
+    db.init_app(app)
+    with app.app_context():
+        from app.models import user, place, review  # noqa: F401
+        db.create_all(bind_key=None)
+        db.session.add(Amenity("Pool"))
+        db.session.commit()
+        db.session.remove()
+        for path in replicas:
+            shutil.copy(primary, path)
+        # Seeding counts as this process's last write
+        monkeypatch.setattr(routing, '_process_last_write', None)
+
+        statements = {}
+        for key, engine in db.engines.items():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda *args, key=key: statements.setdefault(key, []).append(args[2]))
+        yield app, statements
+        db.session.remove()
+
+
+def names(amenities):
+    return sorted(amenity.name for amenity in amenities)
+
+
+def test_reads_are_balanced_across_replicas(replicated):
+    app, statements = replicated
+    facade = Facade(db.session)
+    assert names(facade.get_all_amenities()) == ["Pool"]
+    assert names(facade.get_all_amenities()) == ["Pool"]
+    assert len(statements['replica_0']) == len(statements['replica_1']) == 1
+    assert None not in statements
+
+
+def test_session_reads_its_own_writes_from_the_primary(replicated):
+    app, statements = replicated
+    facade = Facade(db.session)
+    facade.add(Amenity("Sauna"))
+    # The replicas never received the write, so only the primary knows it
+    assert names(facade.get_all_amenities()) == ["Pool", "Sauna"]
+    assert 'replica_0' not in statements and 'replica_1' not in statements
+
+    # Sessions are request-scoped; the window outlives this one
+    db.session.remove()
+    assert names(Facade(db.session).get_all_amenities()) == ["Pool", "Sauna"]
+    assert 'replica_0' not in statements and 'replica_1' not in statements
+
+
+def test_clients_read_their_own_writes_across_requests(replicated):
+    app, statements = replicated
+    app.after_request(remember_last_write)
+
+    @app.post('/amenities')
+    def create():
+        Facade(db.session).add(Amenity("Sauna"))
+        return {}, 201
+
+    @app.get('/amenities')
+    def listing():
+        return {'names': names(Facade(db.session).get_all_amenities())}
+
+    @app.teardown_request
+    def remove_session(exc):
+        db.session.remove()
+
+    writer, reader = app.test_client(), app.test_client()
+    response = writer.post('/amenities')
+    assert response.headers['Set-Cookie'].startswith(f'{LAST_WRITE_COOKIE}=')
+    # Each request gets a new session; the cookie keeps the writer on the primary
+    assert writer.get('/amenities').get_json()['names'] == ["Pool", "Sauna"]
+    assert 'replica_0' not in statements and 'replica_1' not in statements
+    # Other clients may still read a replica that has not caught up
+    assert reader.get('/amenities').get_json()['names'] == ["Pool"]
+    assert statements['replica_0']
+
+
+def test_window_expiry_and_units_of_work(replicated):
+    app, statements = replicated
+    app.config['DB_READ_YOUR_WRITES_SECONDS'] = 0
+    facade = Facade(db.session)
+    facade.add(Amenity("Sauna"))
+    assert names(facade.get_all_amenities()) == ["Pool"]
+
+    with facade.unit_of_work():
+        facade.add(Amenity("Gym"))
+        assert names(facade.get_all_amenities()) == ["Gym", "Pool", "Sauna"]
+
+
+def test_cache_misses_load_from_the_primary(replicated):
+    app, statements = replicated
+    app.config['DB_READ_YOUR_WRITES_SECONDS'] = 0
+    facade = Facade(db.session, cache=EntityCache(MemoryBackend(ttl=60)))
+    facade.add(Amenity("Sauna"))
+    # The lagging replicas would have cached a list without the new amenity
+    assert names(facade.get_all_amenities()) == ["Pool", "Sauna"]
+    assert 'replica_0' not in statements and 'replica_1' not in statements
+
+def test_without_replicas_everything_uses_the_primary(session):
+    facade = Facade(session)
+    facade.add(Amenity("Garden"))
+    assert names(facade.get_all_amenities()) == ["Garden"]
@@ -0,0 +1,54 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from flask_restx import Api
+
+from app.extensions import jwt
+from app.services.facade import facade
+
+
+@pytest.fixture
+def client(app):
+    from app.api.v1.reviews import api as reviews_ns
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-that-is-long-enough'
+    jwt.init_app(app)
+    api = Api(app)
+    api.add_namespace(reviews_ns, path='/reviews')
+    return app.test_client()
+
+
+def auth(user):
+    return {'Authorization': f"Bearer {create_access_token(identity=user.id)}"}
+
+
+def test_review_lifecycle(client, owner, place, make_user):
+    guest = make_user("Guest")
+    payload = {'text': "Lovely", 'rating': 4, 'place_id': place.id}
+
+    response = client.post('/reviews/', headers=auth(guest), json=payload)
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['text'] == "Lovely" and body['rating'] == 4
+    assert body['user_id'] == guest.id and body['place_id'] == place.id
+    review_id = body['id']
+
+    response = client.post('/reviews/', headers=auth(guest), json=payload)
+    assert response.status_code == 409
+    assert client.post('/reviews/', headers=auth(owner), json=payload).status_code == 403
+    assert client.post('/reviews/', headers=auth(guest),
+                       json=dict(payload, place_id='missing')).status_code == 404
+    assert client.post('/reviews/', headers=auth(guest),
+                       json={'text': "Lovely", 'rating': 4}).status_code == 400
+
+    assert client.put(f'/reviews/{review_id}', headers=auth(owner),
+                      json={'text': "Mine now", 'rating': 1}).status_code == 403
+    response = client.put(f'/reviews/{review_id}', headers=auth(guest),
+                          json={'text': "Even better", 'rating': 5, 'place_id': 'other'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['rating'] == 5 and body['place_id'] == place.id
+    assert facade.get_place(place.id).rating_summary['average'] == 5
+
+    assert client.delete(f'/reviews/{review_id}', headers=auth(owner)).status_code == 403
+    assert client.delete(f'/reviews/{review_id}', headers=auth(guest)).status_code == 204
+    assert client.get(f'/reviews/{review_id}').status_code == 404
+    assert facade.get_place(place.id).rating_summary['count'] == 0
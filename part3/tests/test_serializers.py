@@ -0,0 +1,154 @@
+import json
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+from flask_restx import Api, Namespace, Resource, fields, marshal
+
+from app.api import serializers
+from app.api.serializers import compile_model, serialize_list_with, serialize_with
+from app.models.amenity import Amenity
+from app.services.facade import Facade
+
+ns = Namespace('rows')
+rating_model = ns.model('Ratings', {
+    'count': fields.Integer,
+    'average': fields.Float,
+    'histogram': fields.List(fields.Integer),
+})
+row_model = ns.model('Row', {
+    'id': fields.String,
+    'title': fields.String(default='untitled'),
+    'price': fields.Float,
+    'active': fields.Boolean,
+    'tags': fields.List(fields.String),
+    'children': fields.List(fields.Nested(ns.model('Child', {'id': fields.String}))),
+    'ratings': fields.Nested(rating_model, attribute='summary'),
+    'owner': fields.Nested(ns.model('Owner', {'id': fields.String}), allow_null=True),
+    'label': fields.String(attribute=lambda row: f"#{getattr(row, 'id', None)}"),
+    'items': fields.String,
+    'created_at': fields.DateTime,
+})
+
+
+class Child:
+    def __init__(self, i):
+        self.id = i
+
+
+class Row:
+    def __init__(self, i, **overrides):
+        self.id = str(i)
+        self.title = f"Row {i}"
+        self.price = 10.0 + i
+        self.active = i % 2 == 0
+        self.tags = ['a', 'b']
+        self.children = [Child(f"{i}.{j}") for j in range(2)]
+        self.summary = {'count': i, 'average': 4.5, 'histogram': [0, 1, 0, 2, i]}
+        self.owner = None
+        self.created_at = datetime(2026, 10, 18, 9, i % 60, 5, 123)
+        self.__dict__.update(overrides)
+
+
+ODD_ROWS = [
+    Row(1, title=None, price=None, tags=None, summary=None),
+    Row(2, price=7, active='false', tags=('x', 3), children=[Child(1), None]),
+    Row(3, owner=Child('o'), created_at=date(2026, 1, 2), summary={'count': True}),
+    Row(4, created_at='2026-01-02T03:04:05', tags={'only'}),
+    {'id': 5, 'summary': {'histogram': None}, 'items': 'shadowed'},
+]
+
+
+@pytest.mark.parametrize('data', [Row(0), [Row(i) for i in range(3)], *ODD_ROWS, ODD_ROWS])
+def test_compiled_model_matches_marshal(data):
+    assert compile_model(row_model)(data) == marshal(data, row_model)
+
+
+def test_compiled_models_are_cached():
+    assert compile_model(row_model) is compile_model(row_model)
+
+
+def make_client(config=None):
+    app = Flask(__name__)
+    app.config.update(config or {})
+    api = Api(app)
+    ns = Namespace('rows')
+    rows = [Row(i, title=f"Wohnung {i} – Zentrum") for i in range(20)]
+
+    @ns.route('/marshalled')
+    class Marshalled(Resource):
+        @ns.marshal_list_with(row_model)
+        def get(self):
+            return rows, 200, {'X-Total': '20'}
+
+    @ns.route('/serialized')
+    class Serialized(Resource):
+        @serialize_list_with(ns, row_model)
+        def get(self):
+            return rows, 200, {'X-Total': '20'}
+
+    @ns.route('/one')
+    class One(Resource):
+        @serialize_with(ns, row_model, code=201)
+        def get(self):
+            return rows[0], 201
+
+    api.add_namespace(ns)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('config', [
+    {},
+    {'DEBUG': True},
+    {'RESTX_JSON': serializers.COMPACT_JSON},
+    {'RESTX_JSON': serializers.COMPACT_JSON, 'JSON_ENCODER': 'stdlib'},
+])
+def test_responses_are_byte_identical(config):
+    client = make_client(config)
+    expected = client.get('/rows/marshalled')
+    response = client.get('/rows/serialized')
+    assert response.data == expected.data
+    assert response.headers['Content-Type'] == expected.headers['Content-Type']
+    assert response.headers['X-Total'] == '20'
+
+    one = client.get('/rows/one')
+    assert one.status_code == 201
+    assert one.get_json() == marshal(Row(0, title="Wohnung 0 – Zentrum"), row_model)
+
+
+@pytest.mark.skipif(serializers.orjson is None, reason="orjson is not installed")
+def test_orjson_defers_to_json_for_floats_it_spells_differently(app):
+    app.config['RESTX_JSON'] = serializers.COMPACT_JSON
+    serialize = compile_model({'price': fields.Float, 'scores': fields.List(fields.Float)})
+    data = serialize({'price': 12.5, 'scores': [0.5]})
+    assert serializers.dumps(data) == b'{"price":12.5,"scores":[0.5]}\n'
+    # repr() writes 1e-05 and 1e+16 where orjson would write 0.00001 and 1e16
+    for price, scores in [(0.00001, [0.5]), (12.5, [1e16]), (float('nan'), [])]:
+        data = serialize({'price': price, 'scores': scores})
+        assert serializers.dumps(data) == (json.dumps(data, **serializers.COMPACT_JSON)
+                                           + '\n').encode()
+
+
+def test_field_masks_fall_back_to_marshal():
+    client = make_client()
+    response = client.get('/rows/serialized', headers={'X-Fields': 'id,ratings{count}'})
+    assert response.get_json()[1] == {'id': '1', 'ratings': {'count': 1}}
+
+
+def test_place_model_objects(session, place):
+    facade = Facade(session)
+    place.add_amenity(Amenity("Wifi"))
+    facade.add(place)
+
+    place_model = ns.model('Place', {
+        'id': fields.String,
+        'title': fields.String,
+        'price': fields.Float,
+        'owner_id': fields.String,
+        'amenities': fields.List(fields.Nested(ns.model('PlaceAmenity', {
+            'id': fields.String, 'name': fields.String}))),
+        'ratings': fields.Nested(rating_model, attribute='rating_summary'),
+        'updated_at': fields.DateTime,
+    })
+    place = facade.get_place(place.id)
+    assert compile_model(place_model)(place) == marshal(place, place_model)
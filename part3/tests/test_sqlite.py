@@ -0,0 +1,64 @@
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.persistence.pool import TimedQueuePool
+from app.persistence.sqlite import apply_pragmas, pragma_values
+from config import DevelopmentConfig, ProductionSQLiteConfig
+
+PRAGMAS = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout', 'temp_store')
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", poolclass=TimedQueuePool, pool_size=2)
+    apply_pragmas(engine, pragmas)
+    return engine
+
+
+def test_every_pooled_connection_gets_the_pragmas(tmp_path):
+    engine = make_engine(tmp_path / 'app.db', ProductionSQLiteConfig.SQLITE_PRAGMAS)
+    with engine.connect() as first, engine.connect() as second:
+        for connection in (first, second):
+            assert pragma_values(connection, PRAGMAS) == {
+                'journal_mode': 'wal',
+                'synchronous': 1,  # NORMAL
+                'mmap_size': ProductionSQLiteConfig.SQLITE_PRAGMAS['mmap_size'],
+                'cache_size': ProductionSQLiteConfig.SQLITE_PRAGMAS['cache_size'],
+                'busy_timeout': ProductionSQLiteConfig.SQLITE_PRAGMAS['busy_timeout'],
+                'temp_store': 2,  # MEMORY
+            }
+    engine.dispose()
+
+
+def test_development_config_keeps_sqlite_defaults(tmp_path):
+    engine = make_engine(tmp_path / 'app.db', getattr(DevelopmentConfig, 'SQLITE_PRAGMAS', None))
+    with engine.connect() as connection:
+        values = pragma_values(connection, ('journal_mode', 'synchronous'))
+    assert values == {'journal_mode': 'delete', 'synchronous': 2}  # FULL
+    engine.dispose()
+
+
+def test_wal_readers_do_not_wait_for_an_open_write(tmp_path):
+    engine = make_engine(tmp_path / 'app.db', ProductionSQLiteConfig.SQLITE_PRAGMAS)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("INSERT INTO items (name) VALUES ('committed')"))
+
+    writing = threading.Event()
+    done = threading.Event()
+
+    def writer():
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO items (name) VALUES ('pending')"))
+            writing.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert writing.wait(5)
+    with engine.connect() as connection:
+        names = connection.execute(text("SELECT name FROM items")).scalars().all()
+    done.set()
+    thread.join()
+    assert names == ['committed']
+    engine.dispose()
@@ -0,0 +1,80 @@
+import json
+from flask import Flask
+from flask_restx import Api, Namespace, Resource, fields
+from app.api.streaming import streamable
+
+
+class Row:
+    def __init__(self, i):
+        self.id = str(i)
+        self.name = f"Row {i}"
+
+
+def make_client(rows_for):
+    app = Flask(__name__)
+    api = Api(app)
+    ns = Namespace('rows')
+    row_model = ns.model('Row', {'id': fields.String, 'name': fields.String})
+
+    @ns.route('/')
+    class RowList(Resource):
+        @streamable(row_model, lambda self: rows_for())
+        @ns.marshal_list_with(row_model)
+        def get(self):
+            return [Row(0)]
+
+    api.add_namespace(ns)
+    return app.test_client()
+
+
+def test_default_response_is_marshalled_list():
+    client = make_client(lambda: [])
+    assert client.get('/rows/').get_json() == [{'id': '0', 'name': 'Row 0'}]
+
+
+def test_stream_json_array():
+    client = make_client(lambda: (Row(i) for i in range(250)))
+    response = client.get('/rows/?stream=true')
+    assert response.is_streamed
+    body = json.loads(response.get_data(as_text=True))
+    assert len(body) == 250
+    assert body[-1] == {'id': '249', 'name': 'Row 249'}
+
+
+def test_stream_empty_and_ndjson():
+    assert make_client(lambda: iter(())).get('/rows/?stream=1').get_json() == []
+
+    client = make_client(lambda: (Row(i) for i in range(3)))
+    response = client.get('/rows/?stream=1', headers={'Accept': 'application/x-ndjson'})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['id'] for line in lines] == ['0', '1', '2']
+
+
+def test_rows_are_pulled_lazily():
+    pulled = []
+
+    def rows():
+        for i in range(1000):
+            pulled.append(i)
+            yield Row(i)
+
+    client = make_client(rows)
+    response = client.get('/rows/?stream=1', buffered=False)
+    first_chunk = next(response.response)
+    assert first_chunk.startswith(b'[')
+    assert len(pulled) < 1000
+    response.close()
+
+
+def test_facade_iterates_in_id_order(session):
+    from app.models.amenity import Amenity
+    from app.services.facade import Facade
+
+    for i in range(5):
+        session.add(Amenity(f"Amenity {i}"))
+    session.commit()
+
+    ids = [amenity.id for amenity in Facade(session).iter_amenities()]
+    assert len(ids) == 5
+    assert ids == sorted(ids)
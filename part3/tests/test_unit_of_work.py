@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.unit_of_work import in_unit_of_work, transactional
+from app.services.facade import Facade
+
+
+@pytest.fixture
+def commits(session):
+    seen = []
+    listener = lambda s: seen.append(s)  # noqa: E731
+    event.listen(session, 'after_commit', listener)
+    yield seen
+    event.remove(session, 'after_commit', listener)
+
+
+def test_unit_commits_once(session, owner, commits):
+    facade = Facade(session)
+    with facade.unit_of_work():
+        amenities = [facade.add(Amenity(f"Amenity {i}")) for i in range(5)]
+        place = Place("Loft", "", 80.0, 0.0, 0.0, owner)
+        for amenity in amenities:
+            place.add_amenity(amenity)
+        facade.add(place)
+        facade.update(place, price=95.0)
+        # Flushed, so ids exist before the commit
+        assert place.id and amenities[0].id
+        assert not commits
+    assert len(commits) == 1
+    assert len(facade.get_place(place.id).amenities) == 5
+
+
+def test_nested_units_join_the_outer_one(session, owner, commits):
+    facade = Facade(session)
+    with facade.unit_of_work():
+        with facade.unit_of_work():
+            facade.add(Amenity("Sauna"))
+        assert in_unit_of_work(session)
+        assert not commits
+        facade.update(owner, first_name="Updated")
+    assert len(commits) == 1
+    assert not in_unit_of_work(session)
+
+
+def test_exception_rolls_back_the_whole_unit(session, commits):
+    facade = Facade(session)
+    with pytest.raises(RuntimeError):
+        with facade.unit_of_work():
+            facade.add(Amenity("Hammam"))
+            raise RuntimeError("request failed")
+    assert not commits
+    assert not in_unit_of_work(session)
+    assert facade.get_amenity_by_name("Hammam") is None
+
+
+def test_outside_a_unit_every_call_commits(session, commits):
+    facade = Facade(session)
+    facade.add(Amenity("Pool"))
+    facade.add(Amenity("Gym"))
+    assert len(commits) == 2
+
+
+def test_transactional_decorator(app, commits):
+    facade = Facade(app.extensions['sqlalchemy'].session)
+
+    @transactional
+    def view():
+        facade.add(Amenity("Garden"))
+        facade.add(Amenity("Terrace"))
+        return 'ok'
+
+    assert view() == 'ok'
+    assert len(commits) == 1